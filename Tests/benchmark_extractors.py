@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the listing page extractor
+Times tree building and each field group over saved listing HTML, per parser backend
+
+Usage:
+    python Tests/benchmark_extractors.py                       # bundled fixture page
+    python Tests/benchmark_extractors.py --corpus corpus       # listing pages of a captured corpus
+    python Tests/benchmark_extractors.py --parsers lxml --repeat 50
+"""
+
+import sys
+import os
+import math
+import time
+import argparse
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.extractors import parse_car_info_mobile, FIELD_GROUPS
+from modules.html_parser import SUPPORTED_PARSERS, get_parser_engine, get_soup_features
+from modules.corpus import load_corpus
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+STAGES = ['parse'] + [name for name, _ in FIELD_GROUPS]
+
+
+def load_pages(corpus=None, limit=None):
+    """
+    Listing pages to benchmark.
+
+    Args:
+        corpus (str, optional): Corpus directory from crawler.py --capture; the fixture page otherwise
+        limit (int, optional): Maximum number of pages
+
+    Returns:
+        list: (url, content bytes) tuples
+    """
+    if corpus is None:
+        with open(os.path.join(FIXTURES_DIR, 'listing_page.html'), 'rb') as f:
+            return [('https://www.mobile.bg/obiava-11759077895164151-bmw-320-d-touring', f.read())]
+
+    meta, entries = load_corpus(corpus)
+    pages = []
+    for key, entry in entries.items():
+        if '/obiava-' in key and entry.get('status', 200) == 200:
+            with open(os.path.join(meta['directory'], entry['file']), 'rb') as f:
+                pages.append((f"https://www.mobile.bg{key}", f.read()))
+        if limit and len(pages) >= limit:
+            break
+    return pages
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def benchmark_parser(pages, parser, repeat):
+    """
+    Time every stage of parse_car_info_mobile() and measure peak memory per page.
+
+    Returns:
+        dict: {'stages': {stage: [seconds per page run]}, 'total': [...], 'peak': [bytes per page]}
+    """
+    stages = {stage: [] for stage in STAGES}
+    totals = []
+    for _ in range(repeat):
+        for url, content in pages:
+            timings = {}
+            start = time.perf_counter()
+            parse_car_info_mobile(content, url, parser=parser, timings=timings)
+            totals.append(time.perf_counter() - start)
+            for stage in STAGES:
+                stages[stage].append(timings.get(stage, 0.0))
+
+    # Separate pass: tracing allocations slows everything down, so it would skew the timings
+    peaks = []
+    tracemalloc.start()
+    for url, content in pages:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        parse_car_info_mobile(content, url, parser=parser)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return {'stages': stages, 'total': totals, 'peak': peaks}
+
+
+def print_report(parser, result):
+    ms = 1000.0
+    print(f'\n📊 {parser}')
+    if parser == 'selectolax':
+        print(f"  (listing pages are parsed with {get_soup_features(parser)}; selectolax only speeds up result pages)")
+    print(f"  {'stage':<12} {'p50 ms':>9} {'p95 ms':>9} {'share':>7}")
+    total_p50 = percentile(result['total'], 50)
+    for stage in STAGES:
+        values = result['stages'][stage]
+        p50 = percentile(values, 50)
+        share = p50 / total_p50 * 100 if total_p50 else 0
+        print(f"  {stage:<12} {p50 * ms:>9.3f} {percentile(values, 95) * ms:>9.3f} {share:>6.1f}%")
+    print(f"  {'total':<12} {total_p50 * ms:>9.3f} {percentile(result['total'], 95) * ms:>9.3f}")
+    print(f"  🧠 Peak memory per page: p50 {percentile(result['peak'], 50) / 1024:.0f} KiB, "
+          f"max {max(result['peak']) / 1024:.0f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark listing page extraction per field group')
+    parser.add_argument('--corpus', default=None, help='Captured corpus (or corpus root) to read listing pages from')
+    parser.add_argument('--parsers', nargs='+', default=list(SUPPORTED_PARSERS), choices=SUPPORTED_PARSERS)
+    parser.add_argument('--repeat', type=int, default=20, help='Runs over the page set per parser (default: 20)')
+    parser.add_argument('--limit', type=int, default=None, help='Maximum number of corpus pages')
+    args = parser.parse_args()
+
+    pages = load_pages(args.corpus, args.limit)
+    if not pages:
+        print('❌ No listing pages found')
+        sys.exit(1)
+
+    print('🧪 EXTRACTOR BENCHMARK')
+    print('=' * 50)
+    print(f'  Pages: {len(pages)}, runs per parser: {args.repeat}')
+
+    summary = []
+    for name in args.parsers:
+        if get_parser_engine(name) != name:
+            print(f'\n⚠️ {name} is not installed, skipping')
+            continue
+        result = benchmark_parser(pages, name, args.repeat)
+        print_report(name, result)
+        summary.append((name, percentile(result['total'], 50)))
+
+    if len(summary) > 1:
+        print('\n🏁 Parser comparison (p50 per page):')
+        fastest = min(p50 for _, p50 in summary)
+        for name, p50 in sorted(summary, key=lambda item: item[1]):
+            print(f'  {name:<12} {p50 * 1000:>8.3f} ms  ({p50 / fastest:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
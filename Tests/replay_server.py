@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Local replay server for a recorded mobile.bg corpus
+Serves captured search and listing pages with configurable latency, for offline end-to-end runs
+
+Usage:
+    python crawler.py --capture corpus          # record a live run into corpus/v001
+    python Tests/replay_server.py corpus --port 8765 --latency 0.2
+    BASE_URL=http://127.0.0.1:8765/obiavi python crawler.py
+"""
+
+import sys
+import os
+import re
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.corpus import load_corpus, corpus_key
+
+
+class ReplayServer:
+    """
+    Serve a corpus over HTTP on localhost.
+
+    Absolute links to the recorded origin are rewritten to the server's own
+    origin, so pagination and listing links stay on the replay. Unknown URLs
+    get a 404.
+    """
+
+    def __init__(self, corpus_path, host='127.0.0.1', port=0, latency=0.0, jitter=0.0):
+        """
+        Args:
+            corpus_path (str): Corpus version directory, or a root to replay its latest version
+            host (str): Interface to listen on
+            port (int): Port, 0 picks a free one
+            latency (float): Seconds added before every response
+            jitter (float): Extra random delay of up to this many seconds
+        """
+        self.meta, self.entries = load_corpus(corpus_path)
+        self.latency = latency
+        self.jitter = jitter
+        self.requests_served = 0
+
+        origin_host = re.escape((self.meta.get('origin') or 'https://www.mobile.bg').split('://', 1)[-1])
+        self._origin_pattern = re.compile(rb'(?:https?:)?//' + origin_host.encode('utf-8'))
+        self._bodies = {}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server.handle(self)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.origin = f"http://{host}:{self.httpd.server_port}"
+
+    def body(self, entry):
+        """Recorded body with links pointing at this server."""
+        body = self._bodies.get(entry['key'])
+        if body is None:
+            with open(os.path.join(self.meta['directory'], entry['file']), 'rb') as f:
+                body = self._origin_pattern.sub(self.origin.encode('utf-8'), f.read())
+            self._bodies[entry['key']] = body
+        return body
+
+    def handle(self, request):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        self.requests_served += 1
+
+        entry = self.entries.get(corpus_key(request.path))
+        if entry is None:
+            request.send_response(404)
+            request.send_header('Content-Length', '0')
+            request.end_headers()
+            return
+
+        body = self.body(entry)
+        request.send_response(entry.get('status', 200))
+        request.send_header('Content-Type', entry.get('content_type', 'text/html'))
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self):
+        """Serve in a background thread."""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay a recorded mobile.bg corpus over HTTP')
+    parser.add_argument('corpus', help='Corpus version directory, or a corpus root to replay its latest version')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added before every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random delay of up to this many seconds')
+    args = parser.parse_args()
+
+    server = ReplayServer(args.corpus, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter)
+    print(f"📼 Replaying {len(server.entries)} responses from {server.meta['directory']}")
+    print(f"🔗 Point the crawler at it with BASE_URL={server.origin}/obiavi")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
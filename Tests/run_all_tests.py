@@ -53,7 +53,24 @@ def main():
         ('test_production_date_extraction.py', 'Production Date Tests'),
         ('test_excel_structure.py', 'Excel Structure Tests'),
         ('test_complete_functionality.py', 'Complete Functionality Tests'),
-        ('test_main_crawler_execution.py', 'Main Crawler Execution Tests')
+        ('test_main_crawler_execution.py', 'Main Crawler Execution Tests'),
+        ('test_extraction_pool.py', 'Extraction Pool Tests'),
+        ('test_parallel_pagination.py', 'Parallel Pagination Tests'),
+        ('test_async_engine.py', 'Async Engine Tests'),
+        ('test_text_heuristics.py', 'Text Heuristics Tests'),
+        ('test_parser_engines.py', 'Parser Engine Tests'),
+        ('test_http_cache.py', 'HTTP Cache Tests'),
+        ('test_incremental.py', 'Incremental Crawl Tests'),
+        ('test_listing_store.py', 'Listing Store Tests'),
+        ('test_parquet_export.py', 'Parquet Export Tests'),
+        ('test_output_sinks.py', 'Output Sink Tests'),
+        ('test_checkpoint.py', 'Checkpoint Tests'),
+        ('test_rate_limiter.py', 'Rate Limiter Tests'),
+        ('test_adaptive_throttle.py', 'Adaptive Throttle Tests'),
+        ('test_replay.py', 'Capture and Replay Tests'),
+        ('test_site_simulator.py', 'Site Simulator Tests'),
+        ('test_metrics.py', 'Metrics Tests'),
+        ('test_crawler_runs.py', 'Crawler Run Tests')
     ]
     
     results = []
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Synthetic mobile.bg site for load and scaling tests
+Generates result and listing pages in the mobile.bg markup shape, with injectable latency,
+429/503 bursts and slow bodies
+
+Usage:
+    python Tests/site_simulator.py --listings 5000 --latency 0.05 --throttle-every 200
+    BASE_URL=http://127.0.0.1:8766/obiavi python crawler.py
+
+    # Measure pagination and extraction throughput as the site grows
+    python Tests/site_simulator.py --scale 1000 10000 100000 --workers 8 --extract 2000
+"""
+
+import sys
+import os
+import time
+import re
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RESULTS_PER_PAGE = 20
+SEARCH_PATH = '/obiavi/avtomobili-dzhipove/bmw/seria-3'
+SEARCH_QUERY = 'price=5000&price1=80000'
+PAGE_SUFFIX = re.compile(r'/p-(\d+)$')
+LISTING_ID_BASE = 21000000000000000
+
+MODELS = ['320 d', '318 i', '330 xd', '320 d Touring', '325 i', '335 i']
+FUELS = ['Дизелов', 'Бензинов', 'Хибриден']
+GEARBOXES = ['Ръчна', 'Автоматична']
+COLORS = ['Черен металик', 'Сив', 'Бял', 'Син металик', 'Червен']
+CITIES = ['София', 'Пловдив', 'Варна', 'Бургас', 'Русе']
+MONTHS = ['януари', 'февруари', 'март', 'април', 'май', 'юни',
+          'юли', 'август', 'септември', 'октомври', 'ноември', 'декември']
+EXTRAS = ['Климатроник', 'ABS система', 'ESP система', 'Ксенонови фарове', 'Алуминиеви джанти',
+          'Кожен салон', 'Навигация', 'Bluetooth свързаност', 'Парктроник', 'Подгряване на седалките']
+
+
+def generate_listing(index):
+    """
+    Listing data for one generated ad; the same index always gives the same car.
+
+    Returns:
+        dict: Fields used to render the listing page
+    """
+    rng = random.Random(index)
+    price_bgn = rng.randrange(3000, 80000, 50)
+    return {
+        'id': LISTING_ID_BASE + index,
+        'model': rng.choice(MODELS),
+        'year': rng.randint(1998, 2023),
+        'month': rng.choice(MONTHS),
+        'price_bgn': price_bgn,
+        'price_eur': round(price_bgn / 1.95583, 2),
+        'fuel': rng.choice(FUELS),
+        'power': rng.randint(75, 400),
+        'gearbox': rng.choice(GEARBOXES),
+        'mileage': rng.randrange(5000, 400000, 1000),
+        'color': rng.choice(COLORS),
+        'city': rng.choice(CITIES),
+        'phone': f"08{rng.randint(70000000, 99999999)}",
+        'extras': rng.sample(EXTRAS, rng.randint(3, len(EXTRAS))),
+    }
+
+
+def listing_slug(car):
+    return f"obiava-{car['id']}-bmw-{car['model'].lower().replace(' ', '-')}"
+
+
+def _spaced(number):
+    return f"{number:,}".replace(',', ' ')
+
+
+def render_listing_page(car):
+    extras = ''.join(f'<li>{extra}</li>' for extra in car['extras'])
+    return f'''<!DOCTYPE html>
+<html lang="bg">
+<head><meta charset="utf-8"><title>BMW {car['model']} - Обява {car['id']} - mobile.bg</title></head>
+<body>
+<div class="header"><a href="/">mobile.bg</a> <a href="/obiavi/avtomobili-dzhipove">Автомобили и джипове</a></div>
+<div class="obiava">
+  <h1>BMW {car['model']} {car['year']} Обява: {car['id']}</h1>
+  <div class="Price">{_spaced(int(car['price_eur']))}{f"{car['price_eur']:.2f}"[-3:]} €<br>{_spaced(car['price_bgn'])} лв.<span class="history">История на цената</span></div>
+  <div class="mainCarParams">
+    <div class="mpLabel">Двигател</div><div class="mpInfo">{car['fuel']}</div>
+    <div class="mpLabel">Мощност</div><div class="mpInfo">{car['power']} к.с.</div>
+    <div class="mpLabel">Скоростна кутия</div><div class="mpInfo">{car['gearbox']}</div>
+    <div class="mpLabel">Пробег [км]</div><div class="mpInfo">{_spaced(car['mileage'])} км</div>
+  </div>
+  <div class="techData">
+    <div class="item"><div>Дата на производство</div><div>{car['month']} {car['year']}</div></div>
+    <div class="item"><div>Цвят</div><div>{car['color']}</div></div>
+  </div>
+  <div class="contacts">
+    <div class="sellerPhone">Телефон: {car['phone'][:4]} {car['phone'][4:7]} {car['phone'][7:]}</div>
+    <div class="sellerLocation">Намира се в гр. {car['city']}, област {car['city']}</div>
+  </div>
+  <div class="moreInfo"><p>Автомобилът е в отлично техническо състояние, редовно обслужван в сервиз.
+  Обява номер {car['id']}, {_spaced(car['mileage'])} км пробег, без забележки по купето.</p></div>
+  <div class="carExtrasBlock"><ul>{extras}</ul></div>
+</div>
+<div class="footer"><p>Всички права запазени.</p></div>
+</body>
+</html>'''
+
+
+def render_result_page(page, listings, origin, search_path=SEARCH_PATH, query=SEARCH_QUERY):
+    pages = max(1, -(-listings // RESULTS_PER_PAGE))
+    first = (page - 1) * RESULTS_PER_PAGE
+    last = min(page * RESULTS_PER_PAGE, listings)
+    host = origin.split('://', 1)[1]
+
+    rows = []
+    for index in range(first, last):
+        car = generate_listing(index)
+        rows.append(f'<table class="tablereset"><tr><td><a href="//{host}/{listing_slug(car)}" class="mmm">'
+                    f'BMW {car["model"]}</a></td><td><div class="price">{_spaced(car["price_bgn"])} лв.</div></td></tr></table>')
+
+    def page_href(number):
+        suffix = f'/p-{number}' if number > 1 else ''
+        return f'//{host}{search_path}{suffix}' + (f'?{query.replace("&", "&amp;")}' if query else '')
+
+    links = ''.join(f'<a href="{page_href(n)}" class="pageNumbers">{n}</a>'
+                    for n in range(max(1, page - 3), min(pages, page + 3) + 1) if n != page)
+    next_link = f'<a href="{page_href(page + 1)}" class="saveSlink next">Напред</a>' if page < pages else ''
+    return f'''<!DOCTYPE html>
+<html lang="bg">
+<head><meta charset="utf-8"><title>BMW Серия 3 - mobile.bg</title></head>
+<body>
+<div class="header"><a href="/">mobile.bg</a></div>
+<div style="float:left">{first + 1} - {last} от общо {listings} обяви</div>
+<div class="tablereset">{''.join(rows)}</div>
+<div class="pagination"><span class="pageNumbersSelect">{page}</span>{links}{next_link}</div>
+</body>
+</html>'''
+
+
+class SiteSimulator:
+    """
+    Serve a generated mobile.bg search with `listings` ads on localhost.
+
+    Pages are rendered on request from the listing index, so memory use
+    doesn't grow with the site size. Faults are injected by request count:
+    every `throttle_every`-th request starts a burst of `burst_length`
+    responses with `burst_status`, and a `slow_body_rate` share of pages
+    trickles its body out over `slow_body_seconds`. Listings whose index is
+    in `missing_listings` stay in the results but answer 404, like ads taken
+    down mid-crawl.
+    """
+
+    def __init__(self, listings=100, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 throttle_every=0, burst_length=1, burst_status=429, retry_after=1,
+                 slow_body_rate=0.0, slow_body_seconds=1.0, missing_listings=(), seed=0):
+        """
+        Args:
+            listings (int): Number of ads in the search
+            host (str): Interface to listen on
+            port (int): Port, 0 picks a free one
+            latency (float): Seconds added before every response
+            jitter (float): Extra random delay of up to this many seconds
+            throttle_every (int): Start a throttling burst every this many requests, 0 for never
+            burst_length (int): Consecutive throttled responses per burst
+            burst_status (int): Status of throttled responses, e.g. 429 or 503
+            retry_after (int, optional): Retry-After seconds sent with throttled responses
+            slow_body_rate (float): Share of pages whose body is sent slowly
+            slow_body_seconds (float): Time taken to send a slow body
+            missing_listings (iterable): Listing indexes that answer 404
+            seed (int): Seed for jitter and slow-body selection
+        """
+        self.listings = listings
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_every = throttle_every
+        self.burst_length = burst_length
+        self.burst_status = burst_status
+        self.retry_after = retry_after
+        self.slow_body_rate = slow_body_rate
+        self.slow_body_seconds = slow_body_seconds
+        self.missing_listings = set(missing_listings)
+
+        self.requests = 0
+        self.paths = []
+        self.statuses = {}
+        self.bytes_sent = 0
+        self._rng = random.Random(seed)
+        self._burst_left = 0
+        self._lock = threading.Lock()
+
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                simulator.handle(self)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.origin = f"http://{host}:{self.httpd.server_port}"
+        self.search_url = f"{self.origin}{SEARCH_PATH}?{SEARCH_QUERY}"
+
+    def _plan(self, path):
+        """Decide this request's delay, fault status and body speed under the lock."""
+        with self._lock:
+            self.requests += 1
+            self.paths.append(path)
+            if self.throttle_every and self.requests % self.throttle_every == 0:
+                self._burst_left = self.burst_length
+            status = None
+            if self._burst_left:
+                self._burst_left -= 1
+                status = self.burst_status
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            slow = self.slow_body_rate and self._rng.random() < self.slow_body_rate
+        return delay, status, slow
+
+    def _count(self, status, size):
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.bytes_sent += size
+
+    def route(self, path):
+        """
+        Returns:
+            tuple: (status, body bytes) for a request path
+        """
+        parts = urlsplit(path)
+        if parts.path.startswith('/obiavi/'):
+            # Any search path works, so the crawler's .env-built search URL is served too
+            match = PAGE_SUFFIX.search(parts.path)
+            page = int(match.group(1)) if match else 1
+            search_path = parts.path[:match.start()] if match else parts.path.rstrip('/')
+            if page < 1 or (page - 1) * RESULTS_PER_PAGE >= max(self.listings, 1):
+                return 404, b''
+            return 200, render_result_page(page, self.listings, self.origin, search_path, parts.query).encode('utf-8')
+
+        if parts.path.startswith('/obiava-'):
+            listing_id = parts.path[len('/obiava-'):].split('-', 1)[0]
+            index = int(listing_id) - LISTING_ID_BASE if listing_id.isdigit() else -1
+            if 0 <= index < self.listings and index not in self.missing_listings:
+                return 200, render_listing_page(generate_listing(index)).encode('utf-8')
+        return 404, b''
+
+    def handle(self, request):
+        delay, fault, slow = self._plan(request.path)
+        if delay:
+            time.sleep(delay)
+
+        if fault:
+            request.send_response(fault)
+            if self.retry_after is not None:
+                request.send_header('Retry-After', str(self.retry_after))
+            request.send_header('Content-Length', '0')
+            request.end_headers()
+            self._count(fault, 0)
+            return
+
+        status, body = self.route(request.path)
+        request.send_response(status)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        try:
+            if slow and body:
+                chunk = -(-len(body) // 4)
+                for start in range(0, len(body), chunk):
+                    request.wfile.write(body[start:start + chunk])
+                    request.wfile.flush()
+                    time.sleep(self.slow_body_seconds / 4)
+            else:
+                request.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self._count(status, len(body))
+
+    def start(self):
+        """Serve in a background thread."""
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def measure_throughput(listings, workers=4, extract=1000, rate=0.0, **faults):
+    """
+    Crawl a simulated site with the crawler's pagination and extraction stages.
+
+    Args:
+        listings (int): Site size
+        workers (int): Concurrent workers for both stages
+        extract (int): Listings to extract (a prefix of the links), 0 for all
+        rate (float): Requests per second, 0 for no limit
+        **faults: Extra SiteSimulator options such as latency or throttle_every
+
+    Returns:
+        dict: Link and listing counts with their elapsed seconds
+    """
+    from modules.adaptive import AdaptiveThrottle
+    from modules.extraction_pool import extract_listings
+    from modules.http_client import HttpClient
+    from modules.rate_limiter import RateLimiter
+    from modules.web_scraper import get_all_listing_links
+
+    with SiteSimulator(listings, **faults) as site:
+        previous_base_url = os.environ.get('BASE_URL')
+        os.environ['BASE_URL'] = f"{site.origin}/obiavi"
+        limiter = RateLimiter(rate=rate)
+        # Localhost latency is sub-millisecond noise, so only the injected 429/503 bursts slow the crawl
+        throttle = AdaptiveThrottle(limiter, concurrency=workers, latency_factor=float('inf'))
+        try:
+            with HttpClient(pool_size=workers, throttle=throttle) as client:
+                start = time.perf_counter()
+                links = get_all_listing_links(site.search_url, max_pages=listings // RESULTS_PER_PAGE + 1,
+                                              client=client, workers=workers, limiter=limiter)
+                link_seconds = time.perf_counter() - start
+
+                sample = links[:extract] if extract else links
+                start = time.perf_counter()
+                cars = extract_listings(sample, workers=workers, client=client, limiter=limiter)
+                extract_seconds = time.perf_counter() - start
+        finally:
+            if previous_base_url is None:
+                os.environ.pop('BASE_URL', None)
+            else:
+                os.environ['BASE_URL'] = previous_base_url
+
+        return {
+            'listings': listings,
+            'links': len(links),
+            'link_seconds': link_seconds,
+            'extracted': len(cars),
+            'extract_seconds': extract_seconds,
+            'requests': site.requests,
+            'statuses': dict(site.statuses),
+            'throttled': throttle.throttled,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a synthetic mobile.bg search, or measure crawl throughput against it')
+    parser.add_argument('--listings', type=int, default=1000, help='Ads in the search (default: 1000)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added before every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random delay of up to this many seconds')
+    parser.add_argument('--throttle-every', type=int, default=0, help='Start a 429/503 burst every N requests')
+    parser.add_argument('--burst-length', type=int, default=1, help='Throttled responses per burst')
+    parser.add_argument('--burst-status', type=int, default=429, choices=[429, 503])
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds on throttled responses')
+    parser.add_argument('--slow-body-rate', type=float, default=0.0, help='Share of pages sent slowly')
+    parser.add_argument('--slow-body-seconds', type=float, default=1.0, help='Time to send a slow body')
+    parser.add_argument('--scale', type=int, nargs='+', metavar='N',
+                        help='Measure throughput for each site size instead of serving')
+    parser.add_argument('--workers', type=int, default=4, help='Workers for --scale runs')
+    parser.add_argument('--extract', type=int, default=1000, help='Listings extracted per --scale run, 0 for all')
+    parser.add_argument('--rate', type=float, default=0.0, help='Requests per second for --scale runs, 0 for no limit')
+    args = parser.parse_args()
+
+    faults = {
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'throttle_every': args.throttle_every,
+        'burst_length': args.burst_length,
+        'burst_status': args.burst_status,
+        'retry_after': args.retry_after,
+        'slow_body_rate': args.slow_body_rate,
+        'slow_body_seconds': args.slow_body_seconds,
+    }
+
+    if args.scale:
+        import logging
+        logging.basicConfig(level=logging.ERROR)
+        print('🧪 SCALING BENCHMARK')
+        print('=' * 50)
+        print(f"  {'listings':>9} {'links':>9} {'links/s':>9} {'cars/s':>9} {'requests':>9} {'throttled':>9}")
+        for listings in args.scale:
+            result = measure_throughput(listings, workers=args.workers, extract=args.extract, rate=args.rate, **faults)
+            print(f"  {result['listings']:>9} {result['links']:>9} {result['links'] / result['link_seconds']:>9.0f} "
+                  f"{result['extracted'] / max(result['extract_seconds'], 1e-9):>9.1f} "
+                  f"{result['requests']:>9} {result['throttled']:>9}")
+        return
+
+    site = SiteSimulator(args.listings, host=args.host, port=args.port, **faults)
+    print(f"🏭 Simulating {args.listings} listings at {site.search_url}")
+    print(f"🔗 Point the crawler at it with BASE_URL={site.origin}/obiavi")
+    try:
+        site.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Test script for retries and the adaptive throttle
+Checks Retry-After handling, AIMD rate control and pagination retries against a local server
+"""
+
+import sys
+import os
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.adaptive import AdaptiveThrottle, parse_retry_after, backoff_delay
+from modules.rate_limiter import RateLimiter
+from modules.http_client import HttpClient
+from modules.extractors import fetch_listing_page
+from modules.extraction_pool import extract_listings
+from modules.web_scraper import get_all_listing_links
+from site_simulator import SiteSimulator
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """
+    Serves listing and result pages, throttling the first request to each path
+    listed in `throttle_once` and every request to /always-503, and delaying
+    the first request to each path in `slow_once` by its number of seconds
+    """
+
+    throttle_once = {}
+    slow_once = {}
+    requests_seen = []
+    request_times = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        self.request_times.append(time.monotonic())
+        time.sleep(self.slow_once.pop(self.path, 0))
+        if self.path == '/always-503' or self.throttle_once.pop(self.path, None):
+            self.send_response(429 if self.path == '/obiava-1' else 503)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if self.path.startswith('/search'):
+            page = int(self.path.rsplit('-', 1)[1]) if '/p-' in self.path else 1
+            anchors = ''.join(f'<a href="//www.mobile.bg/obiava-{page}{i}-bmw">BMW</a>' for i in range(20))
+            next_link = f'<a href="{self.origin}/search/p-{page + 1}">Напред</a>' if page < 3 else ''
+            body = f'<html><body><div>от общо 60</div>{anchors}<div class="pagination">{next_link}</div></body></html>'
+        else:
+            body = f'<html><body><h1>{self.path}</h1></body></html>'
+        body = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ThrottlingHandler.origin = f'http://127.0.0.1:{server.server_port}'
+    return server, ThrottlingHandler.origin
+
+
+def test_retry_after():
+    """Test that a 429 is retried after Retry-After and slows the throttle down"""
+    print('=== TESTING RETRY-AFTER ===')
+
+    server, origin = start_server()
+    ThrottlingHandler.throttle_once = {'/obiava-1': True}
+    ThrottlingHandler.requests_seen = []
+    throttle = AdaptiveThrottle(RateLimiter(rate=50), concurrency=4)
+    try:
+        with HttpClient(throttle=throttle) as client:
+            start = time.monotonic()
+            content = fetch_listing_page(f'{origin}/obiava-1', retries=2, client=client)
+            elapsed = time.monotonic() - start
+            gave_up = fetch_listing_page(f'{origin}/always-503', retries=1, client=client)
+    finally:
+        server.shutdown()
+
+    print(f'  Waited {elapsed:.2f}s, requests: {ThrottlingHandler.requests_seen}')
+    print(f'  Throttle after pushback: rate {throttle.scale:.0%}, {throttle.concurrency} in flight')
+
+    ok = (content is not None and b'/obiava-1' in content and elapsed >= 1.0 and gave_up is None and
+          ThrottlingHandler.requests_seen.count('/always-503') == 2 and
+          throttle.throttled == 3 and throttle.concurrency == 1 and throttle.scale == 0.125)
+    print('✅ Retry-After honored' if ok else '❌ Retry-After test FAILED')
+    return ok
+
+
+def test_aimd_recovery():
+    """Test multiplicative decrease on pushback and latency, then additive recovery"""
+    print('\n=== TESTING AIMD CONTROL ===')
+
+    limiter = RateLimiter(rate=10)
+    throttle = AdaptiveThrottle(limiter, concurrency=8, recover_after=5)
+    url = 'https://www.mobile.bg/obiava-1'
+
+    throttle.observe(url, 429, 0.05, retry_after=2)
+    throttle.observe(url, 503, 0.05)
+    after_pushback = (throttle.scale, throttle.concurrency)
+    deferred = limiter._hosts.bucket(url).tokens < 0
+
+    for _ in range(200):
+        throttle.observe(url, 200, 0.05)
+    recovered = (throttle.scale, throttle.concurrency)
+
+    for _ in range(5):
+        throttle.observe(url, 200, 1.0)
+    after_slow = throttle.scale
+
+    print(f'  After 429+503: {after_pushback}, recovered: {recovered}, after slow responses: {after_slow:.2f}')
+
+    ok = (after_pushback == (0.25, 2) and deferred and recovered == (1.0, 8) and
+          after_slow < 1.0 and parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT', now=1445412470) == 10 and
+          parse_retry_after('soon') is None and all(0.5 <= backoff_delay(0) <= 1.0 for _ in range(20)))
+    print('✅ AIMD control PASSED' if ok else '❌ AIMD control FAILED')
+    return ok
+
+
+def test_in_flight_pushback():
+    """Test that 429s from requests already in flight at a cut don't cut again"""
+    print('\n=== TESTING IN-FLIGHT PUSHBACK ===')
+
+    throttle = AdaptiveThrottle(RateLimiter(rate=10), concurrency=8)
+    url = 'https://www.mobile.bg/obiava-1'
+
+    # Four requests are in flight when the first 429 arrives; their 429s belong to the same overload
+    slots = [throttle.slot() for _ in range(4)]
+    for slot in slots:
+        slot.__enter__()
+    throttle.observe(url, 429, 0.05)
+    for slot in slots:
+        slot.__exit__(None, None, None)
+        throttle.observe(url, 429, 0.05)
+    after_window = (throttle.scale, throttle.concurrency)
+
+    # A 429 to a request sent after the cut is a new signal
+    throttle.observe(url, 429, 0.05)
+    after_next = (throttle.scale, throttle.concurrency)
+
+    print(f'  After 5 in-flight 429s: {after_window}, after the next one: {after_next}, throttled: {throttle.throttled}')
+
+    ok = after_window == (0.5, 4) and after_next == (0.25, 2) and throttle.throttled == 6
+    print('✅ One cut per observation window' if ok else '❌ In-flight pushback FAILED')
+    return ok
+
+
+def test_slot_waits_are_not_latency():
+    """Test that waiting for a concurrency slot isn't reported as server latency"""
+    print('\n=== TESTING LATENCY WITHOUT SLOT WAITS ===')
+
+    latencies = []
+
+    class RecordingThrottle(AdaptiveThrottle):
+        def observe(self, url, status, latency, retry_after=None):
+            latencies.append(latency)
+            super().observe(url, status, latency, retry_after)
+
+    # One slot, three requests: the later ones queue for up to two server round trips
+    throttle = RecordingThrottle(RateLimiter(rate=0), concurrency=1)
+    with SiteSimulator(3, latency=0.2) as site, HttpClient(pool_size=3, throttle=throttle) as client:
+        threads = [threading.Thread(target=client.get, args=(f'{site.origin}/obiavi/bmw',)) for _ in range(3)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+    print(f"  Total {elapsed:.2f}s, reported latencies: {', '.join(f'{value:.2f}s' for value in latencies)}")
+
+    ok = elapsed >= 0.6 and len(latencies) == 3 and all(0.2 <= value < 0.35 for value in latencies)
+    print('✅ Slot waits are left out of latency' if ok else '❌ Latency without slot waits FAILED')
+    return ok
+
+
+def test_no_burst_after_slot_wait():
+    """Test that workers queued for a slot don't spend rate tokens and then send together"""
+    print('\n=== TESTING NO BURST AFTER SLOT WAIT ===')
+
+    server, origin = start_server()
+    ThrottlingHandler.slow_once = {'/obiava-0': 1.0}
+    ThrottlingHandler.request_times = []
+    limiter = RateLimiter(rate=4)
+    # One slot left, as after the throttle has cut concurrency; the first request holds it for a second
+    throttle = AdaptiveThrottle(limiter, concurrency=1)
+
+    def extractor(url, logger=None, client=None):
+        return {'Link': url, 'status': client.get(url).status_code}
+
+    try:
+        with HttpClient(pool_size=8, throttle=throttle) as client:
+            links = [f'{origin}/obiava-{i}' for i in range(8)]
+            results = extract_listings(links, workers=8, extractor=extractor, client=client, limiter=limiter)
+    finally:
+        server.shutdown()
+
+    times = sorted(ThrottlingHandler.request_times)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    print(f"  Request starts: {', '.join(f'{t - times[0]:.2f}' for t in times)}")
+
+    ok = len(results) == 8 and min(gaps) >= 0.2
+    print('✅ Requests stay paced after a slot wait' if ok else '❌ Burst after slot wait')
+    return ok
+
+
+def test_pagination_retries():
+    """Test that a throttled result page is retried instead of ending pagination"""
+    print('\n=== TESTING PAGINATION RETRIES ===')
+
+    server, origin = start_server()
+    ThrottlingHandler.throttle_once = {'/search/p-2': True}
+    ThrottlingHandler.requests_seen = []
+    try:
+        with HttpClient() as client:
+            links = get_all_listing_links(f'{origin}/search', delay=0, client=client)
+    finally:
+        server.shutdown()
+
+    print(f'  Links: {len(links)}, requests: {ThrottlingHandler.requests_seen}')
+
+    ok = len(links) == 60 and ThrottlingHandler.requests_seen.count('/search/p-2') == 2
+    print('✅ Pagination retried the throttled page' if ok else '❌ Pagination retries FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 ADAPTIVE THROTTLE TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_retry_after()
+    success2 = test_aimd_recovery()
+    success3 = test_in_flight_pushback()
+    success4 = test_slot_waits_are_not_latency()
+    success5 = test_pagination_retries()
+    success6 = test_no_burst_after_slot_wait()
+
+    print('\n' + '=' * 50)
+    if success1 and success2 and success3 and success4 and success5 and success6:
+        print('🎉 All adaptive throttle tests PASSED!')
+    else:
+        print('❌ Some adaptive throttle tests FAILED')
+        sys.exit(1)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script for the async crawler engine
+Runs the async engine against a local server with synthetic mobile.bg pages
+"""
+
+import sys
+import os
+import re
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TOTAL_RESULTS = 45
+
+
+class SyntheticHandler(BaseHTTPRequestHandler):
+    """Serves search result pages at /search[/p-N] and listings at /obiava-N"""
+
+    # Result page answered after a pause, and set once it has been sent
+    slow_page = None
+    slow_page_sent = threading.Event()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        origin = f'http://127.0.0.1:{self.server.server_port}'
+        pages = -(-TOTAL_RESULTS // 20)
+        listing = re.match(r'/obiava-(\d+)', self.path)
+        page = re.match(r'/search(?:/p-(\d+))?$', self.path)
+
+        if listing:
+            n = int(listing.group(1))
+            html = (f'<html><body><h1>BMW 320 Обява: {n}</h1>'
+                    f'<div class="Price">{1000 + n} лв.</div></body></html>')
+        elif page:
+            page_num = int(page.group(1) or 1)
+            if page_num == self.slow_page:
+                time.sleep(0.5)
+            first, last = (page_num - 1) * 20, min(page_num * 20, TOTAL_RESULTS)
+            anchors = ''.join(f'<a href="{origin}/obiava-{i}">car</a>' for i in range(first, last))
+            next_link = f'<a href="{origin}/search/p-{page_num + 1}">Напред</a>' if page_num < pages else ''
+            html = (f'<html><body><div>{first + 1} - {last} от общо {TOTAL_RESULTS}</div>'
+                    f'{anchors}<div class="pagination">{next_link}</div></body></html>')
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = html.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if page and int(page.group(1) or 1) == self.slow_page:
+            self.slow_page_sent.set()
+
+
+def test_async_crawl():
+    """Test that the async engine finds and extracts every listing in order"""
+    print('=== TESTING ASYNC ENGINE ===')
+
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        print('⚠️ aiohttp not installed, skipping async engine test')
+        return True
+
+    from modules.async_engine import run_async_crawl
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SyntheticHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        search_url = f'http://127.0.0.1:{server.server_port}/search'
+        links, cars_data = run_async_crawl(search_url, delay=0, concurrency=20)
+        _, parsed_in_processes = run_async_crawl(search_url, delay=0, concurrency=20, parse_processes=2)
+    finally:
+        server.shutdown()
+
+    brands = {car['Brand'] for car in cars_data}
+    prices = [car['Price_BGN'] for car in cars_data]
+    print(f'  Links: {len(links)}, extracted: {len(cars_data)}')
+
+    if parsed_in_processes != cars_data:
+        print('❌ Process pool parsing returned different results')
+        return False
+    if len(links) == TOTAL_RESULTS and brands == {'BMW'} and prices == [1000 + n for n in range(TOTAL_RESULTS)]:
+        print('✅ Async engine test PASSED')
+        return True
+    print('❌ Async engine test FAILED')
+    return False
+
+
+def test_results_delivered_during_crawl():
+    """Test that on_result gets listings while later result pages are still loading"""
+    print('\n=== TESTING ASYNC RESULT DELIVERY ===')
+
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        print('⚠️ aiohttp not installed, skipping async result delivery test')
+        return True
+
+    from modules.async_engine import run_async_crawl
+
+    last_page = -(-TOTAL_RESULTS // 20)
+    SyntheticHandler.slow_page = last_page
+    SyntheticHandler.slow_page_sent.clear()
+    delivered = []
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SyntheticHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        search_url = f'http://127.0.0.1:{server.server_port}/search'
+        _, cars_data = run_async_crawl(search_url, delay=0, concurrency=20,
+                                       on_result=lambda car: delivered.append((car, SyntheticHandler.slow_page_sent.is_set())))
+    finally:
+        server.shutdown()
+        SyntheticHandler.slow_page = None
+
+    early = sum(1 for _, sent in delivered if not sent)
+    print(f'  Delivered: {len(delivered)}, before page {last_page} arrived: {early}')
+
+    by_link = lambda car: car['Link']
+    if sorted((car for car, _ in delivered), key=by_link) == sorted(cars_data, key=by_link) and early >= 20:
+        print('✅ Async result delivery test PASSED')
+        return True
+    print('❌ Async result delivery test FAILED')
+    return False
+
+
+if __name__ == '__main__':
+    print('🧪 ASYNC ENGINE TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_async_crawl()
+    success2 = test_results_delivered_during_crawl()
+
+    print('\n' + '=' * 50)
+    if success1 and success2:
+        print('🎉 All async engine tests PASSED!')
+    else:
+        print('❌ Some async engine tests FAILED')
+        sys.exit(1)
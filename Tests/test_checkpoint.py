@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for crawl checkpoints
+Interrupts pagination and extraction, then checks that resuming skips finished work
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.checkpoint import CrawlCheckpoint
+from modules.extraction_pool import extract_listings
+from modules.web_scraper import iter_listing_links
+from test_parallel_pagination import FakeClient, SEARCH_URL, TOTAL_RESULTS
+
+
+class CountingExtractor:
+    """Fake listing extractor that remembers which links it was asked for"""
+
+    def __init__(self):
+        self.requested = []
+
+    def __call__(self, url, logger=None, client=None):
+        self.requested.append(url)
+        return {'Brand': 'BMW', 'Model': 'Серия 3', 'Price_BGN': 10000, 'Link': url}
+
+
+def crawl_links(checkpoint, client, stop_at_page=None):
+    """Collect links into the checkpoint, abandoning the walk once stop_at_page is reached"""
+    for link in iter_listing_links(SEARCH_URL, delay=0, client=client, workers=1,
+                                   start_url=checkpoint.next_url, start_page=checkpoint.next_page,
+                                   seen_links=checkpoint.links, on_page=checkpoint.page_done):
+        if stop_at_page and checkpoint.next_page >= stop_at_page:
+            break
+        checkpoint.add_link(link)
+
+
+def test_resume_pagination():
+    """Test that resumed pagination starts at the saved page"""
+    print('=== TESTING RESUMED PAGINATION ===')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cars.checkpoint.json')
+
+        first_client = FakeClient()
+        checkpoint = CrawlCheckpoint(path, SEARCH_URL)
+        crawl_links(checkpoint, first_client, stop_at_page=3)
+
+        resumed = CrawlCheckpoint(path, SEARCH_URL)
+        loaded = resumed.load()
+        second_client = FakeClient()
+        crawl_links(resumed, second_client)
+
+        other_search = CrawlCheckpoint(path, SEARCH_URL + '&sort=2').load()
+
+    expected = [f'https://www.mobile.bg/obiava-{i}-bmw' for i in range(TOTAL_RESULTS)]
+    # Page 3 was being read when the walk stopped, so only it is fetched twice
+    refetched = set(first_client.requested) & set(second_client.requested)
+    print(f'  First run pages: {len(first_client.requested)}, resumed run pages: {len(second_client.requested)}')
+
+    ok = (loaded and resumed.links == expected and resumed.pagination_done and
+          refetched == {first_client.page_url(3)} and len(second_client.requested) == 3 and not other_search)
+    print('✅ Pagination resumed without refetching' if ok else '❌ Resumed pagination FAILED')
+    return ok
+
+
+def test_resume_extraction():
+    """Test that resumed extraction skips done listings and matches a full run"""
+    print('\n=== TESTING RESUMED EXTRACTION ===')
+
+    links = [f'https://www.mobile.bg/obiava-{i}-bmw' for i in range(50)]
+    full_run = extract_listings(links, workers=1, delay=0, extractor=CountingExtractor())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cars.checkpoint.json')
+
+        checkpoint = CrawlCheckpoint(path, SEARCH_URL, save_interval=0)
+        for link in links:
+            checkpoint.add_link(link)
+        checkpoint.page_done(3, None)
+        first_extractor = CountingExtractor()
+        extract_listings(links[:20], workers=1, delay=0, extractor=first_extractor, on_result=checkpoint.add)
+        checkpoint.close()
+
+        # A crash in the middle of writing the next record leaves a partial line
+        with open(checkpoint.records_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'Link': links[20]})[:15])
+
+        resumed = CrawlCheckpoint(path, SEARCH_URL)
+        resumed.load()
+        pending = resumed.pending_links()
+        second_extractor = CountingExtractor()
+        extract_listings(pending, workers=4, delay=0, extractor=second_extractor, on_result=resumed.add)
+        resumed.remove()
+        cleaned_up = not os.path.exists(path) and not os.path.exists(resumed.records_path)
+
+    by_link = {car['Link']: car for car in resumed.records}
+    merged = [by_link[link] for link in links if link in by_link]
+    refetched = set(first_extractor.requested) & set(second_extractor.requested)
+    print(f'  Pending after restart: {len(pending)}, records after resume: {len(merged)}')
+
+    ok = (pending == links[20:] and not refetched and merged == full_run and cleaned_up)
+    print('✅ Extraction resumed without refetching' if ok else '❌ Resumed extraction FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 CHECKPOINT TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_resume_pagination()
+    success2 = test_resume_extraction()
+
+    print('\n' + '=' * 50)
+    if success1 and success2:
+        print('🎉 All checkpoint tests PASSED!')
+    else:
+        print('❌ Some checkpoint tests FAILED')
+        sys.exit(1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for whole crawler runs
+Runs crawler.py against the synthetic site and checks what later runs fetch and write
+"""
+
+import sys
+import os
+import json
+import tempfile
+import subprocess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from site_simulator import SiteSimulator
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FILE = os.path.join(PROJECT_ROOT, 'presets', '.env.bmw-x5')
+LOG_FILE = os.path.join(PROJECT_ROOT, 'crawler.log')
+LISTINGS = 60
+
+
+def run_crawler(site, *args):
+    """Run crawler.py against the simulator with a preset .env; returns the process result"""
+    env = dict(os.environ, ENV_FILE=ENV_FILE, BASE_URL=f'{site.origin}/obiavi')
+    return subprocess.run([sys.executable, os.path.join(PROJECT_ROOT, 'crawler.py'), '--delay', '0', *args],
+                          env=env, capture_output=True, text=True, timeout=300)
+
+
+def listing_requests(site, start=0):
+    return [path for path in site.paths[start:] if path.startswith('/obiava-')]
+
+
+def test_incremental_second_run():
+    """Test that the first incremental run writes the seen file and the second skips known listings"""
+    print('=== TESTING INCREMENTAL CRAWLER RUNS ===')
+
+    with tempfile.TemporaryDirectory() as tmp, SiteSimulator(LISTINGS) as site:
+        excel = os.path.join(tmp, 'cars.xlsx')
+        args = ['--incremental', '--recheck-fraction', '0', '--excel', excel, '--workers', '4']
+
+        first = run_crawler(site, *args)
+        first_fetches = len(listing_requests(site))
+        seen_path = os.path.join(tmp, 'cars.seen.json')
+        seen_count = 0
+        if os.path.exists(seen_path):
+            with open(seen_path, 'r', encoding='utf-8') as f:
+                seen_count = len(json.load(f).get('listings', {}))
+
+        mark = len(site.paths)
+        second = run_crawler(site, *args)
+        second_fetches = len(listing_requests(site, mark))
+
+    print(f'  First run: exit {first.returncode}, {first_fetches} listings fetched, {seen_count} remembered')
+    print(f'  Second run: exit {second.returncode}, {second_fetches} listings fetched')
+
+    ok = (first.returncode == 0 and second.returncode == 0 and first_fetches == LISTINGS and
+          seen_count == LISTINGS and second_fetches == 0)
+    print('✅ Second incremental run skipped every known listing' if ok else '❌ Incremental crawler runs FAILED')
+    if not ok:
+        print((first.stdout + first.stderr)[-2000:])
+    return ok
+
+
+def test_resume_keeps_parquet_complete():
+    """Test that a resumed crawl's Parquet file holds the listings of the interrupted run too"""
+    print('\n=== TESTING RESUMED CRAWL PARQUET EXPORT ===')
+    import pyarrow.parquet as pq
+
+    # The second half of the ads fails on the first run, leaving a checkpoint behind
+    with tempfile.TemporaryDirectory() as tmp, SiteSimulator(LISTINGS, missing_listings=range(LISTINGS // 2, LISTINGS)) as site:
+        excel = os.path.join(tmp, 'cars.xlsx')
+        parquet = os.path.join(tmp, 'cars.parquet')
+        args = ['--excel', excel, '--parquet', parquet, '--workers', '4']
+
+        first = run_crawler(site, *args)
+        first_rows = pq.read_table(parquet).num_rows if os.path.exists(parquet) else 0
+        checkpoint_left = os.path.exists(os.path.join(tmp, 'cars.checkpoint.json'))
+
+        site.missing_listings.clear()
+        mark = len(site.paths)
+        second = run_crawler(site, *args, '--resume')
+        second_fetches = len(listing_requests(site, mark))
+        table = pq.read_table(parquet) if os.path.exists(parquet) else None
+        links = table.column('Link').to_pylist() if table is not None else []
+
+    print(f'  First run: exit {first.returncode}, {first_rows} Parquet rows, checkpoint kept: {checkpoint_left}')
+    print(f'  Resumed run: exit {second.returncode}, {second_fetches} listings fetched, {len(links)} Parquet rows')
+
+    ok = (first_rows == LISTINGS // 2 and checkpoint_left and second.returncode == 0 and
+          second_fetches == LISTINGS // 2 and len(links) == LISTINGS and len(set(links)) == LISTINGS)
+    print('✅ Resumed Parquet export holds every listing' if ok else '❌ Resumed Parquet export FAILED')
+    if not ok:
+        print((second.stdout + second.stderr)[-2000:])
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 CRAWLER RUN TEST SUITE')
+    print('=' * 50)
+    keep_log = os.path.exists(LOG_FILE)
+
+    success1 = test_incremental_second_run()
+    success2 = test_resume_keeps_parquet_complete()
+    success = success1 and success2
+
+    # Don't leave the crawler's log behind if these runs created it
+    if not keep_log and os.path.exists(LOG_FILE):
+        os.remove(LOG_FILE)
+
+    print('\n' + '=' * 50)
+    if success:
+        print('🎉 All crawler run tests PASSED!')
+    else:
+        print('❌ Some crawler run tests FAILED')
+        sys.exit(1)
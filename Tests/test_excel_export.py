@@ -7,10 +7,12 @@ Tests Excel file creation, structure, and data integrity
 import sys
 import os
 import shutil
+import zipfile
+import xml.etree.ElementTree as ET
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from modules.config_manager import load_env_config, get_output_config
-from modules.excel_utils import export_to_excel
+from modules.excel_utils import export_to_excel, write_rows_to_excel, write_rows_streaming, upsert_rows_to_excel
 from openpyxl import load_workbook
 
 
@@ -205,6 +207,128 @@ def test_new_sheet_creation():
     return success
 
 
+def test_streaming_export_matches():
+    """Test that the write-only exporter gives the same sheet as the classic one"""
+    print('\n=== TESTING STREAMING EXPORT ===')
+    
+    headers = list(create_test_data()[0].keys())
+    key_map = {h: h for h in headers}
+    test_cars = create_test_data() * 50
+    
+    classic_path = 'docs/test-classic.xlsx'
+    streaming_path = 'docs/test-streaming.xlsx'
+    write_rows_to_excel(classic_path, 'CarsData', test_cars, headers, key_map)
+    write_rows_streaming(streaming_path, 'CarsData', iter(test_cars), headers, key_map)
+    
+    sheets = []
+    for path in (classic_path, streaming_path):
+        wb = load_workbook(path)
+        ws = wb['CarsData']
+        table = next(iter(ws.tables.values()))
+        sheets.append({
+            'rows': [list(row) for row in ws.iter_rows(values_only=True)],
+            'widths': [ws.column_dimensions[cell.column_letter].width for cell in ws[1]],
+            'table': (table.displayName, table.ref, [column.name for column in table.tableColumns]),
+        })
+        wb.close()
+        os.remove(path)
+    
+    classic, streaming = sheets
+    print(f'  Rows: {len(streaming["rows"])}, table: {streaming["table"][:2]}')
+    print(f'  Column widths: {streaming["widths"]}')
+    
+    success = classic == streaming
+    if success:
+        print('✅ Streaming export test PASSED')
+    else:
+        print('❌ Streaming export test FAILED')
+    
+    return success
+
+
+def test_sheet_name_with_space():
+    """Test that a sheet name Excel can't use as a table name still gives a saved file with a table"""
+    print('\n=== TESTING SHEET NAME WITH SPACE ===')
+    
+    path = 'docs/test-sheet-space.xlsx'
+    if os.path.exists(path):
+        os.remove(path)
+    result_path = export_to_excel(create_test_data(), path, sheet_name='Cars Data')
+    
+    tables = []
+    widths = []
+    if result_path and os.path.exists(path):
+        wb = load_workbook(path)
+        ws = wb['Cars Data']
+        tables = [(table.displayName, table.ref) for table in ws.tables.values()]
+        widths = [ws.column_dimensions[cell.column_letter].width for cell in ws[1]]
+        wb.close()
+        os.remove(path)
+    
+    print(f'  Tables: {tables}')
+    print(f'  Column widths: {widths}')
+    
+    success = tables == [('Table_Cars_Data', 'A1:O4')] and all(widths)
+    if success:
+        print('✅ Sheet name with space test PASSED')
+    else:
+        print('❌ Sheet name with space test FAILED')
+    
+    return success
+
+
+def test_upsert_export():
+    """Test that upsert updates changed rows, appends new ones and flags vanished ones"""
+    print('\n=== TESTING UPSERT EXPORT ===')
+    
+    headers = list(create_test_data()[0].keys())
+    key_map = {h: h for h in headers}
+    path = 'docs/test-upsert.xlsx'
+    
+    def car(listing_id, price):
+        return {'Brand': 'BMW', 'Model': 'X3', 'Price_BGN': price,
+                'Link': f'https://www.mobile.bg/obiava-{listing_id}-bmw-x3'}
+    
+    write_rows_to_excel(path, 'CarsData', [car(1, 1000), car(2, 2000), car(3, 3000)], headers, key_map)
+    
+    # Listing 2 dropped its price, 3 vanished, 4 is new; the link of 1 gained a query string
+    second_run = [dict(car(1, 1000), Link='https://www.mobile.bg/obiava-1-bmw-x3?slink=x'), car(2, 1800), car(4, 4000)]
+    upsert_rows_to_excel(path, 'CarsData', second_run, headers, key_map, mark_vanished=True)
+    
+    wb = load_workbook(path)
+    ws = wb['CarsData']
+    header_row = [cell.value for cell in ws[1]]
+    price_col, status_col = header_row.index('Price_BGN'), header_row.index('Status')
+    rows = [(row[price_col], row[status_col]) for row in ws.iter_rows(min_row=2, values_only=True)]
+    table_ref = next(iter(ws.tables.values())).ref
+    wb.close()
+    
+    # Excel repairs away a table whose columns or autoFilter disagree with its ref, so check the saved XML
+    with zipfile.ZipFile(path) as archive:
+        table_xml = next(archive.read(name) for name in archive.namelist() if name.startswith('xl/tables/'))
+    os.remove(path)
+    table = ET.fromstring(table_xml)
+    ns = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+    columns_element = table.find('x:tableColumns', ns)
+    column_names = [column.get('name') for column in columns_element.findall('x:tableColumn', ns)]
+    filter_ref = table.find('x:autoFilter', ns).get('ref')
+    
+    print(f'  Rows (price, status): {rows}')
+    print(f'  Table: {table.get("ref")}, {len(column_names)} columns, autoFilter {filter_ref}')
+    
+    expected = [(1000, 'Active'), (1800, 'Active'), (3000, 'Removed'), (4000, 'Active')]
+    success = (rows == expected and table_ref == 'A1:P5' and table.get('ref') == 'A1:P5' and
+               filter_ref == 'A1:P5' and column_names == header_row and
+               columns_element.get('count') == str(len(header_row)) and
+               [column.get('id') for column in columns_element] == [str(i) for i in range(1, len(header_row) + 1)])
+    if success:
+        print('✅ Upsert export test PASSED')
+    else:
+        print('❌ Upsert export test FAILED')
+    
+    return success
+
+
 if __name__ == '__main__':
     print('🧪 EXCEL EXPORT TEST SUITE')
     print('=' * 50)
@@ -212,9 +336,12 @@ if __name__ == '__main__':
     success1 = test_excel_auto_creation()
     success2 = test_excel_structure()
     success3 = test_new_sheet_creation()
+    success4 = test_streaming_export_matches()
+    success5 = test_upsert_export()
+    success6 = test_sheet_name_with_space()
     
     print('\n' + '=' * 50)
-    if success1 and success2 and success3:
+    if success1 and success2 and success3 and success4 and success5 and success6:
         print('🎉 All Excel export tests PASSED!')
     else:
         print('❌ Some Excel tests FAILED')
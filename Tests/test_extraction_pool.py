@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent extraction
+Tests ordering and the shared politeness budget of the extraction pool
+"""
+
+import sys
+import os
+import time
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.extraction_pool import extract_listings
+
+
+def fake_extractor(url, logger=None, client=None):
+    """Simulate a listing fetch with random latency"""
+    time.sleep(random.uniform(0.01, 0.05))
+    if url.endswith('-bad'):
+        return {}
+    return {'Link': url}
+
+
+def test_results_keep_link_order():
+    """Test that results come back in the order links were found"""
+    print('=== TESTING RESULT ORDERING ===')
+
+    links = [f'https://www.mobile.bg/obiava-{i}' for i in range(30)]
+    links.insert(5, 'https://www.mobile.bg/obiava-999-bad')
+
+    streamed = []
+    results = extract_listings(links, workers=8, delay=0, extractor=fake_extractor, on_result=streamed.append)
+    result_links = [car['Link'] for car in results]
+    expected = [link for link in links if not link.endswith('-bad')]
+
+    if result_links == expected and streamed == results:
+        print(f'✅ {len(results)} results returned in discovery order')
+        return True
+    print('❌ Results are out of order')
+    return False
+
+
+def test_shared_rate_budget():
+    """Test that many workers still respect one global delay"""
+    print('\n=== TESTING SHARED RATE BUDGET ===')
+
+    starts = []
+
+    def timed_extractor(url, logger=None, client=None):
+        starts.append(time.monotonic())
+        return {'Link': url}
+
+    links = [f'https://www.mobile.bg/obiava-{i}' for i in range(10)]
+    start = time.monotonic()
+    extract_listings(links, workers=5, delay=0.05, extractor=timed_extractor)
+    elapsed = time.monotonic() - start
+
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    min_gap = min(gaps)
+    print(f'  Elapsed: {elapsed:.2f}s, smallest gap between requests: {min_gap:.3f}s')
+
+    # Ten requests at 0.05s spacing need at least ~0.45s in total
+    if elapsed >= 0.4 and min_gap >= 0.04:
+        print('✅ Workers share one politeness budget')
+        return True
+    print('❌ Request rate exceeded the configured budget')
+    return False
+
+
+def test_streaming_links():
+    """Test that extraction starts before the link generator is exhausted"""
+    print('\n=== TESTING STREAMING LINK INPUT ===')
+
+    events = []
+
+    def slow_link_source():
+        for i in range(5):
+            events.append(('found', i))
+            yield f'https://www.mobile.bg/obiava-{i}'
+            time.sleep(0.05)
+
+    def recording_extractor(url, logger=None, client=None):
+        events.append(('extracted', int(url.rsplit('-', 1)[1])))
+        return {'Link': url}
+
+    def on_result(car):
+        events.append(('delivered', int(car['Link'].rsplit('-', 1)[1])))
+
+    results = extract_listings(slow_link_source(), workers=2, delay=0, extractor=recording_extractor,
+                               on_result=on_result)
+    first_extracted = events.index(('extracted', 0))
+    first_delivered = events.index(('delivered', 0))
+    last_found = events.index(('found', 4))
+    delivered = [i for event, i in events if event == 'delivered']
+
+    if len(results) == 5 and first_extracted < last_found and first_delivered < last_found and delivered == list(range(5)):
+        print('✅ Extraction and result delivery overlapped with link discovery')
+        return True
+    print('❌ Extraction waited for the full link list')
+    return False
+
+
+class FakeListingClient:
+    """Returns a minimal listing page for every URL"""
+
+    class Response:
+        def __init__(self, content):
+            self.content = content
+
+        def raise_for_status(self):
+            pass
+
+    def get(self, url, timeout=None, **kwargs):
+        n = url.rsplit('-', 1)[1]
+        html = f'<html><body><h1>Audi A4 Обява: {n}</h1><div class="Price">{n} лв.</div></body></html>'
+        return self.Response(html.encode('utf-8'))
+
+
+def test_process_pool_parsing():
+    """Test that parsing in worker processes gives the same ordered results"""
+    print('\n=== TESTING PROCESS POOL PARSING ===')
+
+    links = [f'https://www.mobile.bg/obiava-{i}' for i in range(1, 21)]
+    client = FakeListingClient()
+    in_threads = extract_listings(links, workers=4, delay=0, client=client)
+    in_processes = extract_listings(links, workers=4, delay=0, client=client, parse_processes=2)
+
+    prices = [car['Price_BGN'] for car in in_processes]
+    if in_threads == in_processes and prices == list(range(1, 21)):
+        print(f'✅ {len(in_processes)} listings parsed in worker processes')
+        return True
+    print('❌ Process pool parsing returned different results')
+    return False
+
+
+if __name__ == '__main__':
+    print('🧪 EXTRACTION POOL TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_results_keep_link_order()
+    success2 = test_shared_rate_budget()
+    success3 = test_streaming_links()
+    success4 = test_process_pool_parsing()
+
+    print('\n' + '=' * 50)
+    if success1 and success2 and success3 and success4:
+        print('🎉 All extraction pool tests PASSED!')
+    else:
+        print('❌ Some extraction pool tests FAILED')
+        sys.exit(1)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk HTTP response cache
+Checks conditional revalidation and LRU eviction against a local server
+"""
+
+import sys
+import os
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.http_client import HttpClient
+from modules.http_cache import ResponseCache
+from modules.extractors import fetch_listing_page
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    """Serves /obiava-N pages with an ETag and answers If-None-Match with 304"""
+
+    requests_seen = []
+    version = 'v1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        etag = f'"{self.path}-{self.version}"'
+        self.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        body = f'<html><body><h1>{self.path} {self.version}</h1>{"x" * 2000}</body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def test_revalidation():
+    """Test that a second run sends If-None-Match and serves the 304 from disk"""
+    print('=== TESTING CONDITIONAL REVALIDATION ===')
+
+    server, origin = start_server()
+    ETagHandler.requests_seen = []
+    ETagHandler.version = 'v1'
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            url = f'{origin}/obiava-1'
+            with HttpClient(cache=ResponseCache(cache_dir)) as client:
+                first = fetch_listing_page(url, client=client)
+
+            # A new client over the same directory, as on the next day's run
+            with HttpClient(cache=ResponseCache(cache_dir)) as client:
+                second = fetch_listing_page(url, client=client)
+                hits = client.cache.hits
+
+                ETagHandler.version = 'v2'
+                changed = fetch_listing_page(url, client=client)
+    finally:
+        server.shutdown()
+
+    conditional = [etag for _, etag in ETagHandler.requests_seen]
+    print(f'  If-None-Match sent: {conditional}')
+    ok = (first == second and hits == 1 and conditional[0] is None and conditional[1] == '"/obiava-1-v1"'
+          and b'v2' in changed)
+    print('✅ Unchanged page served from cache, changed page refetched' if ok else '❌ Revalidation failed')
+    return ok
+
+
+def test_lru_eviction():
+    """Test that the cache stays under its size cap by dropping least recently used pages"""
+    print('\n=== TESTING LRU EVICTION ===')
+
+    server, origin = start_server()
+    ETagHandler.version = 'v1'
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ResponseCache(cache_dir, max_bytes=150)
+            with HttpClient(cache=cache) as client:
+                for n in range(1, 4):
+                    client.get(f'{origin}/obiava-{n}')
+                # Touch page 1 so pages 2 and 3 are the least recently used
+                client.get(f'{origin}/obiava-1')
+                client.get(f'{origin}/obiava-4')
+
+                cached = [n for n in range(1, 5) if cache.lookup(f'{origin}/obiava-{n}')]
+                total = cache.total_bytes()
+    finally:
+        server.shutdown()
+
+    print(f'  Cached pages: {cached}, size {total} bytes')
+    ok = total <= 150 and cached == [1, 4]
+    print('✅ Least recently used pages evicted' if ok else '❌ Eviction failed')
+    return ok
+
+
+def test_not_modified_after_eviction():
+    """Test that a 304 for an entry evicted while the request was in flight refetches the page"""
+    print('\n=== TESTING 304 AFTER EVICTION ===')
+
+    class EvictingCache(ResponseCache):
+        """Drops each entry right after handing out its validators"""
+
+        def conditional_headers(self, url):
+            headers = super().conditional_headers(url)
+            with self._lock:
+                self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+                self._conn.commit()
+            return headers
+
+    server, origin = start_server()
+    ETagHandler.requests_seen = []
+    ETagHandler.version = 'v1'
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            url = f'{origin}/obiava-1'
+            with HttpClient(cache=ResponseCache(cache_dir)) as client:
+                client.get(url)
+            with HttpClient(cache=EvictingCache(cache_dir)) as client:
+                response = client.get(url)
+                stored_again = client.cache.lookup(url) is not None
+    finally:
+        server.shutdown()
+
+    conditional = [etag for _, etag in ETagHandler.requests_seen]
+    print(f'  Status: {response.status_code}, body: {len(response.content)} bytes, If-None-Match sent: {conditional}')
+    ok = (response.status_code == 200 and b'/obiava-1 v1' in response.content and stored_again and
+          conditional == [None, '"/obiava-1-v1"', None])
+    print('✅ Evicted entry refetched in full' if ok else '❌ 304 after eviction FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 HTTP CACHE TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_revalidation()
+    success2 = test_lru_eviction()
+    success3 = test_not_modified_after_eviction()
+
+    print('\n' + '=' * 50)
+    if success1 and success2 and success3:
+        print('🎉 All HTTP cache tests PASSED!')
+    else:
+        print('❌ Some HTTP cache tests FAILED')
+        sys.exit(1)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental crawling
+Checks which listings an incremental run fetches and how results are merged
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.incremental import SeenListings
+from modules.extractors import listing_id_from_url
+
+
+def make_links(ids):
+    return [f'https://www.mobile.bg/obiava-{i}-bmw-320' for i in ids]
+
+
+def fake_extract(links, price):
+    return [{'Link': link, 'Price_BGN': price} for link in links]
+
+
+def test_listing_ids():
+    """Test that the obiava ID is read from listing URLs"""
+    print('=== TESTING LISTING IDS ===')
+
+    cases = {
+        'https://www.mobile.bg/obiava-11759077895164151-bmw-320-d-touring': '11759077895164151',
+        '//www.mobile.bg/obiava-42?slink=abc': '42',
+        'https://www.mobile.bg/obiavi/avtomobili-dzhipove/bmw': None,
+    }
+    ok = all(listing_id_from_url(url) == expected for url, expected in cases.items())
+    print('✅ Listing IDs extracted' if ok else '❌ Listing ID extraction failed')
+    return ok
+
+
+def test_incremental_runs():
+    """Test that a second run fetches only new listings plus the re-check sample"""
+    print('\n=== TESTING INCREMENTAL RUNS ===')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'car-data.seen.json')
+
+        # Day one: everything is new
+        day_one = make_links(range(100))
+        seen = SeenListings(path)
+        fetch_one = seen.plan(day_one, recheck_fraction=0.03)
+        merged_one = seen.merge(day_one, fake_extract(fetch_one, 1000))
+        seen.save()
+
+        # Day two: 10 listings gone, 10 new ones, and new listing 105 fails to extract
+        day_two = make_links(range(10, 110))
+        seen = SeenListings(path)
+        fetch_two = seen.plan(day_two, recheck_fraction=0.03)
+        fetched = [car for car in fake_extract(fetch_two, 900) if car['Link'] != day_two[95]]
+        merged_two = seen.merge(day_two, fetched)
+        seen.save()
+
+        # Day three: the next re-check sample moves on to other listings
+        seen = SeenListings(path)
+        fetch_three = seen.plan(day_two, recheck_fraction=0.03)
+
+    new_ids = {listing_id_from_url(link) for link in fetch_two} - {str(i) for i in range(100)}
+    rechecked_two = set(fetch_two) - set(make_links(range(100, 110)))
+    rechecked_three = set(fetch_three) - {day_two[95]}
+    print(f'  Day one fetched {len(fetch_one)}, day two fetched {len(fetch_two)}, day three fetched {len(fetch_three)}')
+
+    ok = (len(fetch_one) == 100 and len(merged_one) == 100 and
+          len(fetch_two) == 13 and new_ids == {str(i) for i in range(100, 110)} and
+          [car['Link'] for car in merged_two] == [link for link in day_two if link != day_two[95]] and
+          sum(car['Price_BGN'] == 900 for car in merged_two) == 12 and
+          len(fetch_three) == 4 and len(rechecked_three) == 3 and not rechecked_two & rechecked_three)
+    print('✅ Only new listings and the re-check sample are fetched' if ok else '❌ Incremental plan or merge is wrong')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 INCREMENTAL CRAWL TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_listing_ids()
+    success2 = test_incremental_runs()
+
+    print('\n' + '=' * 50)
+    if success1 and success2:
+        print('🎉 All incremental crawl tests PASSED!')
+    else:
+        print('❌ Some incremental crawl tests FAILED')
+        sys.exit(1)
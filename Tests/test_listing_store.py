@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite listing store
+Tests field parsing, record round-trips, indexed queries and price history
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.field_parsers import parse_mileage_km, parse_power_hp, parse_production_date
+from modules.listing_store import ListingStore, listing_key
+from modules.extractors import parse_car_info_mobile
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LISTING_URL = 'https://www.mobile.bg/obiava-11759077895164151-bmw-320-d-touring'
+MONTHS = ['януари', 'февруари', 'март', 'април', 'май', 'юни', 'юли', 'август', 'септември', 'октомври', 'ноември', 'декември']
+
+
+def synthetic_car(i, rng):
+    return {
+        'Brand': rng.choice(['BMW', 'Audi', 'Toyota', 'Honda']),
+        'Model': rng.choice(['X3', 'A4', 'Corolla', 'CR-V', 'Seria 3']),
+        'Production Date': f'{rng.choice(MONTHS)} {rng.randint(1998, 2024)}',
+        'Price': '',
+        'Price_EUR': round(rng.uniform(1000, 60000), 2),
+        'Price_BGN': rng.randint(2000, 120000),
+        'Engine': f'{rng.randint(70, 400)} к.с.',
+        'Fuel Type': 'Дизелов',
+        'Transmission': 'Ръчна',
+        'Mileage': f'{rng.randint(0, 400000)} км',
+        'Color': 'Черен',
+        'Location': 'София',
+        'Phone': '0888123456',
+        'Link': f'https://www.mobile.bg/obiava-{1000000 + i}-car',
+        'Описание': '',
+        'Car Extras': 'ABS',
+    }
+
+
+def test_field_parsers():
+    """Test parsing of mileage, power and Bulgarian production dates"""
+    print('=== TESTING FIELD PARSERS ===')
+
+    ok = (parse_mileage_km('150 000 км') == 150000 and
+          parse_mileage_km('303000 км') == 303000 and
+          parse_mileage_km('') is None and
+          parse_power_hp('190 к.с.') == 190 and
+          parse_production_date('юни 2007') == (2007, 6) and
+          parse_production_date('Декември 2015') == (2015, 12) and
+          parse_production_date('2011') == (2011, None) and
+          parse_production_date('') == (None, None))
+    print('✅ Field parsers test PASSED' if ok else '❌ Field parsers test FAILED')
+    return ok
+
+
+def test_round_trip():
+    """Test that stored records read back exactly as the extractor returned them"""
+    print('\n=== TESTING RECORD ROUND-TRIP ===')
+
+    with open(os.path.join(FIXTURES_DIR, 'listing_page.html'), 'rb') as f:
+        extracted = parse_car_info_mobile(f.read(), LISTING_URL)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with ListingStore(os.path.join(tmp, 'listings.db')) as store:
+            store.add(extracted)
+            # A second crawl of the same listing updates the row instead of adding one
+            store.add(dict(extracted, Price_BGN=1))
+            store.add(extracted)
+            stored = store.records([listing_key(extracted)])
+            count = store.count()
+
+    ok = stored == [extracted] and count == 1
+    print(f'  Stored listings: {count}')
+    print('✅ Round-trip test PASSED' if ok else f'❌ Round-trip test FAILED: {stored}')
+    return ok
+
+
+def test_indexed_queries():
+    """Test batched inserts and indexed queries over many listings"""
+    print('\n=== TESTING INDEXED QUERIES ===')
+
+    rng = random.Random(3)
+    cars = [synthetic_car(i, rng) for i in range(100000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with ListingStore(os.path.join(tmp, 'listings.db'), batch_size=1000) as store:
+            start = time.perf_counter()
+            store.add_many(cars)
+            store.flush()
+            insert_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            found = store.query(brand='BMW', model='X3', max_price=5000, min_year=2015, limit=20)
+            query_time = time.perf_counter() - start
+
+            plan = store.conn.execute(
+                'EXPLAIN QUERY PLAN SELECT * FROM listings WHERE brand = ? AND model = ? AND price_bgn <= ?',
+                ('BMW', 'X3', 5000)).fetchall()
+
+    expected = sorted((car for car in cars if car['Brand'] == 'BMW' and car['Model'] == 'X3' and
+                       car['Price_BGN'] <= 5000 and int(car['Production Date'].split()[1]) >= 2015),
+                      key=lambda car: car['Price_BGN'])[:20]
+    print(f'  Inserted {len(cars)} listings in {insert_time:.2f}s, query took {query_time * 1000:.1f} ms')
+    print(f'  Query plan: {plan[0][-1]}')
+
+    ok = ([car['Link'] for car in found] == [car['Link'] for car in expected] and
+          'USING INDEX' in plan[0][-1] and query_time < 0.1)
+    print('✅ Indexed query test PASSED' if ok else '❌ Indexed query test FAILED')
+    return ok
+
+
+def test_price_history():
+    """Test that price observations accumulate and drops are found from the latest two"""
+    print('\n=== TESTING PRICE HISTORY ===')
+
+    rng = random.Random(5)
+    cars = [synthetic_car(i, rng) for i in range(1000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with ListingStore(os.path.join(tmp, 'listings.db')) as store:
+            store.add_many(cars)
+            store.flush()
+
+            # Next run: listing 0 drops 20%, listing 1 drops 3%, listing 2 rises
+            second_run_start = time.time()
+            changed = [dict(cars[0], Price_BGN=int(cars[0]['Price_BGN'] * 0.8)),
+                       dict(cars[1], Price_BGN=int(cars[1]['Price_BGN'] * 0.97)),
+                       dict(cars[2], Price_BGN=cars[2]['Price_BGN'] * 2)]
+            store.add_many(changed + cars[3:])
+            # Remembered records re-stored without a fresh fetch don't count as observations
+            store.add_many(changed, record_price=False)
+            store.flush()
+
+            drops = store.prices.price_drops(5, since=second_run_start)
+            small_drops = store.prices.price_drops(1)
+            history = store.prices.history(listing_key(cars[0]))
+            plan = store.conn.execute(
+                'EXPLAIN QUERY PLAN SELECT listing_id FROM latest_prices WHERE observed_at >= ?', (0,)).fetchall()
+
+    print(f'  Drops over 5%: {[(d["listing_id"], d["drop_pct"]) for d in drops]}')
+    print(f'  History of listing 0: {[price for _, _, price in history]}')
+
+    ok = ([d['listing_id'] for d in drops] == [listing_key(cars[0])] and
+          drops[0]['drop_pct'] == 20.0 and
+          [d['listing_id'] for d in small_drops] == [listing_key(cars[0]), listing_key(cars[1])] and
+          [price for _, _, price in history] == [cars[0]['Price_BGN'], changed[0]['Price_BGN']] and
+          'price_history' not in str(plan))
+    print('✅ Price history test PASSED' if ok else '❌ Price history test FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 LISTING STORE TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_field_parsers()
+    success2 = test_round_trip()
+    success3 = test_indexed_queries()
+    success4 = test_price_history()
+
+    print('\n' + '=' * 50)
+    if success1 and success2 and success3 and success4:
+        print('🎉 All listing store tests PASSED!')
+    else:
+        print('❌ Some listing store tests FAILED')
+        sys.exit(1)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for per-stage crawl metrics
+Crawls the synthetic site with instrumentation on and checks the histograms against what the site served
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.metrics import CrawlMetrics, Histogram
+from modules.extractors import FIELD_GROUPS
+from modules.extraction_pool import extract_listings
+from modules.http_client import HttpClient
+from modules.rate_limiter import RateLimiter
+from modules.web_scraper import get_all_listing_links
+from site_simulator import SiteSimulator, RESULTS_PER_PAGE
+
+LISTINGS = 45
+
+
+def test_histogram_percentiles():
+    """Test nearest-rank percentiles of a stage histogram"""
+    print('=== TESTING HISTOGRAM PERCENTILES ===')
+
+    histogram = Histogram()
+    for value in range(100, 0, -1):
+        histogram.add(value)
+    summary = histogram.summary()
+    empty = Histogram().summary()
+    print(f"  p50={summary['p50']}, p95={summary['p95']}, p99={summary['p99']}, mean={summary['mean']}")
+
+    ok = (summary['p50'] == 50 and summary['p95'] == 95 and summary['p99'] == 99 and summary['max'] == 100 and
+          summary['count'] == 100 and summary['mean'] == 50.5 and empty['count'] == 0 and empty['p99'] == 0.0)
+    print('✅ Percentiles are correct' if ok else '❌ Histogram percentiles FAILED')
+    return ok
+
+
+def crawl(site, metrics, parse_processes=0):
+    base_url = os.environ.get('BASE_URL')
+    os.environ['BASE_URL'] = f'{site.origin}/obiavi'
+    limiter = RateLimiter(rate=0, metrics=metrics)
+    try:
+        with HttpClient(pool_size=4, metrics=metrics) as client:
+            links = get_all_listing_links(site.search_url, client=client, workers=4, limiter=limiter, metrics=metrics)
+            cars = extract_listings(links, workers=4, client=client, limiter=limiter,
+                                    parse_processes=parse_processes, metrics=metrics)
+    finally:
+        if base_url is None:
+            os.environ.pop('BASE_URL', None)
+        else:
+            os.environ['BASE_URL'] = base_url
+    return links, cars
+
+
+def test_crawl_metrics():
+    """Test that every request, wait and parse of a crawl is recorded"""
+    print('\n=== TESTING CRAWL METRICS ===')
+
+    metrics = CrawlMetrics()
+    with SiteSimulator(LISTINGS, throttle_every=20, retry_after=0) as site:
+        links, cars = crawl(site, metrics)
+        served, bytes_sent, statuses = site.requests, site.bytes_sent, dict(site.statuses)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'metrics.json')
+        metrics.write_json(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+
+    stages = report['stages']
+    counters = report['counters']
+    pages = -(-LISTINGS // RESULTS_PER_PAGE)
+    # Without an adaptive throttle, retries skip the rate limiter and only wait out the backoff
+    print(f"  Requests: {counters.get('requests')} (served {served}), bytes: {counters.get('bytes')} (sent {bytes_sent})")
+    print('  Stages: ' + ', '.join(f"{name}={summary['count']}" for name, summary in stages.items()))
+
+    ok = (len(cars) == LISTINGS and
+          counters.get('requests') == served and counters.get('bytes') == bytes_sent and
+          counters.get('http_429') == statuses.get(429) and counters.get('listings') == LISTINGS and
+          stages['fetch']['count'] == served and stages['rate_limit_wait']['count'] == served - statuses.get(429) and
+          stages['retry_wait']['count'] == statuses.get(429) and stages['result_parse']['count'] == pages and
+          stages['parse']['count'] == LISTINGS and stages['fields']['count'] == LISTINGS and
+          all(stages[f'field.{name}']['count'] == LISTINGS for name, _ in FIELD_GROUPS) and
+          stages['fetch']['p50'] <= stages['fetch']['p95'] <= stages['fetch']['p99'] <= stages['fetch']['max'] and
+          report['throughput']['requests_per_s'] > 0)
+    print('✅ Crawl metrics are complete' if ok else '❌ Crawl metrics FAILED')
+    return ok
+
+
+def test_parse_process_metrics():
+    """Test that parse timings come back from parser processes"""
+    print('\n=== TESTING PARSER PROCESS METRICS ===')
+
+    metrics = CrawlMetrics()
+    with SiteSimulator(LISTINGS) as site:
+        links, cars = crawl(site, metrics, parse_processes=2)
+
+    stages = metrics.report()['stages']
+    print(f"  Cars: {len(cars)}, parse samples: {stages['parse']['count']}, field samples: {stages['fields']['count']}")
+
+    ok = (len(cars) == LISTINGS and cars[0].get('Brand') == 'BMW' and
+          stages['parse']['count'] == LISTINGS and stages['fields']['count'] == LISTINGS)
+    print('✅ Parser process timings recorded' if ok else '❌ Parser process metrics FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 METRICS TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_histogram_percentiles()
+    success2 = test_crawl_metrics()
+    success3 = test_parse_process_metrics()
+
+    print('\n' + '=' * 50)
+    if success1 and success2 and success3:
+        print('🎉 All metrics tests PASSED!')
+    else:
+        print('❌ Some metrics tests FAILED')
+        sys.exit(1)
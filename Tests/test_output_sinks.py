@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the JSONL and CSV output sinks
+Checks that records survive a crash and that appending keeps one header
+"""
+
+import sys
+import os
+import csv
+import json
+import tempfile
+import subprocess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.output_sinks import open_sink, JsonlSink, CsvSink
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Writes records from the extraction loop, then dies without closing the sinks
+CRASHING_RUN = """
+import os, sys
+sys.path.insert(0, {root!r})
+from modules.output_sinks import open_sink
+from modules.extraction_pool import extract_listings
+
+sinks = [open_sink({jsonl!r}), open_sink({csv!r})]
+
+def extractor(url, logger=None, client=None):
+    return {{'Brand': 'BMW', 'Model': 'X3', 'Price_BGN': 1000, 'Link': url}}
+
+def on_result(car):
+    if car['Link'].endswith('-25'):
+        os._exit(1)
+    for sink in sinks:
+        sink.add(car)
+
+links = [f'https://www.mobile.bg/obiava-{{i}}' for i in range(1, 40)]
+extract_listings(links, workers=1, delay=0, extractor=extractor, on_result=on_result)
+"""
+
+
+def test_records_survive_crash():
+    """Test that every record written before a crash is on disk"""
+    print('=== TESTING CRASH DURABILITY ===')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, 'cars.jsonl')
+        csv_path = os.path.join(tmp, 'cars.csv')
+        script = CRASHING_RUN.format(root=PROJECT_ROOT, jsonl=jsonl_path, csv=csv_path)
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True)
+
+        with open(jsonl_path, encoding='utf-8') as f:
+            jsonl_records = [json.loads(line) for line in f]
+        with open(csv_path, encoding='utf-8', newline='') as f:
+            csv_records = list(csv.DictReader(f))
+
+    print(f'  Exit code: {result.returncode}, JSONL records: {len(jsonl_records)}, CSV records: {len(csv_records)}')
+
+    ok = (result.returncode == 1 and len(jsonl_records) == 24 and len(csv_records) == 24 and
+          jsonl_records[-1]['Link'].endswith('obiava-24') and csv_records[-1]['Price_BGN'] == '1000')
+    print('✅ Records written before the crash were kept' if ok else '❌ Records were lost')
+    return ok
+
+
+def test_append_across_runs():
+    """Test that a second run appends and the CSV header is written once"""
+    print('\n=== TESTING APPEND ACROSS RUNS ===')
+
+    car = {'Brand': 'Audi', 'Model': 'A4', 'Описание': 'Като нова, "без" забележки', 'Link': 'https://www.mobile.bg/obiava-1'}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'cars.csv')
+        jsonl_path = os.path.join(tmp, 'cars.jsonl')
+        for _ in range(2):
+            with CsvSink(csv_path) as csv_sink, JsonlSink(jsonl_path) as jsonl_sink:
+                csv_sink.add(car)
+                jsonl_sink.add(car)
+
+        with open(csv_path, encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        with open(jsonl_path, encoding='utf-8') as f:
+            jsonl_records = [json.loads(line) for line in f]
+
+    try:
+        open_sink('cars.xlsx')
+        rejected = False
+    except ValueError:
+        rejected = True
+
+    ok = (len(rows) == 3 and rows[0][0] == 'Brand' and rows[1] == rows[2] and
+          jsonl_records == [car, car] and rejected)
+    print('✅ Sinks append with a single header' if ok else '❌ Append test failed')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 OUTPUT SINK TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_records_survive_crash()
+    success2 = test_append_across_runs()
+
+    print('\n' + '=' * 50)
+    if success1 and success2:
+        print('🎉 All output sink tests PASSED!')
+    else:
+        print('❌ Some output sink tests FAILED')
+        sys.exit(1)
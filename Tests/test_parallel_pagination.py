@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent pagination
+Tests page URL inference and the parallel page walk against synthetic pages
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.web_scraper import get_all_listing_links, iter_listing_links, infer_page_url_template
+
+
+SEARCH_URL = 'https://www.mobile.bg/obiavi/avtomobili-dzhipove/bmw/seria-3/sedan/benzinov?price=5000&price1=50000'
+TOTAL_RESULTS = 95
+
+
+class FakeResponse:
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content.encode('utf-8')
+
+
+class FakeClient:
+    """Serves synthetic mobile.bg result pages and records requested URLs"""
+
+    def __init__(self, with_page_numbers=True, failing_pages=()):
+        self.with_page_numbers = with_page_numbers
+        self.failing_pages = set(failing_pages)
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def page_url(self, page):
+        if page == 1:
+            return SEARCH_URL
+        if self.with_page_numbers:
+            return SEARCH_URL.replace('/benzinov?', f'/benzinov/p-{page}?')
+        return SEARCH_URL + f'&next={"x" * page}'
+
+    def get(self, url, timeout=None, **kwargs):
+        with self._lock:
+            self.requested.append(url)
+        pages = -(-TOTAL_RESULTS // 20)
+        page = next((p for p in range(1, pages + 1) if self.page_url(p) == url), None)
+        if page is None:
+            return FakeResponse(404, '')
+        if page in self.failing_pages:
+            return FakeResponse(503, '')
+
+        first = (page - 1) * 20
+        last = min(page * 20, TOTAL_RESULTS)
+        anchors = ''.join(f'<a href="//www.mobile.bg/obiava-{i}-bmw">BMW {i}</a>' for i in range(first, last))
+        next_link = f'<a href="{self.page_url(page + 1)}">Напред</a>' if page < pages else ''
+        html = (
+            f'<html><body><div>{first + 1} - {last} от общо {TOTAL_RESULTS}</div>'
+            f'{anchors}<div class="pagination">{next_link}</div></body></html>'
+        )
+        return FakeResponse(200, html)
+
+
+def test_page_url_inference():
+    """Test that page URLs are inferred from the next-page link"""
+    print('=== TESTING PAGE URL INFERENCE ===')
+
+    template = infer_page_url_template(SEARCH_URL.replace('/benzinov?', '/benzinov/p-2?'))
+    ok = template is not None and template(7) == SEARCH_URL.replace('/benzinov?', '/benzinov/p-7?')
+    ok = ok and infer_page_url_template(SEARCH_URL + '&page=2')(3) == SEARCH_URL + '&page=3'
+    ok = ok and infer_page_url_template(SEARCH_URL + '&sort=1') is None
+
+    print('✅ Page URL inference PASSED' if ok else '❌ Page URL inference FAILED')
+    return ok
+
+
+def test_parallel_walk_matches_sequential():
+    """Test that the parallel walk finds the same links in the same order"""
+    print('\n=== TESTING PARALLEL PAGE WALK ===')
+
+    sequential = get_all_listing_links(SEARCH_URL, delay=0, client=FakeClient(), workers=1)
+    parallel_client = FakeClient()
+    parallel = get_all_listing_links(SEARCH_URL, delay=0, client=parallel_client, workers=4)
+    fallback = get_all_listing_links(SEARCH_URL, delay=0, client=FakeClient(with_page_numbers=False), workers=4)
+
+    expected = [f'https://www.mobile.bg/obiava-{i}-bmw' for i in range(TOTAL_RESULTS)]
+    print(f'  Sequential: {len(sequential)}, parallel: {len(parallel)}, fallback: {len(fallback)} links')
+
+    if sequential == parallel == fallback == expected and len(parallel_client.requested) == 5:
+        print('✅ Parallel page walk PASSED')
+        return True
+    print('❌ Parallel page walk FAILED')
+    return False
+
+
+def test_failed_page_stops_resume_position():
+    """Test that on_page never moves past a concurrently fetched page that failed"""
+    print('\n=== TESTING FAILED PAGE RESUME POSITION ===')
+
+    pages_done = []
+    client = FakeClient(failing_pages={3})
+    first = list(iter_listing_links(SEARCH_URL, delay=0, client=client, workers=4,
+                                    on_page=lambda n, url: pages_done.append((n, url))))
+    page_num, next_url = pages_done[-1]
+
+    # Resume like the crawler does, from the last reported position
+    resumed = list(iter_listing_links(SEARCH_URL, delay=0, client=FakeClient(), workers=4,
+                                      start_url=next_url, start_page=page_num + 1, seen_links=first,
+                                      on_page=lambda n, url: pages_done.append((n, url))))
+
+    expected = [f'https://www.mobile.bg/obiava-{i}-bmw' for i in range(TOTAL_RESULTS)]
+    print(f'  First run: {len(first)} links, last page reported: {page_num}')
+    print(f'  Resumed run: {len(resumed)} links, pagination finished: {pages_done[-1][1] is None}')
+
+    ok = (pages_done[:2] == [(1, client.page_url(2)), (2, client.page_url(3))] and page_num == 2 and
+          len(first) == TOTAL_RESULTS - 20 and sorted(first + resumed, key=expected.index) == expected and
+          pages_done[-1][1] is None)
+    print('✅ Failed page resume position PASSED' if ok else '❌ Failed page resume position FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 PARALLEL PAGINATION TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_page_url_inference()
+    success2 = test_parallel_walk_matches_sequential()
+    success3 = test_failed_page_stops_resume_position()
+
+    print('\n' + '=' * 50)
+    if success1 and success2 and success3:
+        print('🎉 All parallel pagination tests PASSED!')
+    else:
+        print('❌ Some parallel pagination tests FAILED')
+        sys.exit(1)
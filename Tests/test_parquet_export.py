@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the Parquet exporter
+Checks typed columns and row-group chunking
+"""
+
+import sys
+import os
+import datetime
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.excel_utils import EXCEL_HEADERS
+
+
+def make_car(i):
+    return {
+        'Brand': 'Toyota',
+        'Model': 'Corolla',
+        'Production Date': 'юни 2007' if i % 2 else '2011',
+        'Price_EUR': 2964.98 + i,
+        'Price_BGN': 5799 + i if i % 10 else '',
+        'Engine': '124 к.с.',
+        'Fuel Type': 'Бензинов',
+        'Transmission': 'Ръчна',
+        'Mileage': '303 000 км',
+        'Color': 'Сив',
+        'Location': 'София',
+        'Phone': '0893911291',
+        'Link': f'https://www.mobile.bg/obiava-{i}-toyota-corolla',
+        'Описание': '',
+        'Car Extras': 'Климатик, ABS',
+    }
+
+
+def test_parquet_export():
+    """Test that records are written as typed columns in row groups"""
+    print('=== TESTING PARQUET EXPORT ===')
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print('⚠️ pyarrow not installed, skipping Parquet export test')
+        return True
+
+    from modules.parquet_export import ParquetExporter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'cars.parquet')
+        exporter = ParquetExporter(path, rows_per_group=100)
+        exporter.add_many(make_car(i) for i in range(250))
+        exporter.close()
+
+        parquet_file = pq.ParquetFile(path)
+        row_groups = [parquet_file.metadata.row_group(i).num_rows for i in range(parquet_file.num_row_groups)]
+        table = parquet_file.read()
+
+    types = {field.name: str(field.type) for field in table.schema}
+    rows = table.to_pylist()
+    print(f'  Row groups: {row_groups}')
+    print(f'  Types: Price_EUR={types["Price_EUR"]}, Price_BGN={types["Price_BGN"]}, '
+          f'Mileage={types["Mileage"]}, Engine={types["Engine"]}, Production Date={types["Production Date"]}')
+
+    ok = (table.column_names == EXCEL_HEADERS and row_groups == [100, 100, 50] and
+          types['Price_EUR'] == 'double' and types['Price_BGN'] == 'int64' and
+          rows[1]['Production Date'] == datetime.date(2007, 6, 1) and
+          rows[2]['Production Date'] == datetime.date(2011, 1, 1) and
+          rows[0]['Price_BGN'] is None and rows[1]['Price_BGN'] == 5800 and
+          rows[1]['Mileage'] == 303000 and rows[1]['Engine'] == 124 and
+          rows[1]['Описание'] is None and rows[1]['Brand'] == 'Toyota')
+    print('✅ Parquet export test PASSED' if ok else '❌ Parquet export test FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 PARQUET EXPORT TEST SUITE')
+    print('=' * 50)
+
+    success = test_parquet_export()
+
+    print('\n' + '=' * 50)
+    if success:
+        print('🎉 All Parquet export tests PASSED!')
+    else:
+        print('❌ Some Parquet export tests FAILED')
+        sys.exit(1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test script for parser engine selection
+Checks that every installed parser backend produces the same extraction results
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.extractors import parse_car_info_mobile, FIELD_GROUPS
+from modules import web_scraper
+from modules.web_scraper import parse_result_page, _scan_total_results
+from modules.html_parser import SUPPORTED_PARSERS, DEFAULT_PARSER, get_parser_engine
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LISTING_URL = 'https://www.mobile.bg/obiava-11759077895164151-bmw-320-d-touring'
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def installed_parsers():
+    """Parser engines that are actually available here"""
+    return [parser for parser in SUPPORTED_PARSERS if get_parser_engine(parser) == parser]
+
+
+def test_listing_dicts_match():
+    """Test that every backend gives the same car dict for a listing page"""
+    print('=== TESTING LISTING EXTRACTION ACROSS PARSERS ===')
+
+    content = read_fixture('listing_page.html')
+    expected = parse_car_info_mobile(content, LISTING_URL, parser=DEFAULT_PARSER)
+    if not expected.get('Brand') or not expected.get('Price_BGN'):
+        print('❌ Reference extraction failed')
+        return False
+
+    ok = True
+    for parser in installed_parsers():
+        start = time.perf_counter()
+        car_info = parse_car_info_mobile(content, LISTING_URL, parser=parser)
+        elapsed = (time.perf_counter() - start) * 1000
+        same = car_info == expected
+        ok = ok and same
+        print(f'  {"✅" if same else "❌"} {parser:<12} {elapsed:.1f} ms')
+    return ok
+
+
+def test_result_pages_match():
+    """Test that every backend finds the same links, next page and total"""
+    print('\n=== TESTING RESULT PAGE PARSING ACROSS PARSERS ===')
+
+    content = read_fixture('result_page.html')
+    expected = parse_result_page(content, find_total=True, parser=DEFAULT_PARSER)
+    if expected[2] != 57 or len(expected[0]) != 3 or not expected[1]:
+        print(f'❌ Reference parse failed: {expected}')
+        return False
+
+    ok = True
+    for parser in installed_parsers():
+        same = parse_result_page(content, find_total=True, parser=parser) == expected
+        ok = ok and same
+        print(f'  {"✅" if same else "❌"} {parser}')
+    return ok
+
+
+def test_cp1251_result_pages_match():
+    """Test that every backend reads a windows-1251 result page like the UTF-8 one"""
+    print('\n=== TESTING CP1251 RESULT PAGE PARSING ACROSS PARSERS ===')
+
+    # Its next link has no "next" class, so "Напред" has to be decoded to be found
+    expected = parse_result_page(read_fixture('result_page.html'), find_total=True, parser=DEFAULT_PARSER)
+    http_equiv = read_fixture('result_page_cp1251.html')
+    meta_charset = http_equiv.replace(b'<meta http-equiv="Content-Type" content="text/html; charset=windows-1251">',
+                                      b'<meta charset="windows-1251">')
+
+    ok = True
+    for parser in installed_parsers():
+        for label, content in (('http-equiv', http_equiv), ('meta charset', meta_charset)):
+            same = parse_result_page(content, find_total=True, parser=parser) == expected
+            ok = ok and same
+            print(f'  {"✅" if same else "❌"} {parser:<12} {label}')
+    return ok
+
+
+def test_restricted_parse_matches_full_parse():
+    """Test that the filtered tree and raw counter scan agree with a full parse"""
+    print('\n=== TESTING RESTRICTED RESULT PAGE PARSING ===')
+
+    content = read_fixture('result_page.html')
+    restricted = parse_result_page(content, find_total=True, parser=DEFAULT_PARSER)
+
+    element_filter = web_scraper.ElementFilter
+    web_scraper.ElementFilter = None
+    try:
+        full = parse_result_page(content, find_total=True, parser=DEFAULT_PARSER)
+    finally:
+        web_scraper.ElementFilter = element_filter
+
+    counters = [
+        _scan_total_results(content),
+        _scan_total_results('<div>1 - 20 от общо <b>57</b></div>'),
+        _scan_total_results('<div>1 - 20 от общо 57</div>'.encode('cp1251')),
+    ]
+    # Without a counter in the raw bytes the full-parse fallback still runs
+    no_counter = parse_result_page(content.replace('от общо'.encode('utf-8'), b''), find_total=True)
+
+    ok = restricted == full and counters == [57, 57, 57] and no_counter[2] is None
+    print(f'  Restricted: {len(restricted[0])} links, total {restricted[2]}; full: {len(full[0])} links, total {full[2]}')
+    print(f'  Raw counter scans: {counters}')
+    print('✅ Restricted parsing matches the full parse' if ok else '❌ Restricted parsing differs')
+    return ok
+
+
+def test_field_group_timings():
+    """Test that per-field-group timings are reported without changing the result"""
+    print('\n=== TESTING FIELD GROUP TIMINGS ===')
+
+    content = read_fixture('listing_page.html')
+    timings = {}
+    timed = parse_car_info_mobile(content, LISTING_URL, timings=timings)
+    expected_stages = ['parse'] + [name for name, _ in FIELD_GROUPS]
+
+    ok = (timed == parse_car_info_mobile(content, LISTING_URL) and list(timings) == expected_stages and
+          all(seconds >= 0 for seconds in timings.values()))
+    print(f'  Stages: {", ".join(f"{name}={seconds * 1000:.2f}ms" for name, seconds in timings.items())}')
+    print('✅ Field group timings PASSED' if ok else '❌ Field group timings FAILED')
+    return ok
+
+
+def test_unknown_parser_falls_back():
+    """Test that an unknown engine name falls back to html.parser"""
+    print('\n=== TESTING PARSER FALLBACK ===')
+
+    ok = get_parser_engine('no-such-parser') == DEFAULT_PARSER
+    print('✅ Unknown parser falls back to html.parser' if ok else '❌ Fallback failed')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 PARSER ENGINE TEST SUITE')
+    print('=' * 50)
+    print(f'Installed parsers: {", ".join(installed_parsers())}')
+
+    success1 = test_listing_dicts_match()
+    success2 = test_result_pages_match()
+    success3 = test_restricted_parse_matches_full_parse()
+    success4 = test_unknown_parser_falls_back()
+    success5 = test_field_group_timings()
+    success6 = test_cp1251_result_pages_match()
+
+    print('\n' + '=' * 50)
+    if success1 and success2 and success3 and success4 and success5 and success6:
+        print('🎉 All parser engine tests PASSED!')
+    else:
+        print('❌ Some parser engine tests FAILED')
+        sys.exit(1)
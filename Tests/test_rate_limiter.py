@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for the token-bucket rate limiter
+Checks burst and sustained rates, per-host budgets and that latency counts toward the budget
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.rate_limiter import TokenBucket, RateLimiter, parse_host_rate
+
+
+def test_token_bucket():
+    """Test burst allowance and sustained rate on a simulated clock"""
+    print('=== TESTING TOKEN BUCKET ===')
+
+    bucket = TokenBucket(rate=10, burst=3)
+    # Ten requests arriving at once: three go immediately, the rest every 0.1s
+    waits = [round(bucket.reserve(0.0), 3) for _ in range(10)]
+
+    # After a long idle period the bucket is full again, but never above burst
+    refilled = TokenBucket(rate=10, burst=3)
+    refilled.reserve(0.0)
+    idle_waits = [round(refilled.reserve(60.0), 3) for _ in range(4)]
+
+    unlimited = TokenBucket(rate=0)
+    print(f'  Waits: {waits}')
+
+    ok = (waits == [0, 0, 0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7] and
+          idle_waits == [0, 0, 0, 0.1] and unlimited.reserve(0.0) == 0 and
+          parse_host_rate('WWW.Mobile.bg=2.5:4') == ('www.mobile.bg', (2.5, 4)))
+    print('✅ Token bucket PASSED' if ok else '❌ Token bucket FAILED')
+    return ok
+
+
+def test_latency_counts_toward_budget():
+    """Test that a slow request leaves no extra wait before the next one"""
+    print('\n=== TESTING LATENCY CREDIT ===')
+
+    limiter = RateLimiter(rate=10)
+    url = 'https://www.mobile.bg/obiava-1'
+    limiter.wait(url)
+    time.sleep(0.15)  # a request slower than the 0.1s interval
+    after_slow = limiter.wait(url)
+    after_fast = limiter.wait(url)
+    print(f'  Wait after slow request: {after_slow:.3f}s, after instant one: {after_fast:.3f}s')
+
+    ok = after_slow == 0 and 0.05 < after_fast < 0.11
+    print('✅ Latency counted toward budget' if ok else '❌ Latency credit FAILED')
+    return ok
+
+
+def test_shared_per_host_budget():
+    """Test that workers share one budget per host and hosts don't slow each other down"""
+    print('\n=== TESTING SHARED PER-HOST BUDGET ===')
+
+    limiter = RateLimiter(rate=20, burst=2, host_rates={'img.mobile.bg': (100, 1)})
+    starts = {'www.mobile.bg': [], 'img.mobile.bg': []}
+    lock = threading.Lock()
+
+    def worker(host):
+        for _ in range(5):
+            limiter.wait(f'https://{host}/page')
+            with lock:
+                starts[host].append(time.monotonic())
+
+    began = time.monotonic()
+    threads = [threading.Thread(target=worker, args=(host,)) for host in starts for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 10 requests at 20/s with a burst of 2: 8 are paced, about 0.4s in total
+    main_elapsed = max(starts['www.mobile.bg']) - began
+    other_elapsed = max(starts['img.mobile.bg']) - began
+    print(f'  www.mobile.bg: {main_elapsed:.2f}s for 10 requests, img.mobile.bg: {other_elapsed:.2f}s')
+
+    ok = 0.35 <= main_elapsed < 0.6 and other_elapsed < 0.2
+    print('✅ Per-host budgets PASSED' if ok else '❌ Per-host budgets FAILED')
+    return ok
+
+
+def test_defer_holds_back_waiting_workers():
+    """Test that a Retry-After also holds back workers that reserved a token before it arrived"""
+    print('\n=== TESTING DEFER WITH WAITING WORKERS ===')
+
+    limiter = RateLimiter(rate=4)
+    url = 'https://www.mobile.bg/obiava-1'
+    starts = []
+    lock = threading.Lock()
+
+    def worker():
+        limiter.wait(url)
+        with lock:
+            starts.append(time.monotonic())
+
+    began = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Every worker holds a reservation when the first response says 429 Retry-After: 1
+    time.sleep(0.05)
+    limiter.defer(url, 1.0)
+    for thread in threads:
+        thread.join()
+
+    offsets = sorted(start - began for start in starts)
+    gaps = [later - earlier for earlier, later in zip(offsets[1:], offsets[2:])]
+    print(f"  Request starts: {', '.join(f'{offset:.2f}' for offset in offsets)}")
+
+    # The unlimited bucket has no tokens to push back but still keeps the deadline
+    unlimited = TokenBucket(rate=0)
+    unlimited.defer(0.0, 2.0)
+
+    ok = (len(offsets) == 8 and offsets[0] < 0.05 and offsets[1] >= 1.0 and min(gaps) >= 0.2 and
+          unlimited.reserve(0.5) == 1.5)
+    print('✅ Waiting workers held back' if ok else '❌ Defer with waiting workers FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 RATE LIMITER TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_token_bucket()
+    success2 = test_latency_counts_toward_budget()
+    success3 = test_shared_per_host_budget()
+    success4 = test_defer_holds_back_waiting_workers()
+
+    print('\n' + '=' * 50)
+    if success1 and success2 and success3 and success4:
+        print('🎉 All rate limiter tests PASSED!')
+    else:
+        print('❌ Some rate limiter tests FAILED')
+        sys.exit(1)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for corpus capture and the replay server
+Records a crawl of a local site, then replays it offline and compares the results
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.corpus import CorpusRecorder, load_corpus, corpus_versions
+from modules.http_client import HttpClient
+from modules.web_scraper import get_all_listing_links
+from modules.extraction_pool import extract_listings
+from replay_server import ReplayServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PAGES = 3
+PER_PAGE = 5
+
+
+class LiveSiteHandler(BaseHTTPRequestHandler):
+    """Stands in for the live site: three result pages and the listing fixture for every listing"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/obiavi/bmw'):
+            page = int(self.path.split('/p-')[1].split('?')[0]) if '/p-' in self.path else 1
+            # Mix absolute and root-relative links like the real site does
+            anchors = ''.join(
+                f'<a href="{self.origin if i % 2 else ""}/obiava-{page}{i}-bmw-320">BMW 320</a>'
+                for i in range(PER_PAGE)
+            )
+            next_link = f'<a href="{self.origin}/obiavi/bmw/p-{page + 1}?price=5000">Напред</a>' if page < PAGES else ''
+            body = (f'<html><body><div>1 - {PER_PAGE} от общо {PAGES * PER_PAGE}</div>{anchors}'
+                    f'<div class="pagination">{next_link}</div></body></html>').encode('utf-8')
+        elif self.path.startswith('/obiava-'):
+            with open(os.path.join(FIXTURES_DIR, 'listing_page.html'), 'rb') as f:
+                body = f.read()
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def crawl(origin, client):
+    """Collect links and extract listings the way crawler.py does"""
+    os.environ['BASE_URL'] = f'{origin}/obiavi'
+    links = get_all_listing_links(f'{origin}/obiavi/bmw?price=5000', delay=0, client=client)
+    cars = extract_listings(links, workers=4, delay=0, client=client)
+    return links, cars
+
+
+def without_host(records, origin):
+    return [{key: str(value).replace(origin, '') for key, value in car.items()} for car in records]
+
+
+def test_capture_and_replay():
+    """Test that a replayed crawl gives the same records as the recorded one"""
+    print('=== TESTING CAPTURE AND REPLAY ===')
+
+    live = ThreadingHTTPServer(('127.0.0.1', 0), LiveSiteHandler)
+    LiveSiteHandler.origin = f'http://127.0.0.1:{live.server_port}'
+    threading.Thread(target=live.serve_forever, daemon=True).start()
+    base_url = os.environ.get('BASE_URL')
+
+    with tempfile.TemporaryDirectory() as root:
+        try:
+            with HttpClient(recorder=CorpusRecorder(root)) as client:
+                live_links, live_cars = crawl(LiveSiteHandler.origin, client)
+        finally:
+            live.shutdown()
+            live.server_close()
+
+        # A second capture goes into the next version
+        CorpusRecorder(root).close()
+        versions = [os.path.basename(path) for path in corpus_versions(root)]
+        meta, entries = load_corpus(os.path.join(root, 'v001'))
+
+        with ReplayServer(os.path.join(root, 'v001'), latency=0.02) as replay:
+            start = time.monotonic()
+            with HttpClient() as client:
+                replay_links, replay_cars = crawl(replay.origin, client)
+            elapsed = time.monotonic() - start
+            served = replay.requests_served
+
+    if base_url is None:
+        os.environ.pop('BASE_URL', None)
+    else:
+        os.environ['BASE_URL'] = base_url
+
+    print(f'  Corpus versions: {versions}, responses recorded: {len(entries)}')
+    print(f'  Live: {len(live_links)} links, {len(live_cars)} cars; replay: {len(replay_links)} links, '
+          f'{len(replay_cars)} cars in {elapsed:.2f}s ({served} requests)')
+
+    expected_responses = PAGES + PAGES * PER_PAGE
+    ok = (versions == ['v001', 'v002'] and meta['origin'] == LiveSiteHandler.origin and
+          len(entries) == expected_responses and served == expected_responses and
+          len(live_cars) == PAGES * PER_PAGE and live_cars[0].get('Brand') and
+          without_host(replay_cars, replay.origin) == without_host(live_cars, LiveSiteHandler.origin) and
+          elapsed >= 0.02 * expected_responses / 4)
+    print('✅ Replay matches the recorded crawl' if ok else '❌ Capture and replay FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 REPLAY TEST SUITE')
+    print('=' * 50)
+
+    success = test_capture_and_replay()
+
+    print('\n' + '=' * 50)
+    if success:
+        print('🎉 All replay tests PASSED!')
+    else:
+        print('❌ Some replay tests FAILED')
+        sys.exit(1)
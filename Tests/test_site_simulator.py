@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the synthetic mobile.bg site
+Crawls a generated search through 429 bursts and slow bodies and checks every listing comes back intact
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.adaptive import AdaptiveThrottle
+from modules.extraction_pool import extract_listings
+from modules.http_client import HttpClient
+from modules.rate_limiter import RateLimiter
+from modules.web_scraper import get_all_listing_links
+from site_simulator import SiteSimulator, generate_listing, measure_throughput, LISTING_ID_BASE
+
+LISTINGS = 95
+
+
+def test_crawl_through_faults():
+    """Test that pagination and extraction recover from throttling bursts and slow bodies"""
+    print('=== TESTING CRAWL OF SIMULATED SITE ===')
+
+    base_url = os.environ.get('BASE_URL')
+    with SiteSimulator(LISTINGS, throttle_every=25, burst_length=2, retry_after=0,
+                       slow_body_rate=0.1, slow_body_seconds=0.2, seed=3) as site:
+        os.environ['BASE_URL'] = f'{site.origin}/obiavi'
+        limiter = RateLimiter(rate=0)
+        throttle = AdaptiveThrottle(limiter, concurrency=4, latency_factor=float('inf'))
+        try:
+            with HttpClient(pool_size=4, throttle=throttle) as client:
+                links = get_all_listing_links(site.search_url, max_pages=10, client=client, workers=4, limiter=limiter)
+                cars = extract_listings(links, workers=4, client=client, limiter=limiter)
+        finally:
+            if base_url is None:
+                os.environ.pop('BASE_URL', None)
+            else:
+                os.environ['BASE_URL'] = base_url
+        statuses = dict(site.statuses)
+
+    ids = sorted(int(link.rsplit('/', 1)[1].split('-')[1]) for link in links)
+    print(f'  Links: {len(links)}, cars: {len(cars)}, responses: {statuses}, throttled: {throttle.throttled}')
+
+    mismatches = []
+    for car in cars:
+        expected = generate_listing(int(car['Link'].rsplit('/', 1)[1].split('-')[1]) - LISTING_ID_BASE)
+        if (car.get('Price_BGN') != expected['price_bgn'] or car.get('Price_EUR') != expected['price_eur'] or
+                car.get('Fuel Type') != expected['fuel'] or car.get('Phone') != expected['phone'] or
+                car.get('Mileage') != f"{expected['mileage']:,} км".replace(',', ' ')):
+            mismatches.append(car['Link'])
+    for link in mismatches[:3]:
+        print(f'  ❌ Fields differ from the generated listing: {link}')
+
+    ok = (ids == [LISTING_ID_BASE + i for i in range(LISTINGS)] and len(cars) == LISTINGS and
+          not mismatches and statuses.get(429, 0) > 0 and throttle.throttled > 0)
+    print('✅ Every generated listing was crawled through the faults' if ok else '❌ Simulated crawl FAILED')
+    return ok
+
+
+def test_measure_throughput():
+    """Test the scaling measurement on a small site"""
+    print('\n=== TESTING THROUGHPUT MEASUREMENT ===')
+
+    result = measure_throughput(250, workers=4, extract=20, latency=0.005)
+    print(f"  {result['links']} links in {result['link_seconds']:.2f}s, "
+          f"{result['extracted']} cars in {result['extract_seconds']:.2f}s, {result['requests']} requests")
+
+    ok = (result['links'] == 250 and result['extracted'] == 20 and
+          result['requests'] == 13 + 20 and result['statuses'] == {200: 33})
+    print('✅ Throughput measured' if ok else '❌ Throughput measurement FAILED')
+    return ok
+
+
+if __name__ == '__main__':
+    print('🧪 SITE SIMULATOR TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_crawl_through_faults()
+    success2 = test_measure_throughput()
+
+    print('\n' + '=' * 50)
+    if success1 and success2:
+        print('🎉 All site simulator tests PASSED!')
+    else:
+        print('❌ Some site simulator tests FAILED')
+        sys.exit(1)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test script for the text heuristics in the listing extractor
+Checks the single-pass description and extras extractors against the per-element get_text scans
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from modules.extractors import (
+    _element_texts, _longest_description, _keyword_extras, DESCRIPTION_BLACKLIST, FEATURE_KEYWORDS
+)
+
+
+WORDS = [
+    'Автомобилът', 'е', 'в', 'отлично', 'състояние', 'обслужен', 'нови', 'гуми', 'климатик',
+    'Продавам', 'спешно', 'без', 'забележки', ',', 'перфектен', 'ABS', 'Ксенон', 'LED фарове',
+    'Bluetooth', 'Кожен салон',
+]
+NOISE = ['лв', 'EUR', '150 к.с', '0888', 'пловдив', '2008']
+
+
+def random_word(rng):
+    return rng.choice(NOISE) if rng.random() < 0.03 else rng.choice(WORDS)
+
+
+def reference_description(soup):
+    """The original per-element get_text scan"""
+    descriptions = []
+    for elem in soup.find_all(['div', 'p', 'span']):
+        text = elem.get_text(strip=True)
+        if (len(text) > 50 and
+            not text.isdigit() and
+            'лв' not in text and 'EUR' not in text and
+            'к.с' not in text and 'к.м' not in text and
+            'см3' not in text and
+            not any(x in text.lower() for x in DESCRIPTION_BLACKLIST) and
+            text.count(',') < len(text) / 20):
+            descriptions.append(text)
+    return max(descriptions, key=len) if descriptions else None
+
+
+def reference_extras(soup):
+    """The original per-element keyword scan with list-based dedup"""
+    extras = []
+    for elem in soup.find_all(['li', 'span', 'div', 'p']):
+        text = elem.get_text(strip=True).lower()
+        if (5 <= len(text) <= 80 and
+            any(keyword in text for keyword in FEATURE_KEYWORDS) and
+            'лв' not in text and 'км' not in text):
+            extras.append(elem.get_text(strip=True))
+    unique_extras = []
+    for extra in extras:
+        if extra not in unique_extras and len(unique_extras) < 15:
+            unique_extras.append(extra)
+    return ', '.join(unique_extras)
+
+
+def random_html(rng, depth=0):
+    """Build a random nested document with text, scripts and comments"""
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        choice = rng.random()
+        if choice < 0.45 and depth < 7:
+            tag = rng.choice(['div', 'p', 'span', 'li', 'b'])
+            parts.append(f'<{tag}>{random_html(rng, depth + 1)}</{tag}>')
+        elif choice < 0.5:
+            parts.append(f'<script>var x = "{rng.choice(WORDS)}";</script>')
+        elif choice < 0.55:
+            parts.append(f'<!-- {rng.choice(WORDS)} -->')
+        else:
+            parts.append(' '.join(random_word(rng) for _ in range(rng.randint(1, 12))) + rng.choice(['', ' ', '\n']))
+    return ''.join(parts)
+
+
+def test_description_matches_reference():
+    """Test that the single-pass extractor picks the same description"""
+    print('=== TESTING SINGLE-PASS DESCRIPTION EXTRACTOR ===')
+
+    rng = random.Random(42)
+    for i in range(300):
+        soup = BeautifulSoup(f'<html><body>{random_html(rng)}</body></html>', 'html.parser')
+        expected = reference_description(soup)
+        actual = _longest_description(_element_texts(soup))
+        if expected != actual:
+            print(f'❌ Document {i}: expected {expected!r}, got {actual!r}')
+            return False
+
+    print('✅ 300 random documents give identical descriptions')
+    return True
+
+
+def test_extras_match_reference():
+    """Test that the combined keyword matcher gives byte-identical extras"""
+    print('\n=== TESTING COMBINED EXTRAS KEYWORD MATCHER ===')
+
+    rng = random.Random(7)
+    non_empty = 0
+    for i in range(300):
+        soup = BeautifulSoup(f'<html><body><ul>{random_html(rng)}</ul></body></html>', 'html.parser')
+        expected = reference_extras(soup)
+        actual = ', '.join(list(dict.fromkeys(_keyword_extras(_element_texts(soup))))[:15])
+        if expected != actual:
+            print(f'❌ Document {i}: expected {expected!r}, got {actual!r}')
+            return False
+        non_empty += bool(expected)
+
+    print(f'✅ 300 random documents give identical extras ({non_empty} non-empty)')
+    return True
+
+
+def test_description_speed():
+    """Compare timing of both approaches on a deeply nested page"""
+    print('\n=== TESTING DESCRIPTION EXTRACTOR SPEED ===')
+
+    sentence = 'Автомобилът е в отлично състояние и е редовно обслужван. '
+    html = '<div>' * 40 + ''.join(f'<p>{sentence * 3}</p>' for _ in range(300)) + '</div>' * 40
+    soup = BeautifulSoup(html, 'html.parser')
+
+    start = time.perf_counter()
+    expected = reference_description(soup)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = _longest_description(_element_texts(soup))
+    single_pass_time = time.perf_counter() - start
+
+    print(f'  Per-element get_text: {reference_time * 1000:.1f} ms')
+    print(f'  Single pass:          {single_pass_time * 1000:.1f} ms')
+
+    if expected == actual and single_pass_time < reference_time:
+        print('✅ Single pass is faster with identical output')
+        return True
+    print('❌ Single pass was not faster or gave different output')
+    return False
+
+
+if __name__ == '__main__':
+    print('🧪 TEXT HEURISTICS TEST SUITE')
+    print('=' * 50)
+
+    success1 = test_description_matches_reference()
+    success2 = test_extras_match_reference()
+    success3 = test_description_speed()
+
+    print('\n' + '=' * 50)
+    if success1 and success2 and success3:
+        print('🎉 All text heuristics tests PASSED!')
+    else:
+        print('❌ Some text heuristics tests FAILED')
+        sys.exit(1)
@@ -5,6 +5,7 @@ Command-line interface for crawling car data from mobile.bg
 """
 
 import argparse
+import os
 import sys
 import time
 from pathlib import Path
@@ -13,13 +14,24 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from modules.config_manager import load_env_config, get_output_config
+from modules.config_manager import load_env_config, get_output_config, get_http_config, get_cache_config, get_rate_limit_config
 from modules.logger_config import setup_logging
 from modules.url_builder import build_mobilebg_search_url
 from modules.url_validator import validate_search_url
-from modules.web_scraper import get_all_listing_links
+from modules.web_scraper import iter_listing_links
 from modules import excel_utils
-from modules.extractors import extract_car_info_unified
+from modules.extraction_pool import extract_listings
+from modules.http_client import HttpClient
+from modules.http_cache import ResponseCache
+from modules.rate_limiter import RateLimiter, parse_host_rate
+from modules.adaptive import AdaptiveThrottle
+from modules.corpus import CorpusRecorder
+from modules.html_parser import get_parser_engine
+from modules.incremental import SeenListings
+from modules.listing_store import ListingStore, listing_key
+from modules.output_sinks import open_sink
+from modules.checkpoint import CrawlCheckpoint
+from modules.metrics import CrawlMetrics
 
 
 def main():
@@ -27,16 +39,73 @@ def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='AutoGetCars Crawler - Extract car data from mobile.bg')
     parser.add_argument('--delay', type=float, default=0.5, 
-                       help='Delay between requests in seconds (default: 0.5)')
+                       help='Delay between requests to a host in seconds, used when no --rate is set (default: 0.5)')
+    parser.add_argument('--rate', type=float, default=None,
+                       help='Requests per second per host, shared by all workers (default: RATE_LIMIT, else 1/--delay)')
+    parser.add_argument('--burst', type=int, default=None,
+                       help='Requests a host may receive back to back before --rate applies (default: RATE_BURST or 1)')
+    parser.add_argument('--host-rate', action='append', default=[], type=parse_host_rate, metavar='HOST=RATE[:BURST]',
+                       help='Separate request budget for one host (repeatable)')
     parser.add_argument('--max-pages', type=int, default=100,
                        help='Maximum pages to crawl (default: 100)')
     parser.add_argument('--excel', type=str, default='docs/car-data.xlsx',
                        help='Excel output file path (default: docs/car-data.xlsx)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Concurrent extraction workers sharing the --delay budget (default: 1)')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads',
+                       help='Crawl engine; async runs on one event loop with --workers requests in flight (requires aiohttp)')
+    parser.add_argument('--parse-processes', type=int, default=0,
+                       help='Parse listing HTML in this many worker processes (default: 0, parse in fetch workers)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Start extracting listings while result pages are still being crawled')
+    parser.add_argument('--parser', choices=['html.parser', 'lxml', 'selectolax'], default=None,
+                       help='HTML parser backend (default: PARSER_ENGINE from .env or html.parser)')
+    parser.add_argument('--pool-size', type=int, default=None,
+                       help='Keep-alive HTTP connections to keep open (default: HTTP_POOL_SIZE or 10)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                       help='Cache responses on disk and revalidate them with ETag/Last-Modified (default: HTTP_CACHE_DIR, off if unset)')
+    parser.add_argument('--cache-max-mb', type=float, default=None,
+                       help='Maximum size of the response cache in MB (default: HTTP_CACHE_MAX_MB or 500)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only fetch listings not seen in earlier runs, plus a re-check sample; exports the merged dataset')
+    parser.add_argument('--seen-file', type=str, default=None,
+                       help='Seen listings file for --incremental (default: next to the Excel file)')
+    parser.add_argument('--recheck-fraction', type=float, default=0.03,
+                       help='Share of known listings re-fetched per --incremental run to catch price changes (default: 0.03)')
+    parser.add_argument('--excel-mode', choices=['replace', 'upsert'], default='replace',
+                       help='replace rewrites the sheet; upsert updates rows in place by listing ID and appends new ones (default: replace)')
+    parser.add_argument('--mark-vanished', action='store_true',
+                       help='With --excel-mode upsert, flag listings missing from this run as Removed in a Status column')
+    parser.add_argument('--db', type=str, default=None,
+                       help='SQLite listing store written during extraction; the Excel file is exported from it (default: LISTING_DB, off if unset)')
+    parser.add_argument('--parquet', type=str, default=None,
+                       help='Also write records to this Parquet file with typed columns as they are extracted (requires pyarrow)')
+    parser.add_argument('--sink', action='append', default=[], metavar='PATH',
+                       help='Append each record to this .jsonl or .csv file as soon as it is extracted, flushed to disk per record (repeatable)')
+    parser.add_argument('--capture', type=str, default=None, metavar='DIR',
+                       help='Save every search and listing response into a new corpus version under DIR for offline replay')
+    parser.add_argument('--checkpoint', type=str, default=None,
+                       help='Checkpoint file for progress of the collect-then-extract crawl (default: next to the Excel file)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue an interrupted run from its checkpoint without refetching finished pages or listings')
+    parser.add_argument('--metrics-json', type=str, default=None, metavar='PATH',
+                       help='Write per-stage timing histograms and throughput of the run to PATH as JSON')
+    parser.add_argument('--price-drop-pct', type=float, default=5.0,
+                       help='With --db, report listings whose price fell by more than this percent since their last observation (default: 5)')
     
     args = parser.parse_args()
+    if args.incremental and args.engine == 'async':
+        parser.error('--incremental is not supported with --engine async')
+    if args.capture and args.engine == 'async':
+        parser.error('--capture is not supported with --engine async')
+    if args.resume and (args.engine == 'async' or args.stream):
+        parser.error('--resume is not supported with --engine async or --stream')
     
     # Load configuration
     load_env_config()
+    if args.parser:
+        # Set in the environment so parser worker processes pick it up too
+        os.environ['PARSER_ENGINE'] = args.parser
     
     # Setup logging
     logger = setup_logging()
@@ -47,73 +116,227 @@ def main():
     logger.info("=" * 80)
     
     # Log arguments
-    logger.info(f"🎮 Crawler Arguments: delay={args.delay}s, max_pages={args.max_pages}, excel={args.excel}")
+    logger.info(f"🎮 Crawler Arguments: delay={args.delay}s, max_pages={args.max_pages}, workers={args.workers}, engine={args.engine}, stream={args.stream}, parse_processes={args.parse_processes}, parser={get_parser_engine()}, excel={args.excel}")
+    
+    # Per-request and per-stage timings, summarized at the end of the run
+    metrics = CrawlMetrics(logger=logger)
+    
+    # Shared pooled HTTP client; keep at least one connection per worker
+    http_config = get_http_config()
+    if args.pool_size:
+        http_config['pool_size'] = args.pool_size
+    http_config['pool_size'] = max(http_config['pool_size'], args.workers)
+    
+    # Optional on-disk response cache
+    cache_config = get_cache_config()
+    cache_dir = args.cache_dir or cache_config['directory']
+    cache_max_mb = args.cache_max_mb or cache_config['max_mb']
+    cache = ResponseCache(cache_dir, cache_max_mb * 1024 * 1024, logger=logger) if cache_dir else None
+    if cache:
+        logger.info(f"🗄️ Response cache: {cache.path} (max {cache_max_mb:.0f} MB)")
+    
+    # One politeness budget per host, shared by pagination and extraction
+    rate_config = get_rate_limit_config()
+    limits = {
+        'rate': args.rate if args.rate is not None else rate_config['rate'],
+        'burst': args.burst or rate_config['burst'],
+        'host_rates': dict(args.host_rate),
+    }
+    limiter = RateLimiter(args.delay, metrics=metrics, **limits)
+    logger.info(f"🚦 Rate limit: {limiter.rate:g} requests/s per host, burst {limiter.burst}")
+    
+    # Back off on 429/503 and rising latency, then recover step by step
+    throttle = AdaptiveThrottle(limiter, concurrency=args.workers, logger=logger)
+    recorder = CorpusRecorder(args.capture, logger=logger) if args.capture else None
+    if recorder:
+        logger.info(f"📼 Capturing responses into {recorder.directory}")
+    client = HttpClient(cache=cache, throttle=throttle, recorder=recorder, metrics=metrics, logger=logger,
+                        **http_config)
+    
+    seen = None
+    if args.incremental:
+        seen_file = args.seen_file or f"{os.path.splitext(args.excel)[0]}.seen.json"
+        seen = SeenListings(seen_file, logger=logger)
+        logger.info(f"♻️ Incremental mode: {len(seen)} listings remembered in {seen_file}")
+        if args.stream:
+            logger.warning("⚠️ --stream is ignored in incremental mode; links are collected first")
+    
+    output_config = get_output_config()
+    db_path = args.db or output_config.get('db_path')
+    store = ListingStore(db_path, logger=logger) if db_path else None
+    if store:
+        logger.info(f"🗃️ Listing store: {db_path} ({store.count()} listings)")
+    
+    parquet = None
+    if args.parquet:
+        from modules.parquet_export import ParquetExporter
+        try:
+            parquet = ParquetExporter(args.parquet)
+        except ImportError as e:
+            logger.error(f"❌ {e}")
+            sys.exit(1)
+        logger.info(f"🧱 Parquet export: {args.parquet}")
+    
+    file_sinks = []
+    for sink_path in args.sink:
+        try:
+            file_sinks.append(open_sink(sink_path))
+        except ValueError as e:
+            logger.error(f"❌ {e}")
+            sys.exit(1)
+        logger.info(f"📝 Record sink: {sink_path}")
+    
+    # Everything that records extracted listings as they arrive
+    record_sinks = [sink for sink in (store, parquet) if sink] + file_sinks
+    
+    def on_result(car):
+        with metrics.timer('sink_write'):
+            for sink in record_sinks:
+                sink.add(car)
+    
+    run_started = time.time()
+    resumed_count = 0
     
     try:
         # Build search URL
         search_url = build_mobilebg_search_url(logger)
         
         # Validate URL before proceeding
-        if not validate_search_url(search_url, logger):
+        if not validate_search_url(search_url, logger, client=client):
             logger.error("❌ Search URL validation failed. Please check your configuration.")
             raise ValueError("Invalid search URL - check brand, model, vehicle type, and fuel type")
         
-        # Get all listing links
-        links = get_all_listing_links(search_url, delay=args.delay, max_pages=args.max_pages, logger=logger)
-        
-        if not links:
-            logger.error("❌ No car links found. Exiting.")
-            return
-        
-        # Extract data from each car listing
-        logger.info("🚗 STARTING DATA EXTRACTION:")
-        logger.info(f"  📊 Total Links to Process: {len(links)} cars")
-        logger.info(f"  ⏱️  Estimated Time: ~{len(links) * 0.3:.1f} seconds")
-        
-        cars_data = []
-        start_time = time.time()
-        batch_size = 10
-        
-        for i, link in enumerate(links, 1):
-            try:
-                # Progress logging
-                if i % batch_size == 1 or i == len(links):
-                    progress = (i / len(links)) * 100
-                    logger.info(f"  [{i}/{len(links)}] ({progress:.1f}%) Processing batch...")
-                
-                # Extract individual car data with progress
-                if i % batch_size != 1:  # Don't duplicate the first one
-                    progress = (i / len(links)) * 100
-                    link_id = link.split('/')[-1] if '/' in link else link[-50:]
-                    logger.info(f"  [{i}/{len(links)}] ({progress:.1f}%) Extracting: {link_id}...")
-                
-                car_info = extract_car_info_unified(link)
-                if car_info:
-                    cars_data.append(car_info)
-                
-                # Add delay between extractions
-                if args.delay > 0:
-                    time.sleep(args.delay)
-                    
-            except KeyboardInterrupt:
-                logger.warning("🛑 Crawling interrupted by user")
-                break
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to extract data from {link}: {e}")
-                continue
+        if args.engine == 'async':
+            # Single event loop for result pages and listing pages
+            from modules.async_engine import run_async_crawl
+            
+            logger.info(f"🚗 STARTING ASYNC CRAWL ({args.workers} requests in flight):")
+            start_time = time.time()
+            links, cars_data = run_async_crawl(search_url, delay=args.delay, max_pages=args.max_pages,
+                                               concurrency=args.workers, logger=logger,
+                                               parse_processes=args.parse_processes, metrics=metrics,
+                                               on_result=on_result, **limits)
+            
+            if not links:
+                logger.error("❌ No car links found. Exiting.")
+                return
+            fetch_links = links
+        elif args.stream and seen is None:
+            # Pagination feeds the extraction pool link by link
+            logger.info("🚗 STARTING STREAMING EXTRACTION (links are extracted as pages are parsed):")
+            links = []
+            
+            def discovered_links():
+                for link in iter_listing_links(search_url, delay=args.delay, max_pages=args.max_pages, logger=logger,
+                                               client=client, workers=args.workers, limiter=limiter,
+                                               metrics=metrics):
+                    links.append(link)
+                    yield link
+            
+            start_time = time.time()
+            cars_data = extract_listings(discovered_links(), workers=args.workers, delay=args.delay, logger=logger,
+                                         client=client, limiter=limiter, parse_processes=args.parse_processes,
+                                         on_result=on_result, metrics=metrics)
+            
+            if not links:
+                logger.error("❌ No car links found. Exiting.")
+                return
+            fetch_links = links
+        else:
+            checkpoint_path = args.checkpoint or f"{os.path.splitext(args.excel)[0]}.checkpoint.json"
+            checkpoint = CrawlCheckpoint(checkpoint_path, search_url, logger=logger)
+            if args.resume and checkpoint.load():
+                logger.info(f"⏯️ RESUMING FROM CHECKPOINT: {checkpoint_path}")
+                logger.info(f"  🔗 Links found: {len(checkpoint.links)} (pagination {'complete' if checkpoint.pagination_done else f'continues at page {checkpoint.next_page}'})")
+                logger.info(f"  ✅ Listings already extracted: {len(checkpoint.records)}")
+            else:
+                if args.resume:
+                    logger.warning(f"⚠️ No checkpoint to resume at {checkpoint_path}, starting a new crawl")
+                checkpoint.remove()
+            resumed_count = len(checkpoint.records)
+            # Sinks that start a new file each run only have this run's records otherwise
+            for sink in record_sinks:
+                if sink.rewrites_output:
+                    sink.add_many(checkpoint.records)
+            record_sinks.append(checkpoint)
+            
+            # Get all listing links
+            if not checkpoint.pagination_done:
+                collect_started = time.time()
+                for link in iter_listing_links(search_url, delay=args.delay, max_pages=args.max_pages, logger=logger,
+                                               client=client, workers=args.workers, limiter=limiter,
+                                               start_url=checkpoint.next_url, start_page=checkpoint.next_page,
+                                               seen_links=checkpoint.links, on_page=checkpoint.page_done,
+                                               metrics=metrics):
+                    checkpoint.add_link(link)
+                metrics.set_phase('collect', time.time() - collect_started)
+            links = checkpoint.links
+            
+            if not links:
+                logger.error("❌ No car links found. Exiting.")
+                return
+            
+            pending_links = checkpoint.pending_links()
+            if seen is not None:
+                pending = set(pending_links)
+                fetch_links = [link for link in seen.plan(links, args.recheck_fraction) if link in pending]
+            else:
+                fetch_links = pending_links
+            
+            # Extract data from each car listing
+            logger.info("🚗 STARTING DATA EXTRACTION:")
+            logger.info(f"  📊 Total Links to Process: {len(fetch_links)} cars")
+            
+            start_time = time.time()
+            cars_data = extract_listings(fetch_links, workers=args.workers, delay=args.delay, logger=logger,
+                                         client=client, limiter=limiter, parse_processes=args.parse_processes,
+                                         on_result=on_result, metrics=metrics)
+            record_sinks.remove(checkpoint)
+            
+            # Listings skipped on purpose by --incremental don't count as unfinished
+            wanted = set(fetch_links)
+            remaining = [link for link in checkpoint.pending_links() if link in wanted]
+            if remaining or not checkpoint.pagination_done:
+                checkpoint.close()
+                logger.warning(f"⏸️ {len(remaining)} listings not extracted yet; run again with --resume to continue from {checkpoint_path}")
+            else:
+                checkpoint.remove()
+            
+            # Records from before the interruption plus this run's, in link order
+            records = {listing_key(car): car for car in checkpoint.records}
+            cars_data = [records[key] for key in dict.fromkeys(listing_key({'Link': link}) for link in links) if key in records]
         
         # Log extraction results
         extraction_time = time.time() - start_time
-        success_count = len(cars_data)
-        fail_count = len(links) - success_count
-        success_rate = (success_count / len(links)) * 100 if links else 0
+        metrics.set_phase('crawl' if args.engine == 'async' else 'extract', extraction_time)
+        success_count = len(cars_data) - resumed_count
+        fail_count = len(fetch_links) - success_count
+        success_rate = (success_count / len(fetch_links)) * 100 if fetch_links else 100
         
         logger.info("📈 EXTRACTION COMPLETE!")
         logger.info(f"  ✅ Successful Extractions: {success_count} cars")
         logger.info(f"  ❌ Failed Extractions: {fail_count} cars")
         logger.info(f"  📊 Success Rate: {success_rate:.1f}%")
         logger.info(f"  ⏱️  Total Extraction Time: {extraction_time:.1f} seconds")
-        logger.info(f"  ⚡ Average Time per Car: {extraction_time/len(links):.2f} seconds")
+        if fetch_links:
+            logger.info(f"  ⚡ Average Time per Car: {extraction_time/len(fetch_links):.2f} seconds")
+        
+        if seen is not None:
+            fetched_keys = {listing_key(car) for car in cars_data}
+            cars_data = seen.merge(links, cars_data)
+            seen.save()
+            logger.info(f"  ♻️ Merged Dataset: {len(cars_data)} cars ({success_count} fetched this run)")
+            # Remembered listings were seen in this run's search too, but their prices weren't re-read
+            remembered = [car for car in cars_data if listing_key(car) not in fetched_keys]
+            if store:
+                store.add_many(remembered, record_price=False)
+            for sink in record_sinks:
+                if sink is not store:
+                    sink.add_many(remembered)
+        
+        if store:
+            # The export is a view over the store
+            cars_data = store.records([listing_key(car) for car in cars_data])
         
         if not cars_data:
             logger.error("❌ No car data extracted successfully.")
@@ -133,18 +356,19 @@ def main():
             logger.info(f"  📈 Maximum Price: {max_price:,.0f} BGN")
         
         # Export to Excel
-        output_config = get_output_config()
-        excel_utils.export_to_excel(
-            cars_data, 
-            args.excel,
-            sheet_name=output_config.get('sheet_name', 'CarsData')
-        )
+        with metrics.timer('export'):
+            excel_utils.export_to_excel(
+                cars_data, 
+                args.excel,
+                sheet_name=output_config.get('sheet_name', 'CarsData'),
+                mode=args.excel_mode,
+                mark_vanished=args.mark_vanished
+            )
         
         logger.info("💾 EXCEL EXPORT COMPLETE!")
         logger.info(f"  📁 File: {args.excel}")
         
         # Determine sheet name based on search criteria
-        import os
         brand = os.getenv('BRAND', 'Cars').title()
         model = os.getenv('MODEL', '').title()
         sheet_name = f"{brand}-{model}" if model else brand
@@ -152,6 +376,18 @@ def main():
         logger.info(f"  📋 Sheet: {sheet_name}")
         logger.info(f"  📊 Records Saved: {len(cars_data)} cars")
         
+        if store:
+            store.flush()
+            drops = store.prices.price_drops(args.price_drop_pct, since=run_started)
+            logger.info(f"📉 PRICE DROPS (more than {args.price_drop_pct:g}% since last observation): {len(drops)} listings")
+            for drop in drops[:10]:
+                logger.info(f"  {drop['listing_id']}: {drop['previous_price_bgn']:,} → {drop['price_bgn']:,} BGN (-{drop['drop_pct']}%)")
+        if cache:
+            logger.info(f"  🗄️ Served from cache (304): {cache.hits} pages")
+        if throttle.throttled:
+            logger.info(f"  🐢 Throttled responses (429/503): {throttle.throttled}, final rate {throttle.scale:.0%} "
+                        f"with {throttle.concurrency} in flight")
+        
         logger.info("🎯 MISSION COMPLETE! 🚀")
         logger.info("=" * 80)
         
@@ -161,6 +397,18 @@ def main():
     except Exception as e:
         logger.error(f"💥 Critical error: {e}")
         sys.exit(1)
+    finally:
+        client.close()
+        if store:
+            store.close()
+        if parquet:
+            parquet.close()
+            logger.info(f"🧱 Parquet export: {parquet.row_count} records written to {parquet.path}")
+        for sink in file_sinks:
+            sink.close()
+        metrics.log_summary()
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json)
 
 
 if __name__ == "__main__":
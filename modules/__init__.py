@@ -8,6 +8,22 @@ from . import web_scraper
 from . import excel_utils
 from . import excel_table_utils
 from . import extractors
+from . import http_client
+from . import http_cache
+from . import html_parser
+from . import rate_limiter
+from . import extraction_pool
+from . import async_engine
+from . import incremental
+from . import field_parsers
+from . import listing_store
+from . import price_history
+from . import parquet_export
+from . import output_sinks
+from . import checkpoint
+from . import adaptive
+from . import corpus
+from . import metrics
 
 __all__ = [
     'config_manager',
@@ -17,5 +33,21 @@ __all__ = [
     'web_scraper',
     'excel_utils',
     'excel_table_utils',
-    'extractors'
+    'extractors',
+    'http_client',
+    'http_cache',
+    'html_parser',
+    'rate_limiter',
+    'extraction_pool',
+    'async_engine',
+    'incremental',
+    'field_parsers',
+    'listing_store',
+    'price_history',
+    'parquet_export',
+    'output_sinks',
+    'checkpoint',
+    'adaptive',
+    'corpus',
+    'metrics'
 ]
@@ -0,0 +1,197 @@
+"""
+Adaptive Throttle Module for AutoGetCars Crawler
+Backs off on 429/503 responses and rising latency, then recovers gradually
+"""
+
+import time
+import random
+import logging
+import threading
+import email.utils
+from contextlib import contextmanager
+
+
+# Responses that mean "slow down"
+THROTTLE_STATUSES = (429, 503)
+# Responses worth another attempt
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 60.0
+MAX_RETRY_AFTER = 300.0
+
+
+def parse_retry_after(value, now=None):
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value (str): Header value, either seconds or an HTTP date
+        now (float, optional): Current Unix time, for HTTP dates
+
+    Returns:
+        float or None: Seconds to wait (capped at MAX_RETRY_AFTER), None if absent or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = date.timestamp() - (now if now is not None else time.time())
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """
+    Exponential backoff with jitter for a retry.
+
+    Half of the delay is fixed and half random, so workers that failed
+    together don't retry together.
+
+    Args:
+        attempt (int): Zero-based number of the failed attempt
+        base (float): Delay after the first failure in seconds
+        cap (float): Upper bound in seconds
+
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class AdaptiveThrottle:
+    """
+    AIMD controller for the request rate and the number of requests in flight.
+
+    A 429/503 answer halves both the rate (as a scale on the shared
+    RateLimiter) and the concurrency, and pushes back the host's next
+    request by its Retry-After. Latency well above the best seen so far
+    cuts them more gently. Responses to requests that were already in
+    flight at a cut were sent under the old rate, so they don't cut
+    again. Every `recover_after` healthy responses, the rate scale grows
+    by a tenth and concurrency by one, up to the configured maximum.
+    """
+
+    def __init__(self, limiter=None, concurrency=1, min_scale=0.1, recover_after=20, latency_factor=3.0,
+                 logger=None):
+        """
+        Args:
+            limiter (RateLimiter, optional): Shared limiter whose rate is scaled
+            concurrency (int): Maximum requests in flight
+            min_scale (float): Lowest fraction of the configured rate to fall back to
+            recover_after (int): Healthy responses between recovery steps
+            latency_factor (float): Latency this many times the baseline counts as congestion
+            logger (logging.Logger, optional): Logger instance
+        """
+        self.limiter = limiter
+        self.max_concurrency = max(1, int(concurrency or 1))
+        self.concurrency = self.max_concurrency
+        self.scale = 1.0
+        self.min_scale = min_scale
+        self.recover_after = max(1, int(recover_after))
+        self.latency_factor = latency_factor
+        self.logger = logger or logging.getLogger(__name__)
+        self.throttled = 0
+
+        self._active = 0
+        self._cooldown = 0
+        self._healthy = 0
+        self._samples = 0
+        self._latency = None
+        self._baseline = None
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self, url=None):
+        """
+        Hold one of the `concurrency` request slots, then wait for the shared limiter.
+
+        The rate token is only reserved once the slot is held, so workers
+        queued for a slot don't collect tokens and then all send at once
+        when slots free up.
+
+        Args:
+            url (str, optional): URL about to be fetched; selects the host budget
+
+        Yields:
+            float: Seconds spent waiting for the limiter
+        """
+        with self._cond:
+            while self._active >= self.concurrency:
+                self._cond.wait()
+            self._active += 1
+        try:
+            yield self.limiter.wait(url) if self.limiter is not None else 0.0
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def observe(self, url, status, latency, retry_after=None):
+        """
+        Adjust rate and concurrency after a response.
+
+        Args:
+            url (str): Requested URL
+            status (int): HTTP status code
+            latency (float): Seconds from sending the request to its response, without slot waits
+            retry_after (float, optional): Parsed Retry-After header
+        """
+        with self._cond:
+            # One observation window: the responses still owed by requests in flight at the last cut
+            cooling = self._cooldown > 0
+            if cooling:
+                self._cooldown -= 1
+
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                if not cooling:
+                    self._decrease(0.5, f"HTTP {status}")
+                if retry_after and self.limiter is not None:
+                    self.limiter.defer(url, retry_after)
+                return
+
+            if self._congested(latency) and not cooling:
+                self._decrease(0.8, f"latency {self._latency:.2f}s vs {self._baseline:.2f}s baseline")
+                return
+
+            self._healthy += 1
+            if self._healthy >= self.recover_after:
+                self._increase()
+
+    def _congested(self, latency):
+        """Track a latency EWMA; True when it rose well above the best seen and a cut is due."""
+        self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        self._samples += 1
+        if self._samples < 5:
+            return False
+        if self._baseline is None or self._latency < self._baseline:
+            self._baseline = self._latency
+        # Give each cut time to take effect before cutting again
+        return self._latency > self.latency_factor * self._baseline and self._healthy >= self.recover_after // 2
+
+    def _decrease(self, factor, reason):
+        self.scale = max(self.min_scale, self.scale * factor)
+        self.concurrency = max(1, int(self.concurrency * factor))
+        self._healthy = 0
+        self._cooldown = self._active
+        if self.limiter is not None:
+            self.limiter.set_scale(self.scale)
+        self.logger.warning(f"🐢 Slowing down ({reason}): rate {self.scale:.0%}, {self.concurrency} in flight")
+
+    def _increase(self):
+        self._healthy = 0
+        if self.scale >= 1.0 and self.concurrency >= self.max_concurrency:
+            return
+        self.scale = min(1.0, self.scale + 0.1)
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+        if self.limiter is not None:
+            self.limiter.set_scale(self.scale)
+        self._cond.notify_all()
+        self.logger.info(f"🐇 Speeding up: rate {self.scale:.0%}, {self.concurrency} in flight")
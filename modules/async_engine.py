@@ -0,0 +1,351 @@
+"""
+Async Engine Module for AutoGetCars Crawler
+Single event loop crawler that fetches search and listing pages with aiohttp
+"""
+
+import time
+import math
+import asyncio
+import logging
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+
+from modules.http_client import DEFAULT_USER_AGENT, get_accept_encoding
+from modules.web_scraper import parse_result_page, infer_page_url_template, RESULTS_PER_PAGE
+from modules.extractors import parse_car_info_timed
+from modules.rate_limiter import HostBuckets
+from modules.adaptive import THROTTLE_STATUSES, RETRY_STATUSES, parse_retry_after, backoff_delay
+
+
+class AsyncRateLimiter:
+    """
+    Event-loop token-bucket limiter with one budget per host.
+
+    Async counterpart of modules.rate_limiter.RateLimiter.
+    """
+
+    def __init__(self, delay=0.5, rate=None, burst=1, host_rates=None):
+        """
+        Args:
+            delay (float): Minimum interval between request starts, used when rate is None
+            rate (float, optional): Requests per second per host
+            burst (int): Requests a host may receive back to back after an idle period
+            host_rates (dict, optional): {host: (rate, burst)} overrides for specific hosts
+        """
+        self._hosts = HostBuckets(delay, rate, burst, host_rates)
+
+    async def wait(self, url=None):
+        """
+        Wait until the caller is allowed to start its request.
+
+        Args:
+            url (str, optional): URL about to be fetched; selects the host budget
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        # No lock needed: token reservation runs without awaiting
+        loop = asyncio.get_running_loop()
+        bucket = self._hosts.bucket(url)
+        waited = 0.0
+        while True:
+            deferrals = bucket.deferrals
+            wait_time = bucket.reserve(loop.time())
+            if wait_time <= 0:
+                break
+            await asyncio.sleep(wait_time)
+            waited += wait_time
+            # A Retry-After that arrived during the sleep voids the reservation
+            if bucket.deferrals == deferrals:
+                break
+        return waited
+
+    def defer(self, url, seconds):
+        """Hold back a host's requests, including ones already waiting, e.g. for a Retry-After header."""
+        self._hosts.bucket(url).defer(asyncio.get_running_loop().time(), seconds)
+
+
+class AsyncCrawler:
+    """
+    Crawl a mobile.bg search and extract its listings on one event loop.
+
+    Listing pages are scheduled as soon as their result page is parsed, and
+    a semaphore bounds the number of requests in flight.
+    """
+
+    def __init__(self, session, delay=0.5, max_pages=100, concurrency=10, timeout=30, logger=None,
+                 parse_executor=None, rate=None, burst=1, host_rates=None, retries=2, metrics=None,
+                 on_result=None):
+        """
+        Args:
+            session (aiohttp.ClientSession): Open client session
+            delay (float): Minimum interval between request starts in seconds
+            max_pages (int): Maximum number of result pages to crawl
+            concurrency (int): Maximum requests in flight
+            timeout (float): Request timeout in seconds
+            logger (logging.Logger, optional): Logger instance
+            parse_executor (concurrent.futures.Executor, optional): Executor for HTML
+                parsing, e.g. a ProcessPoolExecutor; parses on the event loop if None
+            rate (float, optional): Requests per second per host, overrides delay
+            burst (int): Requests a host may receive back to back
+            host_rates (dict, optional): {host: (rate, burst)} overrides for specific hosts
+            retries (int): Extra attempts for throttled or failed requests
+            metrics (CrawlMetrics, optional): Records waits, fetch latency, sizes and parse times
+            on_result (callable, optional): Called on the event loop with each extracted car
+                dictionary as soon as its listing is parsed, in completion order
+        """
+        self.session = session
+        self.parse_executor = parse_executor
+        self.delay = delay
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.retries = max(0, int(retries))
+        self.logger = logger or logging.getLogger(__name__)
+        self.semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+        self.limiter = AsyncRateLimiter(delay, rate=rate, burst=burst, host_rates=host_rates)
+        self.metrics = metrics
+        self.on_result = on_result
+        self.links = []
+        self._seen = set()
+        self._tasks = []
+
+    async def fetch(self, url):
+        """
+        Fetch a URL within the concurrency and rate limits.
+
+        429/503 and 5xx answers and network errors are retried with jittered
+        exponential backoff; a Retry-After header also holds back the host's
+        other requests.
+
+        Returns:
+            tuple: (HTTP status code, body bytes)
+        """
+        import aiohttp
+
+        for attempt in range(self.retries + 1):
+            status, retry_after = None, None
+            async with self.semaphore:
+                waited = await self.limiter.wait(url)
+                if self.metrics is not None:
+                    self.metrics.observe('rate_limit_wait', max(waited, 0.0))
+                timeout = aiohttp.ClientTimeout(total=self.timeout)
+                sent = time.monotonic()
+                try:
+                    async with self.session.get(url, timeout=timeout) as response:
+                        status = response.status
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        body = await response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if self.metrics is not None:
+                        self.metrics.count('network_errors')
+                    if attempt >= self.retries:
+                        raise
+                if self.metrics is not None and status is not None:
+                    self.metrics.observe_response(status, time.monotonic() - sent, len(body))
+            if status is not None and (status not in RETRY_STATUSES or attempt >= self.retries):
+                return status, body
+
+            if retry_after and status in THROTTLE_STATUSES:
+                self.limiter.defer(url, retry_after)
+            delay = max(retry_after or 0.0, backoff_delay(attempt))
+            self.logger.warning(f"🔁 Retrying {url} in {delay:.1f}s ({f'HTTP {status}' if status else 'network error'}, "
+                                f"attempt {attempt + 2}/{self.retries + 1})")
+            await asyncio.sleep(delay)
+            if self.metrics is not None:
+                self.metrics.observe('retry_wait', delay)
+
+    async def extract(self, url):
+        """
+        Fetch and parse one listing page.
+
+        Returns:
+            dict: Extracted car information, empty on failure
+        """
+        import aiohttp
+
+        try:
+            status, content = await self.fetch(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"Error fetching the webpage: {e}")
+            return {}
+        if status != 200:
+            self.logger.error(f"Error fetching the webpage: HTTP {status} for {url}")
+            return {}
+        if self.parse_executor is not None:
+            loop = asyncio.get_running_loop()
+            car_info, timings = await loop.run_in_executor(self.parse_executor, parse_car_info_timed, content, url,
+                                                           self.logger)
+        else:
+            car_info, timings = parse_car_info_timed(content, url, logger=self.logger)
+        if self.metrics is not None:
+            self.metrics.observe_parse(timings)
+            if car_info:
+                self.metrics.count('listings')
+        if car_info and self.on_result is not None:
+            self.on_result(car_info)
+        return car_info
+
+    def _schedule(self, page_num, page_links, total_results):
+        """Queue extraction for new links from one result page."""
+        new_links = [link for link in page_links if link not in self._seen]
+        self._seen.update(new_links)
+        self.links.extend(new_links)
+        for link in new_links:
+            self._tasks.append(asyncio.ensure_future(self.extract(link)))
+
+        if page_links:
+            progress = (len(self.links) / total_results * 100) if total_results else 0
+            self.logger.info(f"  📄 Page {page_num}: Found {len(page_links)} links, {len(new_links)} new ({progress:.1f}% complete)")
+        else:
+            self.logger.warning(f"  📄 Page {page_num}: No car links found")
+        return new_links
+
+    async def _fetch_page(self, url, page_num, find_total=False):
+        """
+        Fetch and parse one result page.
+
+        Returns:
+            tuple or None: parse_result_page() output, or None if the fetch failed
+        """
+        import aiohttp
+
+        self.logger.info(f"📡 Fetching Page {page_num}: {url}")
+        try:
+            status, content = await self.fetch(url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"❌ Network error on page {page_num}: {e}")
+            return None
+        if status != 200:
+            self.logger.error(f"❌ Failed to fetch page {page_num}: HTTP {status}")
+            return None
+        with self.metrics.timer('result_parse') if self.metrics is not None else nullcontext():
+            return parse_result_page(content, find_total=find_total, base_url=url)
+
+    async def crawl(self, search_url):
+        """
+        Crawl all result pages and extract every listing found.
+
+        Args:
+            search_url (str): The initial search URL
+
+        Returns:
+            tuple: (listing URLs in discovery order, extracted car dictionaries in the same order)
+        """
+        start_time = time.time()
+        self.logger.info(f"🔗 Search URL: {search_url}")
+
+        page_num = 1
+        url = search_url
+        total_results = None
+
+        while True:
+            parsed = await self._fetch_page(url, page_num, find_total=(page_num == 1))
+            if parsed is None:
+                break
+            page_links, next_link, page_total = parsed
+
+            if page_total:
+                total_results = page_total
+                self.logger.info("📊 SEARCH RESULTS SUMMARY:")
+                self.logger.info(f" 🎯 Total Results Found: {total_results} cars")
+                self.logger.info(f" 📄 Estimated Pages: {math.ceil(total_results / RESULTS_PER_PAGE)} pages (~20 cars per page)")
+
+            new_links = self._schedule(page_num, page_links, total_results)
+
+            if page_num >= self.max_pages:
+                self.logger.info(f"🛑 Reached max_pages={self.max_pages}. Stopping.")
+                break
+            if not next_link:
+                self.logger.info(f"🏁 No more pages found. Crawling complete!")
+                break
+            if not new_links:
+                self.logger.info(f"🚫 No new links found on page {page_num}. Stopping.")
+                break
+
+            # Schedule the remaining pages at once when their URLs can be built
+            page_url = infer_page_url_template(next_link, page_num + 1) if total_results else None
+            if page_url:
+                last_page = min(math.ceil(total_results / RESULTS_PER_PAGE), self.max_pages)
+                page_nums = list(range(page_num + 1, last_page + 1))
+                pages = [asyncio.ensure_future(self._fetch_page(page_url(n), n)) for n in page_nums]
+                # Merge in page order so links keep their discovery order
+                for n, page in zip(page_nums, pages):
+                    parsed = await page
+                    if parsed is not None:
+                        self._schedule(n, parsed[0], total_results)
+                        page_num = n
+                break
+
+            url = next_link
+            page_num += 1
+
+        self.logger.info(f"🔗 LINK COLLECTION COMPLETE!")
+        self.logger.info(f"  📊 Total Unique Links: {len(self.links)} cars")
+        self.logger.info(f"  📄 Pages Processed: {page_num}")
+        self.logger.info(f"  ⏱️  Total Collection Time: {time.time() - start_time:.1f} seconds")
+
+        cars_data = []
+        for done, (link, task) in enumerate(zip(self.links, self._tasks), 1):
+            car_info = await task
+            if car_info:
+                cars_data.append(car_info)
+            progress = (done / len(self.links)) * 100
+            link_id = link.split('/')[-1] if '/' in link else link[-50:]
+            self.logger.info(f"  [{done}/{len(self.links)}] ({progress:.1f}%) Extracted: {link_id}")
+
+        return self.links, cars_data
+
+
+async def crawl_async(search_url, delay=0.5, max_pages=100, concurrency=10, timeout=30, logger=None,
+                      parse_processes=0, metrics=None, on_result=None, **limits):
+    """
+    Run an AsyncCrawler inside a fresh aiohttp session.
+
+    Returns:
+        tuple: (listing URLs in discovery order, extracted car dictionaries)
+    """
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("The async engine requires aiohttp: pip install aiohttp")
+
+    connector = aiohttp.TCPConnector(limit=max(1, int(concurrency)))
+    headers = {
+        'User-Agent': DEFAULT_USER_AGENT,
+        'Accept-Encoding': get_accept_encoding(),
+    }
+    parse_executor = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes else None
+    try:
+        async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+            crawler = AsyncCrawler(session, delay=delay, max_pages=max_pages, concurrency=concurrency,
+                                   timeout=timeout, logger=logger, parse_executor=parse_executor, metrics=metrics,
+                                   on_result=on_result, **limits)
+            return await crawler.crawl(search_url)
+    finally:
+        if parse_executor is not None:
+            parse_executor.shutdown(wait=True)
+
+
+def run_async_crawl(search_url, delay=0.5, max_pages=100, concurrency=10, timeout=30, logger=None,
+                    parse_processes=0, metrics=None, on_result=None, **limits):
+    """
+    Crawl a search and extract its listings using the async engine.
+
+    Args:
+        search_url (str): The initial search URL
+        delay (float): Minimum interval between request starts in seconds
+        max_pages (int): Maximum number of result pages to crawl
+        concurrency (int): Maximum requests in flight
+        timeout (float): Request timeout in seconds
+        logger (logging.Logger, optional): Logger instance
+        parse_processes (int): Parser processes; 0 parses on the event loop
+        metrics (CrawlMetrics, optional): Records per-request and per-stage timings
+        on_result (callable, optional): Called with each extracted car dictionary as soon as it is parsed
+        **limits: rate, burst, host_rates and retries, see AsyncCrawler
+
+    Returns:
+        tuple: (listing URLs in discovery order, extracted car dictionaries)
+    """
+    return asyncio.run(crawl_async(search_url, delay=delay, max_pages=max_pages, concurrency=concurrency,
+                                   timeout=timeout, logger=logger, parse_processes=parse_processes, metrics=metrics,
+                                   on_result=on_result, **limits))
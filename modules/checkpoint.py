@@ -0,0 +1,168 @@
+"""
+Checkpoint Module for AutoGetCars Crawler
+Saves crawl progress so an interrupted run can resume where it stopped
+"""
+
+import os
+import json
+import time
+import logging
+
+from modules.extractors import listing_id_from_url
+from modules.output_sinks import JsonlSink
+
+
+class CrawlCheckpoint:
+    """
+    Crawl progress kept in a JSON file plus a JSONL sidecar of records.
+
+    The JSON file holds the pagination position, every link found so far and
+    the IDs of completed listings; it is rewritten atomically. Extracted
+    records are appended to `<path>.records.jsonl` and fsynced one by one, so
+    nothing already extracted is lost or fetched again after a crash.
+    """
+
+    def __init__(self, path, search_url, save_interval=5.0, logger=None):
+        """
+        Args:
+            path (str): Checkpoint JSON file
+            search_url (str): Search URL of this run; a checkpoint for another search is ignored
+            save_interval (float): Minimum seconds between checkpoint rewrites while extracting
+            logger (logging.Logger, optional): Logger instance
+        """
+        self.path = path
+        self.records_path = f"{os.path.splitext(path)[0]}.records.jsonl"
+        self.search_url = search_url
+        self.save_interval = save_interval
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.next_url = search_url
+        self.next_page = 1
+        self.pagination_done = False
+        self.links = []
+        self.completed = set()
+        self.records = []
+
+        self._link_set = set()
+        self._last_save = 0.0
+        self._sink = None
+
+    def load(self):
+        """
+        Restore progress saved by an earlier run of the same search.
+
+        Returns:
+            bool: True if a matching checkpoint was found
+        """
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"⚠️ Could not read checkpoint {self.path}: {e}")
+            return False
+        if state.get('search_url') != self.search_url:
+            self.logger.warning("⚠️ Checkpoint belongs to a different search, starting over")
+            return False
+
+        self.next_url = state.get('next_url')
+        self.next_page = state.get('next_page', 1)
+        self.pagination_done = state.get('pagination_done', False)
+        self.links = state.get('links', [])
+        self._link_set = set(self.links)
+        self.completed = set(state.get('completed', []))
+
+        # The sidecar is fsynced per record, so it can be ahead of the JSON file
+        if os.path.exists(self.records_path):
+            with open(self.records_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        car = json.loads(line)
+                    except ValueError:
+                        # A record cut off by the crash; its listing is fetched again
+                        continue
+                    self.records.append(car)
+                    self.completed.add(self._key(car.get('Link')))
+        return True
+
+    @staticmethod
+    def _key(link):
+        return listing_id_from_url(link) or link
+
+    def pending_links(self):
+        """
+        Returns:
+            list: Found links whose listing has not been extracted yet
+        """
+        return [link for link in self.links if self._key(link) not in self.completed]
+
+    def add_link(self, link):
+        """Record a newly found listing link."""
+        if link not in self._link_set:
+            self._link_set.add(link)
+            self.links.append(link)
+
+    def page_done(self, page_num, next_url):
+        """
+        Record the pagination position after a result page; matches
+        iter_listing_links()'s on_page callback.
+        """
+        self.next_page = page_num + 1
+        self.next_url = next_url
+        self.pagination_done = next_url is None
+        self.save()
+
+    def add(self, car):
+        """
+        Append an extracted record to the sidecar and mark its listing done;
+        usable as extract_listings()'s on_result callback.
+
+        Args:
+            car (dict): Car data dictionary
+        """
+        if self._sink is None:
+            self._sink = JsonlSink(self.records_path)
+        self._sink.add(car)
+        self.records.append(car)
+        self.completed.add(self._key(car.get('Link')))
+        if time.time() - self._last_save >= self.save_interval:
+            self.save()
+
+    def save(self):
+        """Rewrite the checkpoint file atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = {
+            'search_url': self.search_url,
+            'next_url': self.next_url,
+            'next_page': self.next_page,
+            'pagination_done': self.pagination_done,
+            'links': self.links,
+            'completed': sorted(self.completed),
+            'saved_at': time.time(),
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_save = time.time()
+
+    def close(self):
+        """Save the final state and close the records sidecar."""
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        self.save()
+
+    def remove(self):
+        """Delete the checkpoint and its sidecar after a completed run."""
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+        for path in (self.path, self.records_path):
+            if os.path.exists(path):
+                os.remove(path)
@@ -53,5 +53,43 @@ def get_output_config():
         'excel_path': os.getenv('EXCEL_PATH', 'docs/car-data.xlsx'),
         'excel_dir': os.getenv('EXCEL_DIR', 'docs'),
         'excel_file': os.getenv('EXCEL_FILE', 'car-data.xlsx'),
-        'sheet_name': os.getenv('SHEET_NAME', 'CarsData')
-    }
\ No newline at end of file
+        'sheet_name': os.getenv('SHEET_NAME', 'CarsData'),
+        'db_path': os.getenv('LISTING_DB', '')
+    }
+
+def get_http_config():
+    """
+    Get HTTP client configuration from environment variables.
+    
+    Returns:
+        dict: HTTP client parameters
+    """
+    return {
+        'pool_size': int(os.getenv('HTTP_POOL_SIZE', '10')),
+        'timeout': float(os.getenv('HTTP_TIMEOUT', '30'))
+    }
+
+def get_rate_limit_config():
+    """
+    Get request rate limit configuration from environment variables.
+    
+    Returns:
+        dict: Requests per second per host (None to derive it from --delay) and burst size
+    """
+    rate = os.getenv('RATE_LIMIT', '')
+    return {
+        'rate': float(rate) if rate else None,
+        'burst': int(os.getenv('RATE_BURST', '1'))
+    }
+
+def get_cache_config():
+    """
+    Get HTTP response cache configuration from environment variables.
+    
+    Returns:
+        dict: Cache directory (empty when caching is off) and size cap in MB
+    """
+    return {
+        'directory': os.getenv('HTTP_CACHE_DIR', ''),
+        'max_mb': float(os.getenv('HTTP_CACHE_MAX_MB', '500'))
+    }
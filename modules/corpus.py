@@ -0,0 +1,165 @@
+"""
+Corpus Module for AutoGetCars Crawler
+Records real search and listing responses into a versioned corpus for offline replay
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from urllib.parse import urlsplit
+
+
+CORPUS_FORMAT = 1
+VERSION_PATTERN = re.compile(r'^v(\d+)$')
+
+
+def corpus_key(url):
+    """
+    Key a response by path and query, so a corpus replays on any host.
+
+    Args:
+        url (str): Requested URL
+
+    Returns:
+        str: Path with query string, e.g. "/obiavi/...?price=5000"
+    """
+    parts = urlsplit(url)
+    return (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+
+def corpus_versions(root):
+    """
+    Returns:
+        list: Version directories under `root` (v001, v002, ...), oldest first
+    """
+    if not os.path.isdir(root):
+        return []
+    names = [name for name in os.listdir(root) if VERSION_PATTERN.match(name)]
+    return [os.path.join(root, name) for name in sorted(names, key=lambda name: int(name[1:]))]
+
+
+def resolve_corpus(path):
+    """
+    Find the corpus to replay: `path` itself, or its latest version.
+
+    Args:
+        path (str): A corpus version directory or a root holding versions
+
+    Returns:
+        str or None: Directory containing corpus.json
+    """
+    if os.path.exists(os.path.join(path, 'corpus.json')):
+        return path
+    versions = corpus_versions(path)
+    return versions[-1] if versions else None
+
+
+def load_corpus(path):
+    """
+    Read a corpus index.
+
+    Args:
+        path (str): A corpus version directory or a root holding versions
+
+    Returns:
+        tuple: (corpus metadata dict, {key: entry dict}); entries hold the
+        body file, status and content type
+    """
+    directory = resolve_corpus(path)
+    if directory is None:
+        raise FileNotFoundError(f"No corpus found in {path}")
+
+    with open(os.path.join(directory, 'corpus.json'), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    meta['directory'] = directory
+
+    entries = {}
+    index_path = os.path.join(directory, 'index.jsonl')
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries[entry['key']] = entry
+    return meta, entries
+
+
+class CorpusRecorder:
+    """
+    Save HTTP responses into a new version of a corpus.
+
+    Each run writes `<root>/vNNN/` with a corpus.json header, one body file
+    per URL under pages/ and an append-only index.jsonl, so a run that stops
+    early still leaves a usable corpus.
+    """
+
+    def __init__(self, root, logger=None):
+        """
+        Args:
+            root (str): Corpus root; the next free vNNN directory is created in it
+            logger (logging.Logger, optional): Logger instance
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        versions = corpus_versions(root)
+        number = int(os.path.basename(versions[-1])[1:]) + 1 if versions else 1
+        self.directory = os.path.join(root, f"v{number:03d}")
+        self.count = 0
+        self._keys = set()
+        self._origin = None
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.join(self.directory, 'pages'))
+        self._index = open(os.path.join(self.directory, 'index.jsonl'), 'a', encoding='utf-8')
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            'format': CORPUS_FORMAT,
+            'version': os.path.basename(self.directory),
+            'captured_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'origin': self._origin,
+        }
+        with open(os.path.join(self.directory, 'corpus.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    def record(self, url, response):
+        """
+        Save one response; later responses for the same URL are ignored.
+
+        Args:
+            url (str): Requested URL
+            response (requests.Response): Response to save
+        """
+        key = corpus_key(url)
+        with self._lock:
+            if key in self._keys:
+                return
+            self._keys.add(key)
+            if self._origin is None:
+                parts = urlsplit(url)
+                self._origin = f"{parts.scheme}://{parts.netloc}"
+                self._write_meta()
+
+            filename = f"pages/{hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]}.html"
+            with open(os.path.join(self.directory, filename), 'wb') as f:
+                f.write(response.content)
+            entry = {
+                'key': key,
+                'file': filename,
+                'status': response.status_code,
+                'content_type': response.headers.get('Content-Type', 'text/html'),
+            }
+            self._index.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._index.flush()
+            self.count += 1
+
+    def close(self):
+        """Close the index file."""
+        self._index.close()
+        self.logger.info(f"📼 Captured {self.count} responses into {self.directory}")
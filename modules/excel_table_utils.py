@@ -1,8 +1,11 @@
-from openpyxl.worksheet.table import Table
+from openpyxl.worksheet.table import Table, TableColumn
+from openpyxl.worksheet.filters import AutoFilter
 
 def expand_table_to_fit(ws, table_name=None):
     """
     Expands the first table (or named table) in the worksheet to cover all non-empty rows and columns.
+    Table columns and the autoFilter are rebuilt to match the new range, since Excel
+    treats a table whose column list or filter disagrees with its ref as corrupt.
     """
     if not ws.tables:
         return
@@ -19,3 +22,15 @@ def expand_table_to_fit(ws, table_name=None):
     from openpyxl.utils import get_column_letter
     end_col = get_column_letter(max_col)
     table.ref = f"A1:{end_col}{max_row}"
+
+    # One column per header cell, keeping the settings of columns the table already had
+    existing = {column.name: column for column in table.tableColumns}
+    columns = []
+    for idx in range(min_col, max_col + 1):
+        value = ws.cell(row=min_row, column=idx).value
+        name = str(value) if value is not None else f"Column{idx}"
+        column = existing.get(name) or TableColumn(id=idx, name=name)
+        column.id = idx
+        columns.append(column)
+    table.tableColumns = columns
+    table.autoFilter = AutoFilter(ref=table.ref)
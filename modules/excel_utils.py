@@ -4,14 +4,35 @@ Handles Excel export and formatting functionality
 """
 
 import os
+import re
 import sys
+import shutil
+import zipfile
 import logging
+import warnings
 from openpyxl import load_workbook, Workbook
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 from openpyxl.utils import get_column_letter
 from modules.excel_table_utils import expand_table_to_fit
 
 
+# Standard headers for car data with separate price columns only
+EXCEL_HEADERS = [
+    'Brand', 'Model', 'Production Date', 'Price_EUR', 'Price_BGN', 'Engine', 'Fuel Type', 
+    'Transmission', 'Mileage', 'Color', 'Location', 'Phone', 
+    'Link', 'Описание', 'Car Extras'
+]
+
+# Extra column used by upsert exports to flag listings missing from the latest run
+STATUS_HEADER = 'Status'
+STATUS_ACTIVE = 'Active'
+STATUS_REMOVED = 'Removed'
+
+# Column width limits used when auto-sizing columns
+MIN_COLUMN_WIDTH = 10
+MAX_COLUMN_WIDTH = 60
+
+
 def write_rows_to_excel(excel_path, sheet_name, data, headers, key_map):
     """
     Write car data rows to Excel file with proper formatting.
@@ -72,7 +93,7 @@ def write_rows_to_excel(excel_path, sheet_name, data, headers, key_map):
     # Ensure a table exists and covers all data
     if ws.max_row > 1:  # Only if there's data
         try:
-            table_name = f"Table_{sheet_name}" if sheet_name else "Table1"
+            table_name = _table_name(sheet_name)
             # Remove existing tables to avoid conflicts
             table_names = list(ws.tables.keys())
             for table_name_to_remove in table_names:
@@ -104,14 +125,322 @@ def write_rows_to_excel(excel_path, sheet_name, data, headers, key_map):
                     max_length = cell_length
         
         # Set column width with some padding, but cap it at reasonable size
-        adjusted_width = min(max(max_length + 3, 10), 60)  # Min 10, Max 60 chars
+        adjusted_width = min(max(max_length + 3, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH)
         ws.column_dimensions[column_letter].width = adjusted_width
     
     wb.save(excel_path)
     return excel_path
 
 
-def export_to_excel(cars_data, excel_path=None, sheet_name=None):
+class StreamingExcelWriter:
+    """
+    Write-only Excel exporter that streams rows to disk as they arrive.
+
+    Column widths are tracked as a running maximum per column and the table
+    is defined once when the writer is closed, so memory stays flat no
+    matter how many rows are written. The workbook holds only this sheet
+    and replaces the target file when closed.
+    """
+
+    def __init__(self, excel_path, sheet_name, headers, key_map=None):
+        """
+        Args:
+            excel_path (str): Path to Excel file
+            sheet_name (str): Name of the worksheet
+            headers (list): List of column headers
+            key_map (dict, optional): Mapping of headers to data keys
+        """
+        self.excel_path = excel_path
+        self.sheet_name = sheet_name
+        self.headers = headers
+        self.key_map = key_map or {}
+        self.row_count = 0
+
+        self.wb = Workbook(write_only=True)
+        self.ws = self.wb.create_sheet(sheet_name if sheet_name else "Cars")
+        self.max_lengths = [0] * len(headers)
+        self._append(headers)
+
+    def _append(self, values):
+        """Write one row and update the running column widths."""
+        for i, value in enumerate(values):
+            if value:
+                self.max_lengths[i] = max(self.max_lengths[i], len(str(value)))
+        self.ws.append(values)
+
+    def append(self, row):
+        """
+        Write one car data row.
+
+        Args:
+            row (dict): Car data dictionary
+        """
+        self._append([row.get(self.key_map.get(h, h), "") for h in self.headers])
+        self.row_count += 1
+
+    def _write_column_widths(self, xlsx_path):
+        """
+        Insert the <cols> element into the sheet of a saved workbook.
+
+        Write-only sheets take column widths before the first row, when they
+        are not known yet, so they are spliced in front of <sheetData> in the
+        saved package; every other part is copied unchanged.
+
+        Args:
+            xlsx_path (str): Workbook saved by this writer
+        """
+        cols = ''.join(
+            f'<col min="{i}" max="{i}" width="{min(max(length + 3, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH)}" customWidth="1"/>'
+            for i, length in enumerate(self.max_lengths, 1)
+        )
+        cols = f'<cols>{cols}</cols>'.encode('utf-8')
+
+        patched_path = f"{xlsx_path}.cols"
+        with zipfile.ZipFile(xlsx_path) as src, zipfile.ZipFile(patched_path, 'w', zipfile.ZIP_DEFLATED) as dst:
+            for item in src.infolist():
+                is_sheet = item.filename.startswith('xl/worksheets/sheet')
+                with src.open(item) as data, dst.open(item, 'w', force_zip64=item.file_size > 2 ** 31 - 2 ** 20) as out:
+                    if is_sheet:
+                        head = b''
+                        while b'<sheetData' not in head:
+                            chunk = data.read(64 * 1024)
+                            if not chunk:
+                                raise ValueError("sheetData element not found in streamed worksheet")
+                            head += chunk
+                        split_at = head.index(b'<sheetData')
+                        out.write(head[:split_at] + cols + head[split_at:])
+                    shutil.copyfileobj(data, out)
+        os.replace(patched_path, xlsx_path)
+
+    def close(self):
+        """
+        Add the table, finish the sheet and save the workbook.
+
+        Returns:
+            str: Path to the saved Excel file
+        """
+        if self.row_count:
+            try:
+                table = Table(displayName=_table_name(self.sheet_name),
+                              ref=f"A1:{get_column_letter(len(self.headers))}{self.row_count + 1}")
+                table.tableColumns = [TableColumn(id=i, name=str(header))
+                                      for i, header in enumerate(self.headers, 1)]
+                table.tableStyleInfo = TableStyleInfo(
+                    name="TableStyleMedium2", showFirstColumn=False,
+                    showLastColumn=False, showRowStripes=True, showColumnStripes=False
+                )
+                with warnings.catch_warnings():
+                    # openpyxl always warns for write-only sheets; the columns are set above
+                    warnings.simplefilter('ignore', UserWarning)
+                    self.ws.add_table(table)
+            except Exception as e:
+                logging.warning(f"Could not create table: {e}")
+
+        # Save next to the target first so a failed save keeps the old file
+        tmp_path = f"{self.excel_path}.tmp"
+        self.wb.save(tmp_path)
+        self._write_column_widths(tmp_path)
+        os.replace(tmp_path, self.excel_path)
+        return self.excel_path
+
+
+def write_rows_streaming(excel_path, sheet_name, data, headers, key_map):
+    """
+    Write car data rows with the write-only streaming exporter.
+    
+    Args:
+        excel_path (str): Path to Excel file
+        sheet_name (str): Name of the worksheet
+        data (iterable): Car data dictionaries, consumed one at a time
+        headers (list): List of column headers
+        key_map (dict): Mapping of headers to data keys
+        
+    Returns:
+        str: Path to the saved Excel file
+    """
+    excel_dir = os.path.dirname(excel_path)
+    if excel_dir and not os.path.exists(excel_dir):
+        os.makedirs(excel_dir, exist_ok=True)
+    
+    writer = StreamingExcelWriter(excel_path, sheet_name, headers, key_map)
+    for row in data:
+        writer.append(row)
+    return writer.close()
+
+
+def can_stream_to(excel_path, sheet_name):
+    """
+    Check whether a streaming export would lose nothing from an existing file.
+    
+    Streaming rewrites the whole workbook, so it is only used when the file
+    is missing or holds no sheet other than the target one.
+    
+    Args:
+        excel_path (str): Path to Excel file
+        sheet_name (str): Name of the worksheet
+        
+    Returns:
+        bool: True if the streaming exporter can be used
+    """
+    if not os.path.exists(excel_path):
+        return True
+    try:
+        wb = load_workbook(excel_path, read_only=True)
+        sheetnames = wb.sheetnames
+        wb.close()
+    except Exception:
+        return False
+    return sheetnames == [sheet_name if sheet_name else "Cars"]
+
+
+def _table_name(sheet_name):
+    """
+    Excel table name for a sheet; characters a table name can't hold become underscores.
+    
+    Args:
+        sheet_name (str): Name of the worksheet
+        
+    Returns:
+        str: Table name such as "Table_Cars_Data"
+    """
+    if not sheet_name:
+        return "Table1"
+    return re.sub(r'[^\w.]', '_', f"Table_{sheet_name}")
+
+
+def _column_width(value):
+    """Width needed to show a cell value, within the auto-size limits."""
+    length = len(str(value)) if value else 0
+    return min(max(length + 3, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH)
+
+
+def upsert_rows_to_excel(excel_path, sheet_name, data, headers, key_map, mark_vanished=False):
+    """
+    Update an existing sheet in place, keyed by listing ID.
+    
+    Rows whose listing is already in the sheet are updated cell by cell
+    where values changed, new listings are appended, and unchanged rows
+    are left alone. Rows are matched on the obiava ID in the Link column,
+    or on the whole link for URLs without one.
+    
+    Args:
+        excel_path (str): Path to Excel file
+        sheet_name (str): Name of the worksheet
+        data (list): List of car data dictionaries
+        headers (list): List of column headers
+        key_map (dict): Mapping of headers to data keys
+        mark_vanished (bool): Keep a Status column flagging listings missing from `data` as Removed
+        
+    Returns:
+        str: Path to the saved Excel file
+    """
+    from modules.extractors import listing_id_from_url
+    
+    def row_key(link):
+        return listing_id_from_url(link) or link
+    
+    sheet_title = sheet_name if sheet_name else "Cars"
+    if not os.path.exists(excel_path):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = sheet_title
+        ws.append(headers)
+        print(f"📝 Created new Excel file: {excel_path}")
+    else:
+        wb = load_workbook(excel_path)
+    
+    if sheet_title in wb.sheetnames:
+        ws = wb[sheet_title]
+    else:
+        ws = wb.create_sheet(sheet_title)
+        ws.append(headers)
+        print(f"📋 Created new sheet: {sheet_title}")
+    
+    # Map headers to columns, adding any the sheet doesn't have yet
+    columns = {cell.value: cell.column for cell in ws[1] if cell.value}
+    wanted = list(headers) + ([STATUS_HEADER] if mark_vanished else [])
+    for header in wanted:
+        if header not in columns:
+            column = max(columns.values(), default=0) + 1
+            ws.cell(row=1, column=column, value=header)
+            ws.column_dimensions[get_column_letter(column)].width = _column_width(header)
+            columns[header] = column
+    
+    link_column = columns['Link']
+    existing = {}
+    for row_idx, (link,) in enumerate(ws.iter_rows(min_row=2, min_col=link_column, max_col=link_column,
+                                                   values_only=True), 2):
+        if link:
+            existing[row_key(link)] = row_idx
+    
+    widths = {}
+    
+    def set_cell(row_idx, header, value):
+        cell = ws.cell(row=row_idx, column=columns[header])
+        if (cell.value if cell.value is not None else "") == value:
+            return False
+        cell.value = value
+        letter = cell.column_letter
+        widths[letter] = max(widths.get(letter, 0), _column_width(value))
+        return True
+    
+    updated = added = unchanged = 0
+    seen = set()
+    next_row = ws.max_row + 1
+    for car in data:
+        key = row_key(car.get(key_map.get('Link', 'Link'), ""))
+        values = [(h, car.get(key_map.get(h, h), "")) for h in headers]
+        if mark_vanished:
+            values.append((STATUS_HEADER, STATUS_ACTIVE))
+        
+        if key in existing:
+            changed = [set_cell(existing[key], h, value) for h, value in values]
+            if any(changed):
+                updated += 1
+            else:
+                unchanged += 1
+        else:
+            for h, value in values:
+                set_cell(next_row, h, value)
+            existing[key] = next_row
+            next_row += 1
+            added += 1
+        seen.add(key)
+    
+    removed = 0
+    if mark_vanished:
+        for key, row_idx in existing.items():
+            if key not in seen and set_cell(row_idx, STATUS_HEADER, STATUS_REMOVED):
+                removed += 1
+    
+    # Widen columns only for the cells written in this run
+    for letter, width in widths.items():
+        dimension = ws.column_dimensions[letter]
+        dimension.width = max(dimension.width or 0, width)
+    
+    if ws.max_row > 1:
+        try:
+            if ws.tables:
+                expand_table_to_fit(ws)
+            else:
+                table = Table(displayName=_table_name(sheet_name), ref=f"A1:{get_column_letter(ws.max_column)}{ws.max_row}")
+                table.tableStyleInfo = TableStyleInfo(
+                    name="TableStyleMedium2", showFirstColumn=False,
+                    showLastColumn=False, showRowStripes=True, showColumnStripes=False
+                )
+                ws.add_table(table)
+        except Exception as e:
+            logging.warning(f"Could not create table: {e}")
+    
+    wb.save(excel_path)
+    summary = f"🔄 Upserted into {sheet_title}: {updated} updated, {added} added, {unchanged} unchanged"
+    if mark_vanished:
+        summary += f", {removed} marked {STATUS_REMOVED}"
+    print(summary)
+    return excel_path
+
+
+def export_to_excel(cars_data, excel_path=None, sheet_name=None, mode='replace', mark_vanished=False):
     """
     Export car data to Excel with proper formatting.
     Uses .env configuration if parameters not provided.
@@ -120,6 +449,8 @@ def export_to_excel(cars_data, excel_path=None, sheet_name=None):
         cars_data (list): List of car data dictionaries
         excel_path (str, optional): Path to Excel file (uses .env if not provided)
         sheet_name (str, optional): Name of the Excel sheet (uses .env if not provided)
+        mode (str): 'replace' rewrites the sheet, 'upsert' updates it in place by listing ID
+        mark_vanished (bool): In upsert mode, flag listings missing from cars_data as Removed
     """
     # Import config manager to get .env settings
     from modules.config_manager import get_output_config
@@ -133,12 +464,7 @@ def export_to_excel(cars_data, excel_path=None, sheet_name=None):
     if sheet_name is None:
         sheet_name = config.get('sheet_name', 'CarsData')
     
-    # Define standard headers for car data with separate price columns only
-    headers = [
-        'Brand', 'Model', 'Production Date', 'Price_EUR', 'Price_BGN', 'Engine', 'Fuel Type', 
-        'Transmission', 'Mileage', 'Color', 'Location', 'Phone', 
-        'Link', 'Описание', 'Car Extras'
-    ]
+    headers = EXCEL_HEADERS
     
     # Create key mapping
     key_map = {h: h for h in headers}
@@ -149,8 +475,15 @@ def export_to_excel(cars_data, excel_path=None, sheet_name=None):
         os.makedirs(excel_dir, exist_ok=True)
         print(f"📁 Created directory: {excel_dir}")
     
-    # Use existing function to write data
-    result_path = write_rows_to_excel(
+    if mode == 'upsert':
+        result_path = upsert_rows_to_excel(excel_path, sheet_name, cars_data, headers, key_map,
+                                           mark_vanished=mark_vanished)
+        print(f"📊 Exported {len(cars_data)} cars to: {result_path}")
+        return result_path
+    
+    # Stream rows when no other sheets need to be preserved
+    write_rows = write_rows_streaming if can_stream_to(excel_path, sheet_name) else write_rows_to_excel
+    result_path = write_rows(
         excel_path=excel_path,
         sheet_name=sheet_name,
         data=cars_data,
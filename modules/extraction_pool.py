@@ -0,0 +1,160 @@
+"""
+Extraction Pool Module for AutoGetCars Crawler
+Extracts car listings concurrently with a shared politeness budget
+"""
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+from modules.rate_limiter import RateLimiter
+from modules.http_client import paces_with
+from modules.extractors import (
+    extract_car_info_unified, fetch_listing_page, parse_car_info_mobile, parse_car_info_timed, is_mobile_listing
+)
+
+
+def extract_listings(links, workers=1, delay=0.5, logger=None, extractor=None, client=None, limiter=None,
+                     parse_processes=0, on_result=None, metrics=None):
+    """
+    Extract car data from listing links using a bounded worker pool.
+
+    All workers share one token-bucket RateLimiter, so the request rate stays
+    within its per-host budget while network latency overlaps. `links` may be
+    a generator such as iter_listing_links(); each link is queued as soon as
+    it is yielded, so extraction starts while pagination is still running, and
+    finished records reach `on_result` between links rather than at the end.
+
+    With `parse_processes` > 0, fetching and parsing become separate stages:
+    worker threads only download listing pages and hand the raw bytes to a
+    ProcessPoolExecutor running parse_car_info_mobile, so HTML parsing is not
+    limited to one core by the GIL.
+
+    With `metrics`, the default extractor's fetch and parse steps run here
+    so tree building and field extraction times can be recorded; a custom
+    extractor is still called as is.
+
+    Args:
+        links (iterable): Car listing URLs in discovery order
+        workers (int): Number of concurrent extraction workers
+        delay (float): Minimum interval between request starts in seconds
+        logger (logging.Logger, optional): Logger instance
+        extractor (callable, optional): Extractor taking (url, logger=..., client=...)
+        client (HttpClient, optional): Shared HTTP client passed to the extractor
+        limiter (RateLimiter, optional): Politeness budget shared with other stages
+        parse_processes (int): Parser processes; 0 parses inside the fetch threads
+        on_result (callable, optional): Called with each extracted car dictionary,
+            in link order, as soon as it is available
+        metrics (CrawlMetrics, optional): Records parse and field extraction times per listing
+
+    Returns:
+        list: Extracted car dictionaries in the same order as `links`
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    if extractor is None:
+        extractor = extract_car_info_unified
+    if limiter is None:
+        limiter = RateLimiter(delay)
+
+    workers = max(1, int(workers or 1))
+    parse_pool = ProcessPoolExecutor(max_workers=parse_processes) if parse_processes else None
+    futures = []
+
+    # Parser processes never use `extractor`, so their timings can always be collected
+    timed = metrics is not None and (parse_pool is not None or extractor is extract_car_info_unified)
+    # A throttled client takes the token once it holds a concurrency slot
+    paced = paces_with(client, limiter)
+
+    def fetch(link):
+        if not paced:
+            limiter.wait(link)
+        if parse_pool is None and not timed:
+            return extractor(link, logger=logger, client=client)
+        if not is_mobile_listing(link):
+            logger.warning(f"Unsupported site for URL: {link}")
+            return {}
+        content = fetch_listing_page(link, logger=logger, client=client)
+        if content is None:
+            return {}
+        if parse_pool is None:
+            car_info, timings = parse_car_info_timed(content, link, logger)
+            metrics.observe_parse(timings)
+            return car_info
+        # Return immediately so this thread can start the next download
+        if timed:
+            return parse_pool.submit(parse_car_info_timed, content, link, logger)
+        return parse_pool.submit(parse_car_info_mobile, content, link, logger)
+
+    def unpack(result):
+        """Car dictionary of a parser process result, recording its timings when they came along."""
+        if timed:
+            car_info, timings = result
+            metrics.observe_parse(timings)
+            return car_info
+        return result
+
+    def resolve(future):
+        result = future.result()
+        return unpack(result.result()) if isinstance(result, Future) else result
+
+    def ready(future):
+        """True once resolve(future) won't block, including on a parser process result."""
+        if not future.done():
+            return False
+        if future.cancelled() or future.exception() is not None:
+            return True
+        result = future.result()
+        return not isinstance(result, Future) or result.done()
+
+    def finished_result(future):
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            return None
+        result = future.result()
+        if isinstance(result, Future):
+            result = finished_result(result)
+            return result[0] if timed and result else result
+        return result
+
+    done = 0
+
+    def deliver():
+        """Resolve the oldest unfinished link and hand its record on."""
+        nonlocal done
+        link, future = futures[done]
+        done += 1
+        try:
+            car_info = resolve(future)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to extract data from {link}: {e}")
+            return
+        if car_info and metrics is not None:
+            metrics.count('listings')
+        if car_info and on_result is not None:
+            on_result(car_info)
+
+        # While links are still arriving the total is the number queued so far
+        total = len(futures)
+        progress = (done / total) * 100
+        link_id = link.split('/')[-1] if '/' in link else link[-50:]
+        logger.info(f"  [{done}/{total}] ({progress:.1f}%) Extracted: {link_id}")
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for link in links:
+            futures.append((link, executor.submit(fetch, link)))
+            # Pass on finished records in link order without waiting for the last link
+            while done < len(futures) and ready(futures[done][1]):
+                deliver()
+
+        while done < len(futures):
+            deliver()
+    except KeyboardInterrupt:
+        logger.warning("🛑 Crawling interrupted by user")
+        executor.shutdown(wait=False, cancel_futures=True)
+    finally:
+        executor.shutdown(wait=True)
+        if parse_pool is not None:
+            parse_pool.shutdown(wait=True, cancel_futures=True)
+
+    results = (finished_result(future) for _, future in futures)
+    return [car_info for car_info in results if car_info]
@@ -0,0 +1,89 @@
+"""
+Field Parsers Module for AutoGetCars Crawler
+Turns the display strings of extracted listings into typed values
+"""
+
+import re
+
+
+BULGARIAN_MONTHS = {
+    'януари': 1, 'февруари': 2, 'март': 3, 'април': 4, 'май': 5, 'юни': 6,
+    'юли': 7, 'август': 8, 'септември': 9, 'октомври': 10, 'ноември': 11, 'декември': 12,
+}
+
+NUMBER_RE = re.compile(r'\d[\d\s]*')
+YEAR_RE = re.compile(r'\b(19\d{2}|20\d{2})\b')
+
+
+def _first_number(text):
+    """First group of digits in a string, allowing thousands separated by spaces."""
+    if not text:
+        return None
+    match = NUMBER_RE.search(str(text))
+    if not match:
+        return None
+    return int(re.sub(r'\s', '', match.group(0)))
+
+
+def parse_mileage_km(mileage):
+    """
+    Parse a mileage such as "150 000 км".
+
+    Args:
+        mileage (str): Mileage as shown on the listing
+
+    Returns:
+        int or None: Kilometres
+    """
+    return _first_number(mileage)
+
+
+def parse_power_hp(engine):
+    """
+    Parse engine power such as "190 к.с.".
+
+    Args:
+        engine (str): Power as shown on the listing
+
+    Returns:
+        int or None: Horsepower
+    """
+    return _first_number(engine)
+
+
+def parse_production_date(production_date):
+    """
+    Parse a production date such as "юни 2007" or "2007".
+
+    Args:
+        production_date (str): Production date as shown on the listing
+
+    Returns:
+        tuple: (year, month), each int or None
+    """
+    if not production_date:
+        return None, None
+    text = str(production_date).lower()
+    year_match = YEAR_RE.search(text)
+    year = int(year_match.group(1)) if year_match else None
+    month = next((number for name, number in BULGARIAN_MONTHS.items() if name in text), None)
+    return year, month
+
+
+def parse_price(value, cast=float):
+    """
+    Convert an extracted price to a number.
+
+    Args:
+        value: Price_EUR or Price_BGN field, a number or '' when missing
+        cast (type): float or int
+
+    Returns:
+        float, int or None: The price
+    """
+    if value is None or value == '':
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,111 @@
+"""
+HTML Parser Module for AutoGetCars Crawler
+Selects the parser backend used for search result and listing pages
+"""
+
+import os
+import logging
+from bs4 import BeautifulSoup, UnicodeDammit
+
+
+DEFAULT_PARSER = 'html.parser'
+SUPPORTED_PARSERS = ('html.parser', 'lxml', 'selectolax')
+
+_warned = set()
+
+
+def _is_installed(module_name):
+    """Check whether an optional parser package can be imported."""
+    try:
+        __import__(module_name)
+        return True
+    except ImportError:
+        return False
+
+
+def _warn_once(message):
+    """Log a fallback warning only once per process."""
+    if message not in _warned:
+        _warned.add(message)
+        logging.getLogger('autogetcars_crawler').warning(message)
+
+
+def get_parser_engine(parser=None):
+    """
+    Resolve the parser engine to use.
+
+    Args:
+        parser (str, optional): Requested engine; defaults to PARSER_ENGINE from .env
+
+    Returns:
+        str: One of SUPPORTED_PARSERS that is actually installed
+    """
+    parser = (parser or os.getenv('PARSER_ENGINE') or DEFAULT_PARSER).strip().lower()
+
+    if parser not in SUPPORTED_PARSERS:
+        _warn_once(f"⚠️ Unknown parser engine '{parser}', using {DEFAULT_PARSER}")
+        return DEFAULT_PARSER
+    if parser == 'lxml' and not _is_installed('lxml'):
+        _warn_once(f"⚠️ lxml is not installed (pip install lxml), using {DEFAULT_PARSER}")
+        return DEFAULT_PARSER
+    if parser == 'selectolax' and not _is_installed('selectolax'):
+        _warn_once(f"⚠️ selectolax is not installed (pip install selectolax), using {DEFAULT_PARSER}")
+        return DEFAULT_PARSER
+    return parser
+
+
+def get_soup_features(parser=None):
+    """
+    Get the BeautifulSoup tree builder for a parser engine.
+
+    selectolax only has a fast path for search result pages; everything
+    parsed with BeautifulSoup uses lxml when it is available.
+
+    Args:
+        parser (str, optional): Requested engine; defaults to PARSER_ENGINE from .env
+
+    Returns:
+        str: BeautifulSoup features string
+    """
+    parser = get_parser_engine(parser)
+    if parser == 'selectolax':
+        return 'lxml' if _is_installed('lxml') else DEFAULT_PARSER
+    return parser
+
+
+def make_soup(content, parser=None, parse_only=None):
+    """
+    Parse HTML with BeautifulSoup using the configured backend.
+
+    Args:
+        content (bytes or str): Raw HTML
+        parser (str, optional): Requested engine; defaults to PARSER_ENGINE from .env
+        parse_only (SoupStrainer, optional): Restrict which parts of the tree are built
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    return BeautifulSoup(content, get_soup_features(parser), parse_only=parse_only)
+
+
+def make_selectolax_tree(content):
+    """
+    Parse HTML with selectolax, preferring the lexbor backend.
+
+    selectolax ignores the page's declared charset, so bytes are decoded
+    first the way BeautifulSoup would, e.g. for windows-1251 pages.
+
+    Args:
+        content (bytes or str): Raw HTML
+
+    Returns:
+        selectolax document node
+    """
+    if isinstance(content, bytes):
+        content = UnicodeDammit(content, is_html=True).unicode_markup
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborHTMLParser(content)
+    except ImportError:
+        from selectolax.parser import HTMLParser
+        return HTMLParser(content)
@@ -0,0 +1,173 @@
+"""
+HTTP Cache Module for AutoGetCars Crawler
+Persistent on-disk response cache with conditional revalidation
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+import logging
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# Response headers kept with a cached body
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+CACHE_FILE_NAME = 'http_cache.sqlite'
+
+
+class ResponseCache:
+    """
+    URL-keyed response cache stored in a single SQLite file.
+
+    Bodies are kept zlib-compressed together with their ETag/Last-Modified
+    validators. Entries are evicted least-recently-used first once the
+    compressed size exceeds `max_bytes`. Safe to share between threads.
+    """
+
+    def __init__(self, directory, max_bytes=500 * 1024 * 1024, logger=None):
+        """
+        Args:
+            directory (str): Directory holding the cache file, created if missing
+            max_bytes (int): Maximum total size of compressed bodies
+            logger (logging.Logger, optional): Logger instance
+        """
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.logger = logger or logging.getLogger(__name__)
+        self.hits = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, CACHE_FILE_NAME)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' url TEXT PRIMARY KEY,'
+            ' headers TEXT NOT NULL,'
+            ' body BLOB NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' stored_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)')
+        self._conn.commit()
+        self._total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def lookup(self, url):
+        """
+        Get the cached validators for a URL.
+
+        Args:
+            url (str): Request URL
+
+        Returns:
+            dict or None: Cached response headers, or None if the URL is not cached
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT headers FROM responses WHERE url = ?', (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def conditional_headers(self, url):
+        """
+        Build If-None-Match/If-Modified-Since headers for a cached URL.
+
+        Returns:
+            dict: Request headers, empty if the URL is not cached
+        """
+        cached = self.lookup(url)
+        if not cached:
+            return {}
+        headers = {}
+        if cached.get('ETag'):
+            headers['If-None-Match'] = cached['ETag']
+        if cached.get('Last-Modified'):
+            headers['If-Modified-Since'] = cached['Last-Modified']
+        return headers
+
+    def load(self, url):
+        """
+        Build a response from the cached body and mark it as recently used.
+
+        Args:
+            url (str): Request URL
+
+        Returns:
+            requests.Response or None: Cached response with status 200
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT headers, body FROM responses WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+            self._conn.commit()
+            self.hits += 1
+
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(json.loads(row[0]))
+        response._content = zlib.decompress(row[1])
+        response.from_cache = True
+        return response
+
+    def store(self, url, response):
+        """
+        Cache a 200 response that carries an ETag or Last-Modified validator.
+
+        Args:
+            url (str): Request URL
+            response (requests.Response): Response to cache
+
+        Returns:
+            bool: True if the response was stored
+        """
+        headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        if response.status_code != 200 or not (headers.get('ETag') or headers.get('Last-Modified')):
+            return False
+
+        body = zlib.compress(response.content)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute('SELECT size FROM responses WHERE url = ?', (url,)).fetchone()
+            self._total += len(body) - (previous[0] if previous else 0)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (url, headers, body, size, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (url, json.dumps(headers), body, len(body), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+        return True
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes. Caller holds the lock."""
+        if self._total <= self.max_bytes:
+            return
+        evicted = 0
+        for url, size in self._conn.execute('SELECT url, size FROM responses ORDER BY accessed_at').fetchall():
+            if self._total <= self.max_bytes:
+                break
+            self._conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            self._total -= size
+            evicted += 1
+        self.logger.debug(f"🧹 Evicted {evicted} cached responses")
+
+    def total_bytes(self):
+        """
+        Returns:
+            int: Total size of the compressed bodies in the cache
+        """
+        with self._lock:
+            return self._total
+
+    def close(self):
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
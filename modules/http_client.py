@@ -0,0 +1,235 @@
+"""
+HTTP Client Module for AutoGetCars Crawler
+Shared keep-alive session used by the scraper, validator and extractors
+"""
+
+import time
+import logging
+import threading
+from contextlib import nullcontext
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules.adaptive import RETRY_STATUSES, parse_retry_after, backoff_delay
+
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+def get_accept_encoding():
+    """
+    Build the Accept-Encoding header for the installed decoders.
+
+    Brotli is only advertised when urllib3 can actually decode it.
+
+    Returns:
+        str: Accept-Encoding header value
+    """
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append('br')
+        except ImportError:
+            pass
+    return ', '.join(encodings)
+
+
+class HttpClient:
+    """
+    Pooled HTTP client that reuses TCP/TLS connections to mobile.bg.
+
+    A single instance is safe to share between worker threads.
+    """
+
+    def __init__(self, pool_size=10, timeout=30, headers=None, cache=None, throttle=None, recorder=None, metrics=None,
+                 logger=None):
+        """
+        Args:
+            pool_size (int): Maximum keep-alive connections per host
+            timeout (float): Default request timeout in seconds
+            headers (dict, optional): Extra default headers
+            cache (ResponseCache, optional): On-disk cache revalidated with conditional requests
+            throttle (AdaptiveThrottle, optional): Adjusts rate and concurrency from server responses
+            recorder (CorpusRecorder, optional): Saves every successful response for offline replay
+            metrics (CrawlMetrics, optional): Records latency, size and status of every attempt
+            logger (logging.Logger, optional): Logger instance
+        """
+        self.pool_size = max(1, int(pool_size))
+        self.timeout = timeout
+        self.cache = cache
+        self.throttle = throttle
+        self.recorder = recorder
+        self.metrics = metrics
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.session.headers.update({
+            'User-Agent': DEFAULT_USER_AGENT,
+            'Accept-Encoding': get_accept_encoding(),
+            'Connection': 'keep-alive',
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(self, url, timeout=None, retries=0, **kwargs):
+        """
+        Send a GET request through the pooled session.
+
+        429/503 and 5xx answers and network errors are retried up to `retries`
+        times with jittered exponential backoff, waiting at least as long as
+        a Retry-After header asks. With a throttle, every attempt first takes
+        a concurrency slot and then the throttle limiter's token, and every
+        response feeds the adaptive rate and concurrency control.
+
+        Args:
+            url (str): URL to fetch
+            timeout (float, optional): Request timeout, defaults to the client timeout
+            retries (int): Extra attempts after a throttled or failed request
+
+        Returns:
+            requests.Response: The HTTP response (the last one if all attempts failed)
+        """
+        attempt = 0
+        while True:
+            start = time.monotonic()
+            try:
+                with self.throttle.slot(url) if self.throttle is not None else nullcontext(0.0) as paced:
+                    sent = time.monotonic()
+                    response = self._send(url, timeout, **kwargs)
+                    latency = time.monotonic() - sent
+            except requests.exceptions.RequestException as e:
+                if self.metrics is not None:
+                    self.metrics.count('network_errors')
+                if attempt >= retries:
+                    raise
+                reason = type(e).__name__
+                delay = backoff_delay(attempt)
+            else:
+                if self.metrics is not None:
+                    self.metrics.observe('concurrency_wait', max(sent - start - paced, 0.0))
+                    self.metrics.observe_response(response.status_code, latency,
+                                                  None if kwargs.get('stream') else len(response.content))
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if self.throttle is not None:
+                    self.throttle.observe(url, response.status_code, latency, retry_after)
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    if self.recorder is not None and response.status_code == 200:
+                        self.recorder.record(url, response)
+                    return response
+                response.close()
+                reason = f"HTTP {response.status_code}"
+                delay = max(retry_after or 0.0, backoff_delay(attempt))
+
+            self.logger.warning(f"🔁 Retrying {url} in {delay:.1f}s ({reason}, attempt {attempt + 2}/{retries + 1})")
+            time.sleep(delay)
+            if self.metrics is not None:
+                self.metrics.observe('retry_wait', delay)
+            attempt += 1
+
+    def _send(self, url, timeout=None, **kwargs):
+        """
+        Send one request, revalidating cached responses.
+
+        With a cache, a previously seen URL is requested with its ETag and
+        Last-Modified validators, and a 304 answer is served from disk as a
+        regular 200 response (with `from_cache` set). If the entry was evicted
+        while the request was in flight, the page is requested again in full.
+        """
+        if self.cache is None or kwargs.get('params'):
+            return self.session.get(url, timeout=timeout or self.timeout, **kwargs)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        validators = self.cache.conditional_headers(url)
+        response = self.session.get(url, timeout=timeout or self.timeout, headers={**headers, **validators}, **kwargs)
+
+        if response.status_code == 304:
+            cached = self.cache.load(url)
+            if cached is not None:
+                cached.elapsed = response.elapsed
+                response.close()
+                return cached
+            # A 304 has no body to fall back on
+            response.close()
+            self.logger.debug(f"🗄️ Cached copy of {url} is gone, fetching it again")
+            response = self.session.get(url, timeout=timeout or self.timeout, headers=headers, **kwargs)
+
+        if response.status_code == 200:
+            self.cache.store(url, response)
+        return response
+
+    def close(self):
+        """Close all pooled connections, the cache and the recorder."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def paces_with(client, limiter):
+    """
+    Check whether a client already waits for a limiter on every request.
+
+    A throttled client takes its limiter's token inside the concurrency
+    slot, so callers sharing that limiter must not take one beforehand.
+
+    Args:
+        client (HttpClient): Client about to be used
+        limiter (RateLimiter): The caller's politeness budget
+
+    Returns:
+        bool: True if client.get() waits for `limiter` itself
+    """
+    throttle = getattr(client, 'throttle', None)
+    return throttle is not None and throttle.limiter is limiter
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    Get the process-wide shared client, creating it on first use.
+
+    Returns:
+        HttpClient: Shared client configured from the environment
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            from modules.config_manager import get_http_config, get_cache_config
+            cache_config = get_cache_config()
+            cache = None
+            if cache_config['directory']:
+                from modules.http_cache import ResponseCache
+                cache = ResponseCache(cache_config['directory'], cache_config['max_mb'] * 1024 * 1024)
+            _default_client = HttpClient(cache=cache, **get_http_config())
+        return _default_client
+
+
+def set_default_client(client):
+    """
+    Replace the process-wide shared client.
+
+    Args:
+        client (HttpClient): Client to use when callers don't pass one
+    """
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
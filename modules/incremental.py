@@ -0,0 +1,125 @@
+"""
+Incremental Crawl Module for AutoGetCars Crawler
+Remembers extracted listings between runs so only new ones are fetched again
+"""
+
+import os
+import json
+import math
+import time
+import logging
+
+from modules.extractors import listing_id_from_url
+
+
+class SeenListings:
+    """
+    JSON-backed store of previously extracted listings, keyed by obiava ID.
+
+    Each entry keeps the last extracted record and when it was last fetched,
+    so re-checks can go to the listings that have waited longest.
+    """
+
+    def __init__(self, path, logger=None):
+        """
+        Args:
+            path (str): JSON state file, created on first save
+            logger (logging.Logger, optional): Logger instance
+        """
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self.listings = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.listings = json.load(f).get('listings', {})
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"⚠️ Could not read seen listings from {path}: {e}. Starting fresh.")
+
+    def __len__(self):
+        return len(self.listings)
+
+    def __contains__(self, listing_id):
+        return listing_id in self.listings
+
+    def plan(self, links, recheck_fraction=0.03):
+        """
+        Choose which of the current links need a detail page fetch.
+
+        New listing IDs are always fetched. On top of that, the known listings
+        checked longest ago are re-fetched, `recheck_fraction` of them per run,
+        so price changes are picked up over successive runs.
+
+        Args:
+            links (list): Listing URLs found by this run's search
+            recheck_fraction (float): Share of known listings to re-fetch
+
+        Returns:
+            list: Links to fetch, in their original order
+        """
+        known = []
+        to_fetch = set()
+        for link in links:
+            listing_id = listing_id_from_url(link)
+            if listing_id in self.listings:
+                known.append((self.listings[listing_id].get('checked_at', 0), link))
+            else:
+                to_fetch.add(link)
+
+        recheck_count = min(len(known), math.ceil(len(known) * max(recheck_fraction, 0)))
+        known.sort(key=lambda item: item[0])
+        to_fetch.update(link for _, link in known[:recheck_count])
+
+        self.logger.info("♻️ INCREMENTAL PLAN:")
+        self.logger.info(f"  🆕 New listings: {len(links) - len(known)}")
+        self.logger.info(f"  🔁 Re-checked listings: {recheck_count} of {len(known)} known")
+        return [link for link in links if link in to_fetch]
+
+    def merge(self, links, fetched):
+        """
+        Record freshly extracted listings and build the merged dataset.
+
+        Args:
+            links (list): Listing URLs found by this run's search
+            fetched (list): Car dictionaries extracted in this run
+
+        Returns:
+            list: One record per current listing, fresh where fetched and
+                remembered otherwise, in link order
+        """
+        now = time.time()
+        fresh = {}
+        for car in fetched:
+            listing_id = listing_id_from_url(car.get('Link'))
+            if listing_id:
+                fresh[listing_id] = car
+                self.listings[listing_id] = {'checked_at': now, 'record': car}
+
+        merged = []
+        included = set()
+        for link in links:
+            listing_id = listing_id_from_url(link)
+            if listing_id in included:
+                continue
+            if listing_id in fresh:
+                merged.append(fresh[listing_id])
+            elif listing_id in self.listings:
+                merged.append(self.listings[listing_id]['record'])
+            else:
+                continue
+            included.add(listing_id)
+
+        # Listings without an obiava ID can't be remembered; keep them as extracted
+        merged.extend(car for car in fetched if not listing_id_from_url(car.get('Link')))
+        return merged
+
+    def save(self):
+        """Write the store atomically so an interrupted save never corrupts it."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'listings': self.listings}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,274 @@
+"""
+Listing Store Module for AutoGetCars Crawler
+SQLite persistence for extracted listings with indexed, typed columns
+"""
+
+import os
+import time
+import sqlite3
+import logging
+
+from modules.extractors import listing_id_from_url
+from modules.field_parsers import parse_mileage_km, parse_power_hp, parse_production_date, parse_price
+from modules.price_history import PriceHistory
+from modules.output_sinks import OutputSink
+
+
+# (record key, column name) for the text fields stored as extracted
+TEXT_COLUMNS = [
+    ('Link', 'link'),
+    ('Brand', 'brand'),
+    ('Model', 'model'),
+    ('Production Date', 'production_date'),
+    ('Price', 'price_text'),
+    ('Engine', 'engine'),
+    ('Fuel Type', 'fuel_type'),
+    ('Transmission', 'transmission'),
+    ('Mileage', 'mileage'),
+    ('Color', 'color'),
+    ('Location', 'location'),
+    ('Phone', 'phone'),
+    ('Описание', 'description'),
+    ('Car Extras', 'extras'),
+]
+
+# Typed columns parsed from the text fields
+TYPED_COLUMNS = [
+    'price_eur', 'price_bgn', 'price_numeric', 'mileage_km', 'power_hp', 'production_year', 'production_month',
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS listings (
+    listing_id TEXT PRIMARY KEY,
+    {', '.join(f'{column} TEXT' for _, column in TEXT_COLUMNS)},
+    price_eur REAL,
+    price_bgn INTEGER,
+    price_numeric INTEGER,
+    mileage_km INTEGER,
+    power_hp INTEGER,
+    production_year INTEGER,
+    production_month INTEGER,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_listings_brand_model ON listings (brand, model);
+CREATE INDEX IF NOT EXISTS idx_listings_model ON listings (model);
+CREATE INDEX IF NOT EXISTS idx_listings_price_bgn ON listings (price_bgn);
+CREATE INDEX IF NOT EXISTS idx_listings_mileage_km ON listings (mileage_km);
+CREATE INDEX IF NOT EXISTS idx_listings_production_year ON listings (production_year);
+"""
+
+DATA_COLUMNS = [column for _, column in TEXT_COLUMNS] + TYPED_COLUMNS
+
+UPSERT_SQL = (
+    f"INSERT INTO listings (listing_id, {', '.join(DATA_COLUMNS)}, first_seen, last_seen) "
+    f"VALUES ({', '.join('?' * (len(DATA_COLUMNS) + 3))}) "
+    f"ON CONFLICT(listing_id) DO UPDATE SET "
+    f"{', '.join(f'{column} = excluded.{column}' for column in DATA_COLUMNS)}, last_seen = excluded.last_seen"
+)
+
+# SQLite limits the number of bound parameters per statement
+QUERY_CHUNK_SIZE = 500
+
+
+def listing_key(car):
+    """
+    Primary key for a car record: its obiava ID, or the link if it has none.
+
+    Args:
+        car (dict): Car data dictionary
+
+    Returns:
+        str: Listing key
+    """
+    link = car.get('Link') or ''
+    return listing_id_from_url(link) or link
+
+
+class ListingStore(OutputSink):
+    """
+    SQLite store of extracted listings, one row per obiava ID.
+
+    Records are buffered and written with executemany in batches, the
+    database runs in WAL mode, and brand, model, price, mileage and
+    production year are indexed for fast queries. Every freshly extracted
+    record also appends a price observation to `prices` (PriceHistory).
+    """
+
+    def __init__(self, path, batch_size=200, logger=None):
+        """
+        Args:
+            path (str): SQLite database file, created if missing
+            batch_size (int): Records buffered before each batched write
+            logger (logging.Logger, optional): Logger instance
+        """
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self.logger = logger or logging.getLogger(__name__)
+        self._pending = []
+        self._observations = []
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self.prices = PriceHistory(self.conn)
+
+    def _row(self, car, seen_at):
+        """Build the parameter tuple for one record."""
+        year, month = parse_production_date(car.get('Production Date'))
+        typed = [
+            parse_price(car.get('Price_EUR'), float),
+            parse_price(car.get('Price_BGN'), int),
+            parse_price(car.get('price_numeric'), int),
+            parse_mileage_km(car.get('Mileage')),
+            parse_power_hp(car.get('Engine')),
+            year,
+            month,
+        ]
+        text = [car.get(key, '') for key, _ in TEXT_COLUMNS]
+        return (listing_key(car), *text, *typed, seen_at, seen_at)
+
+    def add(self, car, record_price=True):
+        """
+        Queue one extracted record, writing the batch once it is full.
+
+        Args:
+            car (dict): Car data dictionary
+            record_price (bool): Append its price to the price history; pass
+                False for records that were not freshly fetched
+        """
+        if not car:
+            return
+        row = self._row(car, time.time())
+        self._pending.append(row)
+        if record_price:
+            listing_id, seen_at = row[0], row[-1]
+            self._observations.append((listing_id, seen_at, parse_price(car.get('Price_EUR'), float),
+                                       parse_price(car.get('Price_BGN'), int)))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, cars, record_price=True):
+        """
+        Queue several records.
+
+        Args:
+            cars (iterable): Car data dictionaries
+            record_price (bool): Append their prices to the price history
+        """
+        for car in cars:
+            self.add(car, record_price=record_price)
+
+    def flush(self):
+        """Write all queued records and price observations in one transaction."""
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany(UPSERT_SQL, self._pending)
+            self.prices.record(self._observations)
+        self.logger.debug(f"💾 Stored {len(self._pending)} listings in {self.path}")
+        self._pending = []
+        self._observations = []
+
+    @staticmethod
+    def _to_record(values):
+        """Turn a listings row back into an extractor-style car dictionary."""
+        car = {key: values[column] if values[column] is not None else '' for key, column in TEXT_COLUMNS}
+        car['Price_EUR'] = values['price_eur'] if values['price_eur'] is not None else ''
+        car['Price_BGN'] = values['price_bgn'] if values['price_bgn'] is not None else ''
+        if values['price_numeric'] is not None:
+            car['price_numeric'] = values['price_numeric']
+        return car
+
+    def _select(self, sql, params=()):
+        cursor = self.conn.execute(sql, params)
+        columns = [description[0] for description in cursor.description]
+        return [self._to_record(dict(zip(columns, row))) for row in cursor]
+
+    def records(self, listing_keys=None):
+        """
+        Read stored listings back as car dictionaries.
+
+        Args:
+            listing_keys (list, optional): Keys to read, in the wanted order; all listings if None
+
+        Returns:
+            list: Car dictionaries with the same fields the extractor returns
+        """
+        self.flush()
+        if listing_keys is None:
+            return self._select('SELECT * FROM listings ORDER BY rowid')
+
+        by_key = {}
+        keys = list(dict.fromkeys(listing_keys))
+        for start in range(0, len(keys), QUERY_CHUNK_SIZE):
+            chunk = keys[start:start + QUERY_CHUNK_SIZE]
+            sql = f"SELECT * FROM listings WHERE listing_id IN ({', '.join('?' * len(chunk))})"
+            for car in self._select(sql, chunk):
+                by_key[listing_key(car)] = car
+        return [by_key[key] for key in keys if key in by_key]
+
+    def query(self, brand=None, model=None, min_price=None, max_price=None, max_mileage=None,
+              min_year=None, max_year=None, order_by='price_bgn', limit=None):
+        """
+        Find listings by the indexed columns.
+
+        Args:
+            brand (str, optional): Exact brand
+            model (str, optional): Exact model
+            min_price (int, optional): Minimum Price_BGN
+            max_price (int, optional): Maximum Price_BGN
+            max_mileage (int, optional): Maximum mileage in km
+            min_year (int, optional): Earliest production year
+            max_year (int, optional): Latest production year
+            order_by (str): One of price_bgn, mileage_km, production_year, last_seen
+            limit (int, optional): Maximum number of listings
+
+        Returns:
+            list: Matching car dictionaries
+        """
+        if order_by not in ('price_bgn', 'mileage_km', 'production_year', 'last_seen'):
+            raise ValueError(f"Cannot order listings by {order_by}")
+
+        conditions, params = [], []
+        for clause, value in (
+            ('brand = ?', brand),
+            ('model = ?', model),
+            ('price_bgn >= ?', min_price),
+            ('price_bgn <= ?', max_price),
+            ('mileage_km <= ?', max_mileage),
+            ('production_year >= ?', min_year),
+            ('production_year <= ?', max_year),
+        ):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+
+        sql = 'SELECT * FROM listings'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += f' ORDER BY {order_by}'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+
+        self.flush()
+        return self._select(sql, params)
+
+    def count(self):
+        """
+        Returns:
+            int: Number of stored listings
+        """
+        self.flush()
+        return self.conn.execute('SELECT COUNT(*) FROM listings').fetchone()[0]
+
+    def close(self):
+        """Write pending records and close the database."""
+        self.flush()
+        self.conn.close()
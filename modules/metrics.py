@@ -0,0 +1,225 @@
+"""
+Metrics Module for AutoGetCars Crawler
+Per-stage timing and throughput histograms with a p50/p95/p99 run summary and JSON report
+"""
+
+import json
+import math
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+
+# Stages in report order; anything else observed is listed after them
+STAGES = [
+    ('rate_limit_wait', 'Rate limit wait'),
+    ('concurrency_wait', 'Concurrency wait'),
+    ('fetch', 'Fetch latency'),
+    ('response_bytes', 'Response size'),
+    ('retry_wait', 'Retry backoff'),
+    ('result_parse', 'Result page parse'),
+    ('parse', 'Listing tree build'),
+    ('fields', 'Field extraction'),
+    ('sink_write', 'Record sink write'),
+    ('export', 'Excel export'),
+]
+SIZE_STAGES = {'response_bytes'}
+FIELD_PREFIX = 'field.'
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class Histogram:
+    """
+    Samples of one stage, summarized as percentiles.
+
+    Every sample is kept, so percentiles are exact; a crawl observes a few
+    values per request, which stays small even for 100k listings.
+    """
+
+    def __init__(self):
+        self.values = []
+        self.total = 0.0
+
+    def add(self, value):
+        self.values.append(value)
+        self.total += value
+
+    def summary(self):
+        """
+        Returns:
+            dict: count, total, mean, p50, p95, p99 and max of the samples
+        """
+        ordered = sorted(self.values)
+        count = len(ordered)
+        return {
+            'count': count,
+            'total': self.total,
+            'mean': self.total / count if count else 0.0,
+            'p50': percentile(ordered, 50),
+            'p95': percentile(ordered, 95),
+            'p99': percentile(ordered, 99),
+            'max': ordered[-1] if count else 0.0,
+        }
+
+
+class CrawlMetrics:
+    """
+    Thread-safe collector of per-request and per-stage measurements.
+
+    Stages hold seconds (fetch latency, rate-limit and retry waits, parse,
+    field extraction, sink and export time) except `response_bytes`. Phase
+    wall times and counters (requests, HTTP statuses, listings) complete the
+    report, so it shows where the run's wall-clock time actually went.
+    """
+
+    def __init__(self, logger=None):
+        """
+        Args:
+            logger (logging.Logger, optional): Logger instance
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.started = time.monotonic()
+        self.histograms = {}
+        self.counters = {}
+        self.phases = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, value):
+        """
+        Add one sample to a stage.
+
+        Args:
+            stage (str): Stage name, e.g. 'fetch'
+            value (float): Seconds, or bytes for 'response_bytes'
+        """
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.add(value)
+
+    def count(self, name, amount=1):
+        """Increase a counter such as 'requests' or 'http_200'."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, stage):
+        """Observe the seconds spent inside the with block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def observe_response(self, status, latency, size):
+        """
+        Record one HTTP attempt.
+
+        Args:
+            status (int): HTTP status code
+            latency (float): Seconds from sending the request to having the body
+            size (int, optional): Body bytes, None when the body wasn't read
+        """
+        self.observe('fetch', latency)
+        if size is not None:
+            self.observe('response_bytes', size)
+            self.count('bytes', size)
+        self.count('requests')
+        self.count(f"http_{status}")
+
+    def observe_parse(self, timings):
+        """
+        Record the timings filled in by parse_car_info_mobile().
+
+        Args:
+            timings (dict): 'parse' plus seconds per field group
+        """
+        if not timings:
+            return
+        fields = {name: seconds for name, seconds in timings.items() if name != 'parse'}
+        if 'parse' in timings:
+            self.observe('parse', timings['parse'])
+        self.observe('fields', sum(fields.values()))
+        for name, seconds in fields.items():
+            self.observe(FIELD_PREFIX + name, seconds)
+
+    def set_phase(self, name, seconds):
+        """Record the wall time of a crawl phase, e.g. 'collect' or 'extract'."""
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def report(self):
+        """
+        Machine-readable view of everything recorded so far.
+
+        Returns:
+            dict: elapsed seconds, phases, counters, throughput and per-stage summaries
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            stages = {name: histogram.summary() for name, histogram in self.histograms.items()}
+            counters = dict(self.counters)
+            phases = dict(self.phases)
+
+        throughput = {
+            'requests_per_s': counters.get('requests', 0) / elapsed if elapsed else 0.0,
+            'bytes_per_s': counters.get('bytes', 0) / elapsed if elapsed else 0.0,
+            'listings_per_s': counters.get('listings', 0) / elapsed if elapsed else 0.0,
+        }
+        return {
+            'elapsed_seconds': elapsed,
+            'phases': phases,
+            'counters': counters,
+            'throughput': throughput,
+            'stages': stages,
+        }
+
+    def write_json(self, path):
+        """
+        Save report() as JSON.
+
+        Args:
+            path (str): Output file
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        self.logger.info(f"📐 Metrics report saved to {path}")
+
+    def log_summary(self):
+        """Log the phase times, throughput and a p50/p95/p99 line per stage."""
+        report = self.report()
+        stages = report['stages']
+        if not stages and not report['phases']:
+            return
+
+        counters = report['counters']
+        throughput = report['throughput']
+        self.logger.info("📐 RUN METRICS:")
+        self.logger.info(f"  ⏱️  Wall Time: {report['elapsed_seconds']:.1f} seconds")
+        for name, seconds in report['phases'].items():
+            self.logger.info(f"  ⏱️  {name.title()} Phase: {seconds:.1f} seconds")
+        self.logger.info(f"  ⚡ Throughput: {throughput['requests_per_s']:.1f} requests/s, "
+                         f"{throughput['bytes_per_s'] / 1024:.1f} KiB/s, {throughput['listings_per_s']:.1f} listings/s "
+                         f"({counters.get('requests', 0)} requests, {counters.get('bytes', 0) / 1024 / 1024:.1f} MiB)")
+
+        self.logger.info(f"  {'stage':<22} {'count':>7} {'p50':>10} {'p95':>10} {'p99':>10} {'total':>10}")
+        known = [name for name, _ in STAGES]
+        extra = [name for name in stages if name not in known]
+        for name in known + extra:
+            summary = stages.get(name)
+            if summary is None:
+                continue
+            if name in SIZE_STAGES:
+                values = [f"{summary[key] / 1024:.1f}KiB" for key in ('p50', 'p95', 'p99', 'total')]
+            else:
+                values = [f"{summary[key] * 1000:.1f}ms" for key in ('p50', 'p95', 'p99')] + [f"{summary['total']:.1f}s"]
+            label = dict(STAGES).get(name, name)
+            self.logger.info(f"  {label:<22} {summary['count']:>7} " + ' '.join(f"{value:>10}" for value in values))
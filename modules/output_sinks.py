@@ -0,0 +1,134 @@
+"""
+Output Sinks Module for AutoGetCars Crawler
+Append-only record sinks that make each extracted listing durable immediately
+"""
+
+import os
+import csv
+import json
+
+
+class OutputSink:
+    """
+    Destination for extracted car records, fed one record at a time.
+
+    Subclasses implement add() and close(). ListingStore and ParquetExporter
+    follow the same interface, so the crawler treats all of them alike.
+    """
+
+    # True for sinks that replace their output on every run instead of adding
+    # to it; a resumed crawl feeds them the interrupted run's records again
+    rewrites_output = False
+
+    def add(self, car):
+        """
+        Write one car record.
+
+        Args:
+            car (dict): Car data dictionary
+        """
+        raise NotImplementedError
+
+    def add_many(self, cars):
+        """
+        Write several records.
+
+        Args:
+            cars (iterable): Car data dictionaries
+        """
+        for car in cars:
+            self.add(car)
+
+    def close(self):
+        """Release the sink's resources."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _FileSink(OutputSink):
+    """Append-only text file that is flushed, and optionally fsynced, after every record."""
+
+    def __init__(self, path, fsync=True):
+        """
+        Args:
+            path (str): Output file, appended to if it exists
+            fsync (bool): Force each record to disk, not just to the OS cache
+        """
+        self.path = path
+        self.fsync = fsync
+        self.count = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8', newline='')
+
+    def _sync(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlSink(_FileSink):
+    """One JSON object per line, with all fields the extractor returns."""
+
+    def add(self, car):
+        self._file.write(json.dumps(car, ensure_ascii=False) + '\n')
+        self._sync()
+
+
+class CsvSink(_FileSink):
+    """CSV with the Excel export columns; the header is written when the file is new."""
+
+    def __init__(self, path, headers=None, fsync=True):
+        """
+        Args:
+            path (str): Output file, appended to if it exists
+            headers (list, optional): Columns to write, defaults to excel_utils.EXCEL_HEADERS
+            fsync (bool): Force each record to disk, not just to the OS cache
+        """
+        if headers is None:
+            from modules.excel_utils import EXCEL_HEADERS
+            headers = EXCEL_HEADERS
+
+        super().__init__(path, fsync=fsync)
+        self.headers = list(headers)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.headers, extrasaction='ignore')
+        if self._file.tell() == 0:
+            self._writer.writeheader()
+            self._file.flush()
+
+    def add(self, car):
+        self._writer.writerow({header: car.get(header, '') for header in self.headers})
+        self._sync()
+
+
+SINK_TYPES = {
+    '.jsonl': JsonlSink,
+    '.csv': CsvSink,
+}
+
+
+def open_sink(path, fsync=True):
+    """
+    Open the sink matching a file extension.
+
+    Args:
+        path (str): Output file ending in .jsonl or .csv
+        fsync (bool): Force each record to disk
+
+    Returns:
+        OutputSink: The opened sink
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINK_TYPES:
+        raise ValueError(f"Unsupported sink file type '{extension}' (use {', '.join(SINK_TYPES)})")
+    return SINK_TYPES[extension](path, fsync=fsync)
@@ -0,0 +1,133 @@
+"""
+Parquet Export Module for AutoGetCars Crawler
+Columnar export with typed columns, written in row groups during the crawl
+"""
+
+import os
+import datetime
+
+from modules.field_parsers import parse_mileage_km, parse_power_hp, parse_production_date, parse_price
+from modules.output_sinks import OutputSink
+
+
+ROWS_PER_GROUP = 1000
+
+
+def _production_date(value):
+    """Production date as a date on the first of its month (January if only the year is known)."""
+    year, month = parse_production_date(value)
+    return datetime.date(year, month or 1, 1) if year else None
+
+
+def _text(value):
+    return str(value) if value not in (None, '') else None
+
+
+# Converters for the Excel header columns; anything not listed is kept as text
+COLUMN_CONVERTERS = {
+    'Production Date': _production_date,
+    'Price_EUR': lambda value: parse_price(value, float),
+    'Price_BGN': lambda value: parse_price(value, int),
+    'Engine': parse_power_hp,
+    'Mileage': parse_mileage_km,
+}
+
+
+def build_schema(headers):
+    """
+    Arrow schema for the export columns.
+
+    Args:
+        headers (list): Column headers, e.g. excel_utils.EXCEL_HEADERS
+
+    Returns:
+        pyarrow.Schema: Typed schema; Engine holds horsepower and Mileage kilometres
+    """
+    import pyarrow as pa
+
+    types = {
+        'Production Date': pa.date32(),
+        'Price_EUR': pa.float64(),
+        'Price_BGN': pa.int64(),
+        'Engine': pa.int32(),
+        'Mileage': pa.int64(),
+    }
+    return pa.schema([pa.field(header, types.get(header, pa.string())) for header in headers])
+
+
+class ParquetExporter(OutputSink):
+    """
+    Write car records to a Parquet file one row group at a time.
+
+    Records are converted to typed columns as they arrive and flushed every
+    `rows_per_group` records, so memory stays bounded on large runs. The file
+    is written next to the target and moved into place on close.
+    """
+
+    rewrites_output = True
+
+    def __init__(self, path, headers=None, rows_per_group=ROWS_PER_GROUP, compression='snappy'):
+        """
+        Args:
+            path (str): Output .parquet file
+            headers (list, optional): Columns to write, defaults to excel_utils.EXCEL_HEADERS
+            rows_per_group (int): Records per row group
+            compression (str): Parquet compression codec
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow: pip install pyarrow")
+
+        if headers is None:
+            from modules.excel_utils import EXCEL_HEADERS
+            headers = EXCEL_HEADERS
+
+        self._pa = pa
+        self.path = path
+        self.headers = list(headers)
+        self.rows_per_group = max(1, int(rows_per_group))
+        self.schema = build_schema(self.headers)
+        self.row_count = 0
+        self._columns = {header: [] for header in self.headers}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._tmp_path = f"{path}.tmp"
+        self._writer = pq.ParquetWriter(self._tmp_path, self.schema, compression=compression)
+
+    def add(self, car):
+        """
+        Queue one record, writing a row group once enough have arrived.
+
+        Args:
+            car (dict): Car data dictionary
+        """
+        for header in self.headers:
+            convert = COLUMN_CONVERTERS.get(header, _text)
+            self._columns[header].append(convert(car.get(header, '')))
+        self.row_count += 1
+        if len(self._columns[self.headers[0]]) >= self.rows_per_group:
+            self.flush()
+
+    def flush(self):
+        """Write the queued records as one row group."""
+        if not self._columns[self.headers[0]]:
+            return
+        table = self._pa.Table.from_pydict(self._columns, schema=self.schema)
+        self._writer.write_table(table)
+        self._columns = {header: [] for header in self.headers}
+
+    def close(self):
+        """
+        Write the last row group and move the file into place.
+
+        Returns:
+            str: Path to the Parquet file
+        """
+        self.flush()
+        self._writer.close()
+        os.replace(self._tmp_path, self.path)
+        return self.path
@@ -0,0 +1,124 @@
+"""
+Price History Module for AutoGetCars Crawler
+Append-only price observations per listing with fast price-drop queries
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS price_history (
+    listing_id TEXT NOT NULL,
+    observed_at REAL NOT NULL,
+    price_eur REAL,
+    price_bgn INTEGER,
+    PRIMARY KEY (listing_id, observed_at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS latest_prices (
+    listing_id TEXT PRIMARY KEY,
+    observed_at REAL NOT NULL,
+    price_eur REAL,
+    price_bgn INTEGER,
+    previous_observed_at REAL,
+    previous_price_eur REAL,
+    previous_price_bgn INTEGER
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_latest_prices_observed_at ON latest_prices (observed_at);
+"""
+
+INSERT_SQL = 'INSERT OR IGNORE INTO price_history (listing_id, observed_at, price_eur, price_bgn) VALUES (?, ?, ?, ?)'
+
+# Each observation shifts the latest price into the previous_* columns
+LATEST_SQL = """
+INSERT INTO latest_prices (listing_id, observed_at, price_eur, price_bgn) VALUES (?, ?, ?, ?)
+ON CONFLICT(listing_id) DO UPDATE SET
+    previous_observed_at = latest_prices.observed_at,
+    previous_price_eur = latest_prices.price_eur,
+    previous_price_bgn = latest_prices.price_bgn,
+    observed_at = excluded.observed_at,
+    price_eur = excluded.price_eur,
+    price_bgn = excluded.price_bgn
+WHERE excluded.observed_at > latest_prices.observed_at
+"""
+
+
+class PriceHistory:
+    """
+    Price observations stored next to the listings in the same SQLite file.
+
+    `price_history` is append-only, one row per listing per observation.
+    `latest_prices` keeps the last two observations of every listing, so
+    drop queries read one row per listing instead of the whole history.
+    """
+
+    def __init__(self, conn):
+        """
+        Args:
+            conn (sqlite3.Connection): Open database connection, e.g. ListingStore.conn
+        """
+        self.conn = conn
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def record(self, observations):
+        """
+        Append price observations. Call inside the caller's transaction.
+
+        Args:
+            observations (list): (listing_id, observed_at, price_eur, price_bgn) tuples;
+                observations without any price are skipped
+        """
+        observations = [obs for obs in observations if obs[2] is not None or obs[3] is not None]
+        if observations:
+            self.conn.executemany(INSERT_SQL, observations)
+            self.conn.executemany(LATEST_SQL, observations)
+
+    def history(self, listing_id):
+        """
+        All observations of one listing, oldest first.
+
+        Args:
+            listing_id (str): Obiava ID
+
+        Returns:
+            list: (observed_at, price_eur, price_bgn) tuples
+        """
+        return self.conn.execute(
+            'SELECT observed_at, price_eur, price_bgn FROM price_history WHERE listing_id = ? ORDER BY observed_at',
+            (listing_id,)
+        ).fetchall()
+
+    def price_drops(self, min_drop_pct=5.0, since=None):
+        """
+        Listings whose BGN price fell by more than `min_drop_pct` percent
+        between their previous and latest observation.
+
+        Args:
+            min_drop_pct (float): Minimum drop in percent
+            since (float, optional): Only listings observed at or after this
+                timestamp, e.g. the start of the current run
+
+        Returns:
+            list: Dicts with listing_id, previous and current prices, drop_pct and
+                observed_at, largest drop first
+        """
+        sql = (
+            'SELECT listing_id, previous_price_bgn, price_bgn, previous_observed_at, observed_at '
+            'FROM latest_prices '
+            'WHERE previous_price_bgn > 0 AND price_bgn IS NOT NULL '
+            'AND price_bgn < previous_price_bgn * (1 - ? / 100.0)'
+        )
+        params = [float(min_drop_pct)]
+        if since is not None:
+            sql += ' AND observed_at >= ?'
+            params.append(since)
+        sql += ' ORDER BY (previous_price_bgn - price_bgn) * 1.0 / previous_price_bgn DESC'
+
+        drops = []
+        for listing_id, previous, current, previous_at, observed_at in self.conn.execute(sql, params):
+            drops.append({
+                'listing_id': listing_id,
+                'previous_price_bgn': previous,
+                'price_bgn': current,
+                'drop_pct': round((previous - current) / previous * 100, 1),
+                'previous_observed_at': previous_at,
+                'observed_at': observed_at,
+            })
+        return drops
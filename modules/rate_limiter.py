@@ -0,0 +1,220 @@
+"""
+Rate Limiter Module for AutoGetCars Crawler
+Shared token-bucket politeness budget for concurrent requests, kept per host
+"""
+
+import time
+import threading
+from urllib.parse import urlsplit
+
+
+def resolve_rate(delay=0.5, rate=None):
+    """
+    Requests per second for a limiter configured by delay or by rate.
+
+    Args:
+        delay (float): Legacy minimum interval between requests in seconds
+        rate (float, optional): Requests per second; takes precedence over delay
+
+    Returns:
+        float: Requests per second, 0 meaning unlimited
+    """
+    if rate is not None:
+        return max(float(rate), 0.0)
+    delay = max(float(delay or 0), 0.0)
+    return 1.0 / delay if delay > 0 else 0.0
+
+
+def url_host(url):
+    """Lower-case host of a URL, or '' when there is none."""
+    return urlsplit(url).netloc.lower() if url else ''
+
+
+def parse_host_rate(spec):
+    """
+    Parse a per-host budget written as HOST=RATE or HOST=RATE:BURST.
+
+    Args:
+        spec (str): e.g. "www.mobile.bg=2:5"
+
+    Returns:
+        tuple: (host, (rate, burst))
+    """
+    host, sep, budget = spec.partition('=')
+    rate, _, burst = budget.partition(':')
+    if not sep or not host:
+        raise ValueError(f"Invalid host rate '{spec}', expected HOST=RATE[:BURST]")
+    return host.strip().lower(), (float(rate), int(burst or 1))
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second up to `burst` tokens.
+
+    A caller takes one token per request. When the bucket is empty the token
+    is reserved ahead of time (the count goes negative), so waiting callers
+    are served in arrival order. The bucket refills while requests are in
+    flight, so time spent on network latency counts toward the budget.
+    defer() sets a deadline before which no request may start; it bumps
+    `deferrals` so callers already asleep on a reservation can tell they
+    have to queue again. Not thread-safe; the limiters below serialise access.
+    """
+
+    def __init__(self, rate, burst=1):
+        """
+        Args:
+            rate (float): Tokens added per second, 0 for no limit
+            burst (int): Bucket capacity, i.e. requests allowed back to back
+        """
+        self.base_rate = self.rate = max(float(rate), 0.0)
+        self.burst = max(float(burst or 1), 1.0)
+        self.tokens = self.burst
+        self.updated = None
+        self.not_before = 0.0
+        self.deferrals = 0
+
+    def reserve(self, now):
+        """
+        Take one token.
+
+        Args:
+            now (float): Current monotonic time in seconds
+
+        Returns:
+            float: Seconds the caller must wait before its request may start
+        """
+        hold = max(self.not_before - now, 0.0)
+        if self.rate <= 0:
+            return hold
+        self.refill(now)
+        self.tokens -= 1
+        return max(-self.tokens / self.rate if self.tokens < 0 else 0.0, hold)
+
+    def defer(self, now, seconds):
+        """
+        Start no request earlier than `seconds` from now.
+
+        Tokens reserved before the call no longer count: their callers queue
+        again behind the deadline, so the rate applies from there on.
+        """
+        self.not_before = max(self.not_before, now + seconds)
+        self.deferrals += 1
+        if self.rate > 0:
+            self.refill(now)
+            self.tokens = 1 - (self.not_before - now) * self.rate
+
+    def refill(self, now):
+        """Add the tokens earned since the last update."""
+        if self.updated is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class HostBuckets:
+    """
+    One TokenBucket per host, with optional per-host rate and burst overrides.
+
+    `scale` multiplies every host's configured rate; the adaptive throttle
+    lowers it while the site pushes back.
+    """
+
+    def __init__(self, delay=0.5, rate=None, burst=1, host_rates=None):
+        self.rate = resolve_rate(delay, rate)
+        self.burst = burst
+        self.host_rates = {host.lower(): value for host, value in (host_rates or {}).items()}
+        self.scale = 1.0
+        self._buckets = {}
+
+    def bucket(self, url):
+        host = url_host(url)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.host_rates.get(host, (self.rate, self.burst))
+            bucket = self._buckets[host] = TokenBucket(rate, burst)
+            bucket.rate = bucket.base_rate * self.scale
+        return bucket
+
+    def set_scale(self, scale, now):
+        self.scale = scale
+        for bucket in self._buckets.values():
+            bucket.refill(now)
+            bucket.rate = bucket.base_rate * scale
+
+
+class RateLimiter:
+    """
+    Thread-safe token-bucket limiter shared by every fetch.
+
+    Each host gets its own bucket, so the request rate to one site never
+    exceeds `rate` per second (after an initial burst of `burst` requests)
+    no matter how many workers share the limiter.
+    """
+
+    def __init__(self, delay=0.5, rate=None, burst=1, host_rates=None, metrics=None):
+        """
+        Args:
+            delay (float): Minimum interval between request starts, used when rate is None
+            rate (float, optional): Requests per second per host
+            burst (int): Requests a host may receive back to back after an idle period
+            host_rates (dict, optional): {host: (rate, burst)} overrides for specific hosts
+            metrics (CrawlMetrics, optional): Records every wait as 'rate_limit_wait'
+        """
+        self._hosts = HostBuckets(delay, rate, burst, host_rates)
+        self.rate = self._hosts.rate
+        self.burst = burst
+        self.metrics = metrics
+        self._lock = threading.Lock()
+
+    def wait(self, url=None):
+        """
+        Block until the caller is allowed to start its request.
+
+        Args:
+            url (str, optional): URL about to be fetched; selects the host budget
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            # Reserve the token under the lock, then sleep outside it
+            with self._lock:
+                bucket = self._hosts.bucket(url)
+                deferrals = bucket.deferrals
+                wait_time = bucket.reserve(time.monotonic())
+            if wait_time <= 0:
+                break
+            time.sleep(wait_time)
+            waited += wait_time
+            # A Retry-After that arrived during the sleep voids the reservation
+            with self._lock:
+                if bucket.deferrals == deferrals:
+                    break
+
+        if self.metrics is not None:
+            self.metrics.observe('rate_limit_wait', waited)
+        return waited
+
+    def set_scale(self, scale):
+        """
+        Run every host at a fraction of its configured rate.
+
+        Args:
+            scale (float): Multiplier for the configured rates, 1.0 restores them
+        """
+        with self._lock:
+            self._hosts.set_scale(scale, time.monotonic())
+
+    def defer(self, url, seconds):
+        """
+        Hold back the requests to a host, e.g. for a Retry-After header.
+
+        Callers already sleeping in wait() re-check the host when they wake
+        and queue again behind the deadline.
+
+        Args:
+            url (str): URL on the host to pause
+            seconds (float): Seconds before the host's next request may start
+        """
+        with self._lock:
+            self._hosts.bucket(url).defer(time.monotonic(), seconds)
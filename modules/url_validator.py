@@ -6,26 +6,29 @@ Validates mobile.bg search URLs before crawling
 import requests
 import logging
 
+from modules.http_client import get_default_client
 
-def validate_search_url(url, logger=None):
+
+def validate_search_url(url, logger=None, client=None):
     """
     Validate that the search URL exists and returns valid content.
     
     Args:
         url (str): The URL to validate
         logger (logging.Logger, optional): Logger instance for output
+        client (HttpClient, optional): Shared HTTP client, defaults to the process-wide one
         
     Returns:
         bool: True if URL is valid, False otherwise
     """
     if logger is None:
         logger = logging.getLogger(__name__)
+    if client is None:
+        client = get_default_client()
     
     try:
         logger.info(f"🔍 Validating search URL...")
-        response = requests.get(url, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        response = client.get(url, timeout=10)
         
         if response.status_code == 404:
             logger.error(f"❌ URL returns 404 - Invalid brand/model/vehicle type combination")
@@ -3,169 +3,472 @@ Web Scraper Module for AutoGetCars Crawler
 Handles web scraping and data extraction from mobile.bg
 """
 
+import re
 import time
 import math
 import logging
 import requests
-from bs4 import BeautifulSoup
+from urllib.parse import urlsplit
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 
+from modules.http_client import get_default_client, paces_with
+from modules.html_parser import get_parser_engine, make_soup, make_selectolax_tree
 
-def get_all_listing_links(search_url, delay=1.0, max_pages=100, logger=None):
+try:
+    from bs4.filter import ElementFilter
+except ImportError:  # beautifulsoup4 < 4.13 parses result pages in full
+    ElementFilter = None
+from modules.rate_limiter import RateLimiter
+
+
+RESULTS_PER_PAGE = 20
+# Extra attempts for a throttled or failed result page before pagination stops
+PAGE_RETRIES = 3
+NEXT_PAGE_KEYWORDS = ['next', 'напред', '>', '»', 'следваща']
+
+# "от общо N" counter in the raw page bytes; tags may sit between the words and the number
+RESULT_COUNTER_PATTERNS = [
+    re.compile(r'от\s+общо\s*(?:<[^>]*>\s*)*(\d+)'.encode(encoding))
+    for encoding in ('utf-8', 'cp1251')
+]
+
+# Page number markers seen in mobile.bg pagination links, e.g. ".../p-2?price=..."
+PAGE_NUMBER_PATTERNS = [
+    re.compile(r'(/p-)(\d+)(?=[/?#]|$)'),
+    re.compile(r'([?&](?:page|p)=)(\d+)(?=[&#]|$)'),
+]
+
+
+# Origin for relative links when the page URL isn't known
+DEFAULT_ORIGIN = 'https://www.mobile.bg'
+
+
+def _absolute_url(href, base_url=None):
     """
-    Crawl all result pages and collect car listing links.
-    
+    Properly format a mobile.bg href as an absolute URL.
+
+    Relative links resolve against the origin of the page they were found
+    on, so a replayed or mirrored site keeps its links on the same host.
+
+    Args:
+        href (str): Link href as found in the page
+        base_url (str, optional): URL of the page, defaults to https://www.mobile.bg
+
+    Returns:
+        str: Absolute URL
+    """
+    parts = urlsplit(base_url or DEFAULT_ORIGIN)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    if href.startswith('http'):
+        return href
+    elif href.startswith('//'):
+        return f"{parts.scheme}:{href}"
+    elif href.startswith('/'):
+        return origin + href
+    else:
+        return f"{origin}/{href}"
+
+
+if ElementFilter is not None:
+    class ResultPageFilter(ElementFilter):
+        """
+        Build only the parts of a result page that get_all_listing_links reads:
+        /obiava- anchors and the div.pagination block (with everything inside it).
+        """
+
+        def allow_tag_creation(self, nsprefix, name, attrs):
+            if name == 'a':
+                return '/obiava-' in (attrs.get('href') or '')
+            if name == 'div':
+                classes = attrs.get('class') or ''
+                if not isinstance(classes, str):
+                    classes = ' '.join(classes)
+                return 'pagination' in classes.split()
+            return False
+
+        def allow_string_creation(self, string):
+            # Only consulted for text outside the kept elements
+            return False
+
+
+def _scan_total_results(content):
+    """
+    Find the "от общо N" counter with a regex over the raw page bytes.
+
+    Args:
+        content (bytes or str): Raw HTML of the result page
+
+    Returns:
+        int or None: Total number of results, if found
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    for pattern in RESULT_COUNTER_PATTERNS:
+        match = pattern.search(content)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _extract_total_results(soup):
+    """
+    Extract the total result count from the "1 - 20 от общо 38" counter.
+
+    Args:
+        soup (BeautifulSoup): Parsed search result page
+
+    Returns:
+        int or None: Total number of results, if found
+    """
+    # Look for results info in div with inline styles or any div containing results pattern
+    result_info = None
+
+    # Try finding div with results pattern
+    all_divs = soup.find_all('div')
+    for div in all_divs:
+        div_text = div.get_text().strip()
+        if re.search(r'\d+.*от.*общо.*\d+', div_text):
+            result_info = div
+            break
+
+    if result_info:
+        result_text = result_info.get_text()
+        # Extract total from pattern like "1 - 20 от общо 38"
+        match = re.search(r'от общо (\d+)', result_text)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _is_next_link(link_text, classes):
+    """Check for Bulgarian "Напред" (Next) or other next indicators."""
+    return any(keyword in link_text for keyword in NEXT_PAGE_KEYWORDS) or 'next' in classes
+
+
+def _parse_result_page_selectolax(content, find_total=False, base_url=None):
+    """
+    selectolax fast path for parse_result_page().
+
+    Only the anchors, the pagination block and the result counter are read,
+    using CSS selectors on the lexbor tree.
+    """
+    tree = make_selectolax_tree(content)
+
+    total_results = _scan_total_results(content) if find_total else None
+    if find_total and total_results is None:
+        for div in tree.css('div'):
+            div_text = div.text().strip()
+            if re.search(r'\d+.*от.*общо.*\d+', div_text):
+                match = re.search(r'от общо (\d+)', div.text())
+                if match:
+                    total_results = int(match.group(1))
+                break
+
+    page_links = []
+    seen = set()
+    for link in tree.css('a[href*="/obiava-"]'):
+        full_url = _absolute_url(link.attributes.get('href') or '', base_url)
+        if full_url not in seen:
+            seen.add(full_url)
+            page_links.append(full_url)
+
+    next_link = None
+    pagination = tree.css_first('div.pagination')
+    if pagination is not None:
+        for link in pagination.css('a[href]'):
+            classes = (link.attributes.get('class') or '').split()
+            next_href = link.attributes.get('href')
+            if _is_next_link(link.text().strip().lower(), classes) and next_href:
+                next_link = _absolute_url(next_href, base_url)
+                break
+
+    return page_links, next_link, total_results
+
+
+def parse_result_page(content, find_total=False, parser=None, base_url=None):
+    """
+    Parse a search result page.
+
+    The result counter is read with a regex over the raw bytes, and only the
+    listing anchors and the pagination block are built into a tree. A full
+    parse is used only if the counter can't be found that way.
+
+    Args:
+        content (bytes): Raw HTML of the result page
+        find_total (bool): Whether to look for the "от общо N" counter
+        parser (str, optional): Parser engine; defaults to PARSER_ENGINE from .env
+        base_url (str, optional): URL the page was fetched from, for resolving relative links
+
+    Returns:
+        tuple: (listing URLs in page order, next page URL or None, total results or None)
+    """
+    parser = get_parser_engine(parser)
+    if parser == 'selectolax':
+        return _parse_result_page_selectolax(content, find_total=find_total, base_url=base_url)
+
+    total_results = _scan_total_results(content) if find_total else None
+
+    if find_total and total_results is None:
+        soup = make_soup(content, parser)
+        try:
+            total_results = _extract_total_results(soup)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Could not extract total results: {e}")
+    else:
+        soup = make_soup(content, parser, parse_only=ResultPageFilter() if ElementFilter else None)
+
+    # Find car listing links
+    page_links = []
+    seen = set()
+    for link in soup.find_all('a', href=True):
+        href = link.get('href')
+        if href and '/obiava-' in href:
+            full_url = _absolute_url(href, base_url)
+            if full_url not in seen:
+                seen.add(full_url)
+                page_links.append(full_url)
+
+    # Find next page link
+    next_link = None
+    pagination = soup.find('div', class_='pagination')
+    if pagination:
+        for link in pagination.find_all('a', href=True):
+            link_text = link.get_text().strip().lower()
+            if _is_next_link(link_text, link.get('class', [])):
+                next_href = link.get('href')
+                if next_href:
+                    next_link = _absolute_url(next_href, base_url)
+                    break
+
+    return page_links, next_link, total_results
+
+
+def infer_page_url_template(next_link, page_num=2):
+    """
+    Infer how result page URLs are numbered from a known next-page link.
+
+    Args:
+        next_link (str): URL of page `page_num`
+        page_num (int): Page number that `next_link` points to
+
+    Returns:
+        callable or None: Function mapping a page number to its URL, or None
+        if the page number can't be located in the URL
+    """
+    if not next_link:
+        return None
+
+    for pattern in PAGE_NUMBER_PATTERNS:
+        match = pattern.search(next_link)
+        if match and int(match.group(2)) == page_num:
+            prefix = next_link[:match.start(2)]
+            suffix = next_link[match.end(2):]
+            return lambda n: f"{prefix}{n}{suffix}"
+    return None
+
+
+def _fetch_result_page(client, url, page_num, limiter, logger, metrics=None):
+    """
+    Fetch and parse one result page for the concurrent pagination path.
+
+    Returns:
+        list or None: Listing URLs on the page, or None if the fetch failed
+    """
+    if not paces_with(client, limiter):
+        limiter.wait(url)
+    logger.info(f"📡 Fetching Page {page_num}: {url}")
+    try:
+        response = client.get(url, timeout=30, retries=PAGE_RETRIES)
+        if response.status_code != 200:
+            logger.error(f"❌ Failed to fetch page {page_num}: HTTP {response.status_code}")
+            return None
+        with metrics.timer('result_parse') if metrics is not None else nullcontext():
+            page_links, _, _ = parse_result_page(response.content, base_url=url)
+        return page_links
+    except requests.exceptions.RequestException as e:
+        logger.error(f"❌ Network error on page {page_num}: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"❌ Error processing page {page_num}: {e}")
+        return None
+
+
+def iter_listing_links(search_url, delay=1.0, max_pages=100, logger=None, client=None, workers=1, limiter=None,
+                       start_url=None, start_page=1, seen_links=None, on_page=None, metrics=None):
+    """
+    Crawl result pages and yield each new car listing link as soon as its page is parsed.
+
+    With more than one worker, once page 1 reports the total result count and
+    the page URL pattern can be inferred from its next link, pages 2..N are
+    fetched concurrently within the politeness budget. Otherwise the "Напред"
+    links are followed one page at a time.
+
     Args:
         search_url (str): The initial search URL
         delay (float): Delay between requests in seconds
         max_pages (int): Maximum number of pages to crawl
         logger (logging.Logger, optional): Logger instance
-        
-    Returns:
-        set: Set of unique car listing URLs
+        client (HttpClient, optional): Shared HTTP client, defaults to the process-wide one
+        workers (int): Concurrent page fetches once the page count is known
+        limiter (RateLimiter, optional): Politeness budget shared with other stages
+        start_url (str, optional): Result page to start from when resuming, defaults to search_url
+        start_page (int): Page number of start_url
+        seen_links (iterable, optional): Links found before resuming; they are not yielded again
+        on_page (callable, optional): Called as on_page(page_num, next_url) after each page's
+            links have been yielded; next_url is None once pagination is finished. Pages
+            after a failed page aren't reported, so a resume fetches the failed one again
+        metrics (CrawlMetrics, optional): Records result page parse times
+
+    Yields:
+        str: Unique car listing URLs in the order they were found
     """
     if logger is None:
         logger = logging.getLogger(__name__)
-    
-    links = set()
+    if client is None:
+        client = get_default_client()
+    if limiter is None:
+        limiter = RateLimiter(delay)
+
+    links = set(seen_links or ())
     total_results = None
-    url = search_url
-    page_num = 1
+    url = start_url or search_url
+    page_num = start_page
     start_time = time.time()
-    
+
+    def page_done(page_num, next_url):
+        if on_page is not None:
+            on_page(page_num, next_url)
+
+    def add_page_links(page_num, page_links):
+        new_links = [link for link in page_links if link not in links]
+        links.update(new_links)
+        if page_links:
+            progress = (len(links) / total_results * 100) if total_results else 0
+            logger.info(f"  📄 Page {page_num}: Found {len(page_links)} links, {len(new_links)} new ({progress:.1f}% complete)")
+        else:
+            logger.warning(f"  📄 Page {page_num}: No car links found")
+        return new_links
+
     logger.info(f"🔗 Search URL: {search_url}")
-    
+
     while True:
         try:
+            # Wait for the host's request budget, unless the client's throttle does
+            if not paces_with(client, limiter):
+                limiter.wait(url)
             logger.info(f"📡 Fetching Page {page_num}: {url}")
-            
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, headers=headers, timeout=30)
-            
+
+            response = client.get(url, timeout=30, retries=PAGE_RETRIES)
+
             if response.status_code == 404:
                 logger.error(f"❌ Failed to fetch page {page_num}: HTTP 404")
                 break
             elif response.status_code != 200:
                 logger.error(f"❌ Failed to fetch page {page_num}: HTTP {response.status_code}")
                 break
-                
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
+
+            with metrics.timer('result_parse') if metrics is not None else nullcontext():
+                page_links, next_link, page_total = parse_result_page(response.content, find_total=(page_num == 1),
+                                                                      base_url=url)
+
             # Extract total results on first page
-            if page_num == 1:
-                try:
-                    # Look for results info in div with inline styles or any div containing results pattern
-                    result_info = None
-                    
-                    # Try finding div with results pattern
-                    import re
-                    all_divs = soup.find_all('div')
-                    for div in all_divs:
-                        div_text = div.get_text().strip()
-                        if re.search(r'\d+.*от.*общо.*\d+', div_text):
-                            result_info = div
-                            break
-                    
-                    if result_info:
-                        result_text = result_info.get_text()
-                        # Extract total from pattern like "1 - 20 от общо 38"
-                        match = re.search(r'от общо (\d+)', result_text)
-                        if match:
-                            total_results = int(match.group(1))
-                            estimated_pages = math.ceil(total_results / 20)
-                            estimated_time = estimated_pages * delay
-                            
-                            logger.info("📊 SEARCH RESULTS SUMMARY:")
-                            logger.info(f" 🎯 Total Results Found: {total_results} cars")
-                            logger.info(f" 📄 Estimated Pages: {estimated_pages} pages (~20 cars per page)")
-                            logger.info(f" ⏱️  Estimated Crawl Time: ~{estimated_time:.1f} seconds")
-                except Exception as e:
-                    logger.warning(f"Could not extract total results: {e}")
-            
-            # Find car listing links
-            car_links = soup.find_all('a', href=True)
-            page_links = set()
-            
-            for link in car_links:
-                href = link.get('href')
-                if href and '/obiava-' in href:
-                    # Properly format the URL
-                    if href.startswith('http'):
-                        full_url = href
-                    elif href.startswith('//'):
-                        full_url = 'https:' + href
-                    elif href.startswith('/'):
-                        full_url = 'https://www.mobile.bg' + href
-                    else:
-                        full_url = 'https://www.mobile.bg/' + href
-                    
-                    if full_url not in links:
-                        page_links.add(full_url)
-                        links.add(full_url)
-            
-            if page_links:
-                progress = (len(links) / total_results * 100) if total_results else 0
-                logger.info(f"  📄 Page {page_num}: Found {len(page_links)} links, {len(page_links)} new ({progress:.1f}% complete)")
-            else:
-                logger.warning(f"  📄 Page {page_num}: No car links found")
-            
-            # Find next page link
-            next_link = None
-            pagination = soup.find('div', class_='pagination')
-            if pagination:
-                next_links = pagination.find_all('a', href=True)
-                for link in next_links:
-                    link_text = link.get_text().strip().lower()
-                    # Check for Bulgarian "Напред" (Next) or other next indicators
-                    if any(keyword in link_text for keyword in ['next', 'напред', '>', '»', 'следваща']) or 'next' in link.get('class', []):
-                        next_href = link.get('href')
-                        if next_href:
-                            # Properly format next page URL
-                            if next_href.startswith('http'):
-                                next_link = next_href
-                            elif next_href.startswith('//'):
-                                next_link = 'https:' + next_href
-                            elif next_href.startswith('/'):
-                                next_link = 'https://www.mobile.bg' + next_href
-                            else:
-                                next_link = 'https://www.mobile.bg/' + next_href
-                            break
-            
+            if page_total:
+                total_results = page_total
+                estimated_pages = math.ceil(total_results / RESULTS_PER_PAGE)
+                estimated_time = estimated_pages / limiter.rate if limiter.rate else 0.0
+
+                logger.info("📊 SEARCH RESULTS SUMMARY:")
+                logger.info(f" 🎯 Total Results Found: {total_results} cars")
+                logger.info(f" 📄 Estimated Pages: {estimated_pages} pages (~20 cars per page)")
+                logger.info(f" ⏱️  Estimated Crawl Time: ~{estimated_time:.1f} seconds")
+
+            new_links = add_page_links(page_num, page_links)
+            yield from new_links
+
             # Check if we should continue
             if page_num >= max_pages:
                 logger.info(f"🛑 Reached max_pages={max_pages}. Stopping.")
+                page_done(page_num, None)
                 break
-                
+
             if not next_link:
                 logger.info(f"🏁 No more pages found. Crawling complete!")
+                page_done(page_num, None)
                 break
-                
-            if not page_links:
+
+            if not new_links:
                 logger.info(f"🚫 No new links found on page {page_num}. Stopping.")
+                page_done(page_num, None)
+                break
+
+            page_done(page_num, next_link)
+
+            # Fetch the remaining pages concurrently once we know how many there are
+            page_url = infer_page_url_template(next_link, page_num + 1) if workers > 1 and total_results else None
+            if page_url:
+                last_page = min(math.ceil(total_results / RESULTS_PER_PAGE), max_pages)
+                page_nums = list(range(page_num + 1, last_page + 1))
+                logger.info(f"⚡ Fetching pages {page_num + 1}-{last_page} concurrently with {workers} workers")
+
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = executor.map(
+                        lambda n: _fetch_result_page(client, page_url(n), n, limiter, logger, metrics),
+                        page_nums
+                    )
+                    # Merge in page order so links keep their discovery order; the
+                    # resume position stops before the first page that failed
+                    failed = False
+                    for n, page_links in zip(page_nums, results):
+                        if page_links is None:
+                            failed = True
+                            continue
+                        yield from add_page_links(n, page_links)
+                        page_num = n
+                        if not failed:
+                            page_done(n, page_url(n + 1) if n < last_page else None)
                 break
-            
+
             logger.info(f"Next page URL: {next_link}")
             url = next_link
             page_num += 1
-            
-            # Respectful delay
-            if delay > 0:
-                time.sleep(delay)
-                
+
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Network error on page {page_num}: {e}")
             break
         except Exception as e:
             logger.error(f"❌ Error processing page {page_num}: {e}")
             break
-    
+
     if not links:
         logger.error("❌ No car links found. Exiting.")
-        return set()
-    
+        return
+
     elapsed_time = time.time() - start_time
     logger.info(f"🔗 LINK COLLECTION COMPLETE!")
     logger.info(f"  📊 Total Unique Links: {len(links)} cars")
     logger.info(f"  📄 Pages Processed: {page_num}")
     logger.info(f"  ⏱️  Total Collection Time: {elapsed_time:.1f} seconds")
-    
-    return links
\ No newline at end of file
+
+
+def get_all_listing_links(search_url, delay=1.0, max_pages=100, logger=None, client=None, workers=1, limiter=None,
+                          metrics=None, **resume):
+    """
+    Crawl all result pages and collect car listing links.
+
+    Args:
+        search_url (str): The initial search URL
+        delay (float): Delay between requests in seconds
+        max_pages (int): Maximum number of pages to crawl
+        logger (logging.Logger, optional): Logger instance
+        client (HttpClient, optional): Shared HTTP client, defaults to the process-wide one
+        workers (int): Concurrent page fetches once the page count is known
+        limiter (RateLimiter, optional): Politeness budget shared with other stages
+        metrics (CrawlMetrics, optional): Records result page parse times
+        **resume: start_url, start_page, seen_links and on_page, see iter_listing_links()
+
+    Returns:
+        list: Unique car listing URLs in the order they were found
+    """
+    return list(iter_listing_links(search_url, delay=delay, max_pages=max_pages, logger=logger,
+                                   client=client, workers=workers, limiter=limiter, metrics=metrics, **resume))